@@ -0,0 +1,302 @@
+import asyncio  # Import modul asyncio untuk event loop dan stream
+import resource  # Import modul resource untuk mengatur batas file descriptor
+import time  # Import modul time untuk latensi koneksi dan umur tunnel
+import signal  # Import modul signal untuk drain saat SIGTERM
+
+import dns_cache  # Import cache DNS dan koneksi Happy Eyeballs
+import telemetry  # Import metrik Prometheus
+import upstream_pool  # Import UpstreamRefused untuk meneruskan status penolakan dari upstream
+
+# Batas default jumlah tunnel CONNECT yang boleh aktif bersamaan.
+# Setiap tunnel memakai dua file descriptor (klien dan server target), sehingga
+# batas ini juga menentukan berapa banyak file descriptor yang diminta ke sistem.
+DEFAULT_MAX_TUNNELS = 10000
+
+# Ukuran maksimal header permintaan CONNECT dari klien (dalam bytes)
+MAX_HEADER_SIZE = 65536
+
+# Batas waktu (detik) untuk menerima header permintaan dari klien
+HEADER_TIMEOUT = 30
+
+# Ukuran potongan data default yang dibaca per iterasi relay
+READ_CHUNK_SIZE = 65536
+
+
+class AsyncTunnelServer:
+    """
+    Server proxy berbasis asyncio yang menangani ribuan tunnel CONNECT secara bersamaan
+    di dalam satu event loop.
+
+    Berbeda dengan ProxyHTTPRequestHandler yang memblokir server selama tunnel berjalan,
+    setiap tunnel di sini hanyalah sepasang coroutine sehingga satu tunnel yang lama
+    tidak menghalangi klien lain.
+
+    Metode:
+    - serve_forever: Menjalankan server sampai dihentikan.
+    - handle_client: Menangani satu koneksi klien dari awal sampai tunnel ditutup.
+    - track_client: Menjalankan handle_client dan mencatat task-nya untuk drain.
+    - relay: Meneruskan data satu arah dari reader ke writer.
+
+    Atribut:
+    - port: Port tempat server mendengarkan.
+    - max_tunnels: Jumlah maksimal tunnel aktif. Permintaan CONNECT di atas batas ini
+      langsung dijawab dengan 503 Service Unavailable.
+    - read_size: Jumlah bytes maksimal yang dibaca per iterasi relay.
+    - resolver: DNSCache untuk resolusi dan koneksi Happy Eyeballs ke server target.
+    - upstreams: UpstreamPool untuk membuat tunnel lewat upstream proxy (None berarti langsung).
+    - metrics: telemetry.Metrics untuk counter dan histogram tunnel.
+    - reuse_port: Membuka port dengan SO_REUSEPORT agar bisa dibagi beberapa proses worker.
+    - drain_timeout: Batas waktu (detik) menunggu tunnel yang berjalan selesai setelah SIGTERM.
+    - active_tunnels: Jumlah tunnel yang sedang aktif, termasuk yang masih terhubung ke server target.
+    - client_tasks: Task handle_client yang sedang berjalan (dibatalkan jika drain melewati batas waktu).
+    """
+
+    def __init__(self, port=9919, max_tunnels=DEFAULT_MAX_TUNNELS, read_size=READ_CHUNK_SIZE, resolver=None,
+                 upstreams=None, metrics=None, reuse_port=False, drain_timeout=30):
+        self.port = port
+        self.max_tunnels = max_tunnels
+        self.read_size = read_size
+        self.resolver = resolver or dns_cache.DNSCache()
+        self.upstreams = upstreams
+        self.metrics = metrics or telemetry.Metrics()
+        self.reuse_port = reuse_port
+        self.drain_timeout = drain_timeout
+        self.active_tunnels = 0
+        self.client_tasks = set()
+
+    async def serve_forever(self):
+        """
+        Membuka socket server dan menjalankan event loop sampai SIGTERM. Setelah SIGTERM,
+        socket server ditutup lalu koneksi yang berjalan ditunggu sampai drain_timeout; koneksi
+        yang belum selesai setelah itu dibatalkan.
+        """
+        raise_nofile_limit(self.max_tunnels)
+        server = await asyncio.start_server(
+            self.track_client, host=None, port=self.port,
+            limit=MAX_HEADER_SIZE, backlog=1024, reuse_port=self.reuse_port or None)
+
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        try:
+            await stop.wait()
+        finally:
+            server.close()  # Berhenti menerima koneksi baru
+
+        print(f'Menyelesaikan {self.active_tunnels} tunnel yang berjalan (maks {self.drain_timeout} detik)...')
+        if self.client_tasks:
+            await asyncio.wait(set(self.client_tasks), timeout=self.drain_timeout)
+        if self.client_tasks:
+            # Sejak Python 3.12 wait_closed() menunggu semua koneksi, jadi sisanya harus dibatalkan
+            print('Batas waktu drain habis, koneksi yang tersisa ditutup')
+            for task in self.client_tasks:
+                task.cancel()
+            await asyncio.gather(*self.client_tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    async def track_client(self, reader, writer):
+        """
+        Menjalankan handle_client sambil mencatat task-nya di client_tasks.
+        """
+        task = asyncio.current_task()
+        self.client_tasks.add(task)
+        try:
+            await self.handle_client(reader, writer)
+        except asyncio.CancelledError:
+            pass  # Dibatalkan oleh serve_forever setelah drain_timeout; koneksi sudah ditutup handle_client
+        finally:
+            self.client_tasks.discard(task)
+
+    async def handle_client(self, reader, writer):
+        """
+        Membaca permintaan CONNECT dari klien, terhubung ke server target, lalu
+        meneruskan data ke dua arah sampai salah satu pihak menutup koneksi.
+
+        Args:
+        - reader (asyncio.StreamReader): Stream untuk membaca data dari klien.
+        - writer (asyncio.StreamWriter): Stream untuk menulis data ke klien.
+        """
+        target_writer = None
+        upstream = None
+        has_slot = False
+        try:
+            try:
+                header = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), HEADER_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                return
+
+            request_line = header.split(b'\r\n', 1)[0].decode('latin-1')
+            parts = request_line.split()
+            if len(parts) != 3:
+                await send_status(writer, 400, 'Bad request syntax')
+                return
+            command, path, _ = parts
+
+            # Mode asyncio hanya mendukung metode CONNECT
+            if command != 'CONNECT':
+                await send_status(writer, 501, f'Unsupported method ({command})')
+                return
+
+            # Menolak tunnel baru jika batas tunnel aktif sudah tercapai. Slot diambil sebelum await
+            # pertama agar CONNECT yang datang bersamaan tidak bisa melewati batas
+            if self.active_tunnels >= self.max_tunnels:
+                await send_status(writer, 503, 'Too many tunnels')
+                return
+            self.active_tunnels += 1
+            has_slot = True
+
+            start = time.monotonic()
+            sock = None
+            try:
+                host, port = parse_host_port(path)
+                if self.upstreams is not None:
+                    # Membuat tunnel ke server target lewat salah satu upstream proxy
+                    sock, upstream = await self.upstreams.async_open_tunnel(
+                        host, port, self.resolver.async_create_connection)
+                else:
+                    # Membuat koneksi ke server target (cache DNS + Happy Eyeballs)
+                    sock = await self.resolver.async_create_connection(host, port)
+                target_reader, target_writer = await asyncio.open_connection(sock=sock, limit=self.read_size)
+            except upstream_pool.UpstreamRefused as e:
+                # Status penolakan dari upstream (misalnya 403 atau 502) diteruskan apa adanya ke klien
+                self.metrics.error('connect', e)
+                await send_status(writer, e.status, e.reason)
+                return
+            except Exception as e:
+                if sock is not None and target_writer is None:
+                    sock.close()  # Socket belum dipegang StreamWriter sehingga tidak ditutup close_writer
+                self.metrics.error('connect', e)
+                await send_status(writer, 500, str(e))  # Mengirim respons error jika koneksi gagal
+                return
+            opened = time.monotonic()
+            self.metrics.tunnel_opened(host, opened - start)
+
+            # Memberi respons ke klien bahwa koneksi berhasil dibuat
+            writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+            await writer.drain()
+
+            # Pertukaran data antara klien dan server target
+            bytes_relayed = (0, 0)
+            try:
+                bytes_relayed = await asyncio.gather(
+                    self.relay(reader, target_writer),
+                    self.relay(target_reader, writer))
+            finally:
+                self.metrics.tunnel_closed(host, bytes_relayed[0], bytes_relayed[1], time.monotonic() - opened)
+        except (ConnectionError, OSError) as e:
+            self.metrics.error('relay', e)
+        finally:
+            if has_slot:
+                self.active_tunnels -= 1
+            close_writer(writer)
+            if target_writer is not None:
+                close_writer(target_writer)
+            if upstream is not None:
+                self.upstreams.release(upstream)
+
+    async def relay(self, reader, writer):
+        """
+        Meneruskan data satu arah dari reader ke writer sampai EOF.
+
+        Menunggu drain() setelah setiap penulisan agar pengirim yang cepat tidak
+        menumpuk data di memori (backpressure). Saat EOF, arah tulis pada writer
+        ditutup (half-close) tanpa memutus arah sebaliknya.
+
+        Args:
+        - reader (asyncio.StreamReader): Sumber data.
+        - writer (asyncio.StreamWriter): Tujuan data.
+
+        Returns:
+        - int: Jumlah bytes yang diteruskan.
+        """
+        total = 0
+        try:
+            while True:
+                data = await reader.read(self.read_size)
+                if not data:
+                    break
+                writer.write(data)
+                total += len(data)
+                await writer.drain()
+            if writer.can_write_eof():
+                writer.write_eof()
+        except (ConnectionError, OSError):
+            # Jika satu arah gagal, tutup kedua arah agar coroutine lainnya ikut selesai
+            writer.close()
+        return total
+
+
+def parse_host_port(path):
+    """
+    Memisahkan host dan port dari path permintaan CONNECT (misalnya 'example.com:443').
+
+    Args:
+    - path (str): Path permintaan CONNECT.
+
+    Returns:
+    - tuple: Pasangan (host, port).
+    """
+    host, _, port = path.rpartition(':')
+    return host.strip('[]'), int(port)
+
+
+async def send_status(writer, code, message):
+    """
+    Mengirim respons status HTTP singkat ke klien.
+
+    Args:
+    - writer (asyncio.StreamWriter): Stream untuk menulis ke klien.
+    - code (int): Kode status HTTP.
+    - message (str): Pesan alasan status.
+    """
+    writer.write(f'HTTP/1.1 {code} {message}\r\nConnection: close\r\nContent-Length: 0\r\n\r\n'.encode('latin-1'))
+    try:
+        await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+
+
+def close_writer(writer):
+    """
+    Menutup stream tanpa memunculkan error jika koneksi sudah terputus.
+    """
+    try:
+        writer.close()
+    except (ConnectionError, OSError):
+        pass
+
+
+def raise_nofile_limit(max_tunnels, fds_per_tunnel=2):
+    """
+    Menaikkan batas soft RLIMIT_NOFILE agar cukup untuk max_tunnels tunnel,
+    tanpa melebihi batas hard dari sistem.
+
+    Args:
+    - max_tunnels (int): Jumlah maksimal tunnel aktif.
+    - fds_per_tunnel (int): Jumlah file descriptor per tunnel (default: 2, klien dan target).
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = max_tunnels * fds_per_tunnel + 64
+    if hard != resource.RLIM_INFINITY:
+        wanted = min(wanted, hard)
+    if wanted > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+def serve(port=9919, max_tunnels=DEFAULT_MAX_TUNNELS, read_size=READ_CHUNK_SIZE, resolver=None, upstreams=None,
+          metrics=None, reuse_port=False, drain_timeout=30):
+    """
+    Menjalankan server proxy mode asyncio pada port yang ditentukan.
+
+    Args:
+    - port (int): Port tempat server proxy akan berjalan (default: 9919).
+    - max_tunnels (int): Jumlah maksimal tunnel CONNECT yang aktif bersamaan (default: DEFAULT_MAX_TUNNELS).
+    - read_size (int): Jumlah bytes maksimal yang dibaca per iterasi relay (default: READ_CHUNK_SIZE).
+    - resolver (dns_cache.DNSCache, optional): Cache DNS untuk koneksi ke server target.
+    - upstreams (upstream_pool.UpstreamPool, optional): Upstream proxy untuk membuat tunnel.
+    - metrics (telemetry.Metrics, optional): Metrik tunnel untuk endpoint /metrics.
+    - reuse_port (bool): Membuka port dengan SO_REUSEPORT (default: False).
+    - drain_timeout (float): Batas waktu (detik) drain setelah SIGTERM (default: 30).
+    """
+    server = AsyncTunnelServer(port, max_tunnels, read_size, resolver, upstreams, metrics,
+                               reuse_port, drain_timeout)
+    asyncio.run(server.serve_forever())
@@ -0,0 +1,397 @@
+import asyncio  # Import modul asyncio untuk server asal dan klien beban
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import json  # Import modul json untuk menyimpan hasil benchmark
+import math  # Import modul math untuk perhitungan persentil
+import multiprocessing  # Import modul multiprocessing untuk menjalankan server asal di proses terpisah
+import os  # Import modul os untuk path dan /proc
+import shlex  # Import modul shlex untuk memecah opsi tambahan proxy.py
+import socket  # Import modul socket untuk memilih port kosong
+import ssl  # Import modul ssl untuk mode HTTPS (TLS lewat tunnel)
+import subprocess  # Import modul subprocess untuk menjalankan proxy.py dan openssl
+import sys  # Import modul sys untuk path interpreter Python
+import tempfile  # Import modul tempfile untuk sertifikat self-signed
+import time  # Import modul time untuk mengukur durasi
+
+# Ukuran potongan data yang dikirim server asal pada mode bulk
+BULK_CHUNK_SIZE = 262144
+
+# Pesan yang dipantulkan server asal untuk setiap tunnel pada fase tunnels/sec
+ECHO_PAYLOAD = b'x' * 1024
+
+# Batas waktu (detik) menunggu proxy.py siap menerima koneksi
+STARTUP_TIMEOUT = 15
+
+
+async def handle_origin(reader, writer):
+    """
+    Server asal pengganti: membaca satu baris perintah dari klien lalu
+    - 'ECHO': memantulkan semua data sampai EOF,
+    - 'BULK n': mengirim n bytes lalu menutup koneksi.
+
+    Args:
+    - reader (asyncio.StreamReader): Stream dari klien (lewat tunnel proxy).
+    - writer (asyncio.StreamWriter): Stream ke klien.
+    """
+    try:
+        command = (await reader.readline()).split()
+        if command[:1] == [b'BULK']:
+            remaining = int(command[1])
+            chunk = b'b' * BULK_CHUNK_SIZE
+            while remaining > 0:
+                writer.write(chunk[:remaining])
+                remaining -= min(remaining, BULK_CHUNK_SIZE)
+                await writer.drain()
+        else:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+    except (ConnectionError, OSError, ssl.SSLError):
+        pass
+    finally:
+        writer.close()
+
+
+def run_origin(sock, certfile, keyfile):
+    """
+    Menjalankan server asal pada socket yang sudah di-bind (dipanggil di proses terpisah).
+
+    Args:
+    - sock (socket.socket): Socket server asal yang sudah listen.
+    - certfile, keyfile (str or None): Sertifikat TLS; None berarti TCP biasa.
+    """
+    context = None
+    if certfile:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(certfile, keyfile)
+
+    async def serve():
+        server = await asyncio.start_server(handle_origin, sock=sock, ssl=context, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def make_certificate(directory):
+    """
+    Membuat sertifikat self-signed untuk localhost memakai openssl.
+
+    Args:
+    - directory (str): Direktori tempat menyimpan sertifikat dan kunci.
+
+    Returns:
+    - tuple: Path (certfile, keyfile).
+    """
+    certfile = os.path.join(directory, 'origin.pem')
+    keyfile = os.path.join(directory, 'origin.key')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=localhost', '-keyout', keyfile, '-out', certfile],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return certfile, keyfile
+
+
+def listening_socket():
+    """
+    Membuat socket TCP yang listen di port kosong pada 127.0.0.1.
+    """
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(4096)
+    return sock
+
+
+def free_port():
+    """
+    Mencari port kosong di 127.0.0.1 untuk proxy.py.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_proxy(port, proxy_args):
+    """
+    Menjalankan proxy.py sebagai proses terpisah dan menunggu sampai port-nya siap.
+
+    Args:
+    - port (int): Port proxy.
+    - proxy_args (list): Opsi tambahan untuk proxy.py.
+
+    Returns:
+    - subprocess.Popen: Proses proxy.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proxy.py')
+    process = subprocess.Popen([sys.executable, script, '--port', str(port), *proxy_args],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'proxy.py berhenti saat start (kode {process.returncode})')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('proxy.py tidak siap dalam batas waktu')
+
+
+def process_rss_kb(pid):
+    """
+    Menghitung RSS (KB) proses beserta semua proses anaknya (misalnya worker --workers) dari /proc.
+
+    Args:
+    - pid (int): PID proses.
+
+    Returns:
+    - int or None: Total RSS dalam KB, None jika /proc tidak tersedia.
+    """
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+                        break
+            for task in os.listdir(f'/proc/{current}/task'):
+                with open(f'/proc/{current}/task/{task}/children') as f:
+                    pending.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        return total or None
+    return total
+
+
+async def open_tunnel(proxy_port, origin_port):
+    """
+    Membuka tunnel CONNECT ke server asal lewat proxy.
+
+    Returns:
+    - tuple: (reader, writer, latensi CONNECT dalam detik).
+    """
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', proxy_port)
+    writer.write(f'CONNECT 127.0.0.1:{origin_port} HTTP/1.1\r\nHost: 127.0.0.1:{origin_port}\r\n\r\n'.encode())
+    header = await reader.readuntil(b'\r\n\r\n')
+    if b' 200 ' not in header.split(b'\r\n', 1)[0]:
+        writer.close()
+        raise ConnectionError(header.split(b'\r\n', 1)[0].decode('latin-1'))
+    return reader, writer, time.perf_counter() - start
+
+
+async def tunnel_round_trip(proxy_port, origin_port, tls_context, results):
+    """
+    Satu tunnel pada fase tunnels/sec: CONNECT, handshake TLS (opsional), satu pesan echo, lalu tutup.
+
+    Args:
+    - results (dict): Tempat mencatat latensi dan error.
+    """
+    writer = None
+    try:
+        reader, writer, latency = await open_tunnel(proxy_port, origin_port)
+        results['connect'].append(latency)
+        if tls_context is not None:
+            start = time.perf_counter()
+            await writer.start_tls(tls_context, server_hostname='localhost')
+            results['handshake'].append(time.perf_counter() - start)
+        writer.write(b'ECHO\n' + ECHO_PAYLOAD)
+        await reader.readexactly(len(ECHO_PAYLOAD))
+        results['ok'] += 1
+    except (ConnectionError, OSError, ssl.SSLError, asyncio.IncompleteReadError) as e:
+        results['errors'][type(e).__name__] = results['errors'].get(type(e).__name__, 0) + 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def bulk_download(proxy_port, origin_port, tls_context, size, results):
+    """
+    Satu tunnel pada fase throughput: meminta size bytes dari server asal dan membacanya habis.
+    """
+    writer = None
+    try:
+        reader, writer, _ = await open_tunnel(proxy_port, origin_port)
+        if tls_context is not None:
+            await writer.start_tls(tls_context, server_hostname='localhost')
+        writer.write(f'BULK {size}\n'.encode())
+        received = 0
+        while received < size:
+            data = await reader.read(BULK_CHUNK_SIZE)
+            if not data:
+                break
+            received += len(data)
+        results['bytes'] += received
+    except (ConnectionError, OSError, ssl.SSLError) as e:
+        results['errors'][type(e).__name__] = results['errors'].get(type(e).__name__, 0) + 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_phase(concurrency, jobs, make_job, sample_rss):
+    """
+    Menjalankan sejumlah jobs dengan maksimal concurrency job bersamaan, sambil mengambil
+    sampel RSS proxy secara berkala.
+
+    Returns:
+    - tuple: (durasi dalam detik, RSS puncak dalam KB).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    peak_rss = sample_rss() or 0
+
+    async def limited():
+        async with semaphore:
+            await make_job()
+
+    async def sampler():
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss, sample_rss() or 0)
+            await asyncio.sleep(0.2)
+
+    monitor = asyncio.create_task(sampler())
+    start = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(jobs)))
+    elapsed = time.perf_counter() - start
+    monitor.cancel()
+    return elapsed, max(peak_rss, sample_rss() or 0)
+
+
+def percentile(values, fraction):
+    """
+    Menghitung persentil (nearest-rank) dari list nilai.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_ms(values):
+    """
+    Meringkas list latensi (detik) menjadi p50/p90/p99/max dalam milidetik.
+    """
+    summary = {}
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        value = percentile(values, fraction)
+        summary[name] = round(value * 1000, 3) if value is not None else None
+    return summary
+
+
+async def benchmark(args, proxy_port, origin_port, proxy_pid, tls_context):
+    """
+    Menjalankan fase tunnels/sec lalu fase throughput.
+
+    Returns:
+    - dict: Hasil benchmark.
+    """
+    def sample_rss():
+        return process_rss_kb(proxy_pid)
+
+    rss_idle = sample_rss()
+    tunnels = {'ok': 0, 'connect': [], 'handshake': [], 'errors': {}}
+    elapsed, tunnel_peak_rss = await run_phase(
+        args.concurrency, args.tunnels,
+        lambda: tunnel_round_trip(proxy_port, origin_port, tls_context, tunnels), sample_rss)
+    ok = tunnels['ok']
+
+    bulk = {'bytes': 0, 'errors': {}}
+    size = args.bulk_megabytes * 2**20
+    bulk_elapsed, bulk_peak_rss = await run_phase(
+        args.bulk_concurrency, args.bulk_tunnels,
+        lambda: bulk_download(proxy_port, origin_port, tls_context, size, bulk), sample_rss)
+
+    return {
+        'tunnels': args.tunnels,
+        'tunnels_ok': ok,
+        'tunnels_per_sec': round(ok / elapsed, 1),
+        'connect_latency_ms': summarize_ms(tunnels['connect']),
+        'tls_handshake_ms': summarize_ms(tunnels['handshake']) if tls_context else None,
+        'tunnel_errors': tunnels['errors'],
+        'throughput_mb_s': round(bulk['bytes'] / bulk_elapsed / 1e6, 1),
+        'bulk_bytes': bulk['bytes'],
+        'bulk_errors': bulk['errors'],
+        'rss_kb': {'idle': rss_idle, 'peak_tunnels': tunnel_peak_rss, 'peak_bulk': bulk_peak_rss},
+    }
+
+
+def git_commit():
+    """
+    Mengembalikan hash commit git saat ini, atau None jika bukan repository git.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """
+    Fungsi utama: menjalankan server asal dan proxy.py lokal, mengukur tunnels/sec, latensi
+    CONNECT p50/p99, throughput relay, dan RSS proxy, lalu menyimpan hasilnya sebagai JSON.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark beban proxy.py dengan server asal lokal')
+    parser.add_argument('--tunnels', type=int, default=2000, help='Jumlah tunnel pada fase tunnels/sec')
+    parser.add_argument('--concurrency', type=int, default=200, help='Jumlah tunnel bersamaan pada fase tunnels/sec')
+    parser.add_argument('--bulk-tunnels', type=int, default=16, help='Jumlah tunnel pada fase throughput')
+    parser.add_argument('--bulk-concurrency', type=int, default=8, help='Jumlah tunnel bersamaan pada fase throughput')
+    parser.add_argument('--bulk-megabytes', type=int, default=64, help='Jumlah data per tunnel pada fase throughput (MB)')
+    parser.add_argument('--tls', action='store_true',
+                        help='Server asal memakai TLS (seperti HTTPS), sertifikat dibuat dengan openssl')
+    parser.add_argument('--proxy-args', default='',
+                        help="Opsi tambahan untuk proxy.py, misalnya '--mode async' atau '--no-splice --buffer-size 16384'")
+    parser.add_argument('--label', help='Label bebas untuk membedakan hasil (misalnya nama mesin relay)')
+    parser.add_argument('--output', help='File JSON Lines tempat hasil ditambahkan')
+    args = parser.parse_args()
+
+    proxy_args = shlex.split(args.proxy_args)
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = keyfile = tls_context = None
+        if args.tls:
+            certfile, keyfile = make_certificate(directory)
+            tls_context = ssl.create_default_context(cafile=certfile)
+
+        origin_sock = listening_socket()
+        origin_port = origin_sock.getsockname()[1]
+        origin = multiprocessing.get_context('fork').Process(
+            target=run_origin, args=(origin_sock, certfile, keyfile), daemon=True)
+        origin.start()
+        origin_sock.close()
+
+        proxy_port = free_port()
+        proxy = start_proxy(proxy_port, proxy_args)
+        try:
+            results = asyncio.run(benchmark(args, proxy_port, origin_port, proxy.pid, tls_context))
+        finally:
+            proxy.terminate()
+            try:
+                proxy.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proxy.kill()
+            origin.terminate()
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'label': args.label,
+        'proxy_args': proxy_args,
+        'tls': args.tls,
+        'concurrency': args.concurrency,
+        'bulk_concurrency': args.bulk_concurrency,
+        'bulk_megabytes': args.bulk_megabytes,
+        'results': results,
+    }
+    print(json.dumps(record, indent=2))
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
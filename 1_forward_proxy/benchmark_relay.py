@@ -0,0 +1,131 @@
+import socket  # Import modul socket untuk koneksi socket
+import select  # Import modul select untuk loop relay lama
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import threading  # Import modul threading untuk produsen dan konsumen data
+import time  # Import modul time untuk mengukur durasi
+
+import relay  # Import mesin relay tunnel yang akan diukur
+
+
+def legacy_relay(client, server, buffer_size=4096):
+    """
+    Loop relay lama dari ProxyHTTPRequestHandler.exchange_data: select.select per iterasi,
+    recv yang mengalokasikan bytes baru, lalu sendall.
+
+    Socket dibiarkan blocking agar sendall tidak gagal dengan BlockingIOError saat buffer
+    kirim penuh, sehingga angka ini adalah batas atas performa loop lama.
+
+    Args:
+    - client (socket.socket): Socket klien.
+    - server (socket.socket): Socket server target.
+    - buffer_size (int): Ukuran recv per iterasi (default: 4096 seperti kode lama).
+    """
+    while True:
+        read_sockets, _, _ = select.select([client, server], [], [])
+        if client in read_sockets:
+            data = client.recv(buffer_size)
+            if not data:
+                break
+            server.sendall(data)
+        if server in read_sockets:
+            data = server.recv(buffer_size)
+            if not data:
+                break
+            client.sendall(data)
+
+
+def tcp_pair(listener):
+    """
+    Membuat sepasang socket TCP loopback yang saling terhubung.
+
+    Args:
+    - listener (socket.socket): Socket yang sedang listen di loopback.
+
+    Returns:
+    - tuple: Pasangan (sisi_luar, sisi_proxy).
+    """
+    outer = socket.create_connection(listener.getsockname())
+    inner, _ = listener.accept()
+    return outer, inner
+
+
+def measure(engine, total_bytes, buffer_size):
+    """
+    Mengukur throughput satu mesin relay dengan mengirim total_bytes dari produsen ke
+    konsumen melalui relay pada koneksi TCP loopback.
+
+    Args:
+    - engine (str): 'legacy', 'buffered', atau 'splice'.
+    - total_bytes (int): Jumlah data yang dikirim.
+    - buffer_size (int): Ukuran buffer relay.
+
+    Returns:
+    - float: Throughput dalam MB/s.
+    """
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(4)
+    producer, proxy_client = tcp_pair(listener)
+    proxy_server, consumer = tcp_pair(listener)
+    listener.close()
+
+    if engine == 'legacy':
+        target = legacy_relay
+        args = (proxy_client, proxy_server)
+    else:
+        target = relay.relay
+        args = (proxy_client, proxy_server, buffer_size, engine == 'splice')
+    worker = threading.Thread(target=target, args=args)
+
+    chunk = b'x' * 262144
+
+    def produce():
+        sent = 0
+        while sent < total_bytes:
+            sent += producer.send(chunk[:total_bytes - sent])
+        producer.shutdown(socket.SHUT_WR)
+
+    sink = bytearray(262144)
+    start = time.perf_counter()
+    worker.start()
+    sender = threading.Thread(target=produce)
+    sender.start()
+    received = 0
+    while received < total_bytes:
+        n = consumer.recv_into(sink)
+        if not n:
+            break
+        received += n
+    elapsed = time.perf_counter() - start
+
+    sender.join()
+    consumer.close()
+    worker.join()
+    for sock in (producer, proxy_client, proxy_server):
+        sock.close()
+    return received / elapsed / 1e6
+
+
+def main():
+    """
+    Fungsi utama untuk membandingkan throughput loop relay lama dengan relay buffer dan splice.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark throughput relay tunnel')
+    parser.add_argument('--megabytes', type=int, default=512, help='Jumlah data per percobaan (MB)')
+    parser.add_argument('--buffer-size', type=int, default=relay.DEFAULT_BUFFER_SIZE,
+                        help='Ukuran buffer relay dalam bytes')
+    parser.add_argument('--repeat', type=int, default=3, help='Jumlah percobaan per mesin relay')
+    args = parser.parse_args()
+
+    engines = ['legacy', 'buffered'] + (['splice'] if relay.HAS_SPLICE else [])
+    total_bytes = args.megabytes * 1024 * 1024
+    baseline = None
+    for engine in engines:
+        # Mengambil hasil terbaik dari beberapa percobaan untuk mengurangi noise
+        best = max(measure(engine, total_bytes, args.buffer_size) for _ in range(args.repeat))
+        baseline = baseline or best
+        print(f'{engine:>9}: {best:9.1f} MB/s  ({best / baseline:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
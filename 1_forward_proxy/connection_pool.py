@@ -0,0 +1,172 @@
+import socket  # Import modul socket untuk koneksi default ke server asal
+import select  # Import modul select (poll) untuk memeriksa koneksi idle yang sudah ditutup server
+import threading  # Import modul threading untuk sinkronisasi antar handler
+import collections  # Import modul collections untuk antrean koneksi idle
+import http.client  # Import modul http.client untuk koneksi HTTP persisten ke server asal
+import time  # Import modul time untuk mencatat waktu idle koneksi
+
+# Jumlah maksimal koneksi idle yang disimpan per host
+DEFAULT_MAX_IDLE_PER_HOST = 8
+
+# Jumlah maksimal koneksi (aktif + idle) per host
+DEFAULT_MAX_PER_HOST = 32
+
+# Batas waktu (detik) koneksi idle disimpan sebelum dibuang
+DEFAULT_IDLE_TIMEOUT = 60
+
+# Batas waktu (detik) koneksi dan pembacaan ke server asal
+DEFAULT_UPSTREAM_TIMEOUT = 30
+
+
+class PoolTimeout(Exception):
+    """
+    Dimunculkan jika tidak ada slot koneksi ke host yang tersedia dalam batas waktu.
+    """
+
+
+class PooledHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTPConnection yang membuka socket lewat fungsi connector milik pool, sehingga koneksi
+    ke server asal bisa memakai cache DNS dan Happy Eyeballs.
+    """
+
+    def __init__(self, host, port, timeout, connector):
+        super().__init__(host, port, timeout=timeout)
+        self.connector = connector
+
+    def connect(self):
+        """
+        Membuka koneksi TCP ke server asal memakai connector.
+        """
+        self.sock = self.connector(self.host, self.port, self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def default_connector(host, port, timeout):
+    """
+    Connector default: socket.create_connection biasa.
+    """
+    return socket.create_connection((host, port), timeout)
+
+
+class ConnectionPool:
+    """
+    Pool koneksi HTTP persisten (keep-alive) ke server asal, dikelompokkan per host.
+
+    Koneksi yang sudah selesai dipakai dikembalikan ke pool sehingga permintaan berikutnya
+    ke host yang sama memakai socket yang sudah terhubung tanpa handshake TCP baru.
+
+    Metode:
+    - acquire: Mengambil koneksi ke host (memakai ulang koneksi idle jika ada).
+    - release: Mengembalikan koneksi ke pool atau menutupnya.
+    - close: Menutup semua koneksi idle.
+
+    Atribut:
+    - max_idle_per_host: Jumlah maksimal koneksi idle per host.
+    - max_per_host: Jumlah maksimal koneksi (aktif + idle) per host. Permintaan di atas
+      batas ini menunggu sampai ada koneksi yang dikembalikan.
+    - idle_timeout: Batas waktu koneksi idle disimpan (detik).
+    - timeout: Batas waktu koneksi dan pembacaan ke server asal (detik).
+    - connector: Fungsi (host, port, timeout) -> socket untuk membuka koneksi baru.
+    - created: Jumlah koneksi baru yang dibuat.
+    - reused: Jumlah koneksi idle yang dipakai ulang.
+    """
+
+    def __init__(self, max_idle_per_host=DEFAULT_MAX_IDLE_PER_HOST, max_per_host=DEFAULT_MAX_PER_HOST,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, timeout=DEFAULT_UPSTREAM_TIMEOUT,
+                 connector=default_connector):
+        self.max_idle_per_host = max_idle_per_host
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connector = connector
+        self.lock = threading.Condition()
+        self.idle = collections.defaultdict(collections.deque)  # key -> deque of (conn, idle_since)
+        self.in_use = collections.Counter()  # key -> jumlah koneksi yang sedang dipakai
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, host, port):
+        """
+        Mengambil koneksi ke host:port, memakai ulang koneksi idle jika masih sehat.
+
+        Args:
+        - host (str): Host server asal.
+        - port (int): Port server asal.
+
+        Returns:
+        - tuple: (http.client.HTTPConnection, bool) berisi koneksi dan penanda apakah
+          koneksi tersebut dipakai ulang dari pool.
+        """
+        key = (host, port)
+        deadline = time.monotonic() + self.timeout
+        with self.lock:
+            while True:
+                idle = self.idle[key]
+                while idle:
+                    conn, idle_since = idle.pop()  # LIFO: koneksi paling baru paling mungkin masih hidup
+                    if time.monotonic() - idle_since <= self.idle_timeout and is_alive(conn):
+                        self.in_use[key] += 1
+                        self.reused += 1
+                        return conn, True
+                    conn.close()
+
+                if self.in_use[key] < self.max_per_host:
+                    self.in_use[key] += 1
+                    self.created += 1
+                    break
+
+                # Menunggu koneksi lain dikembalikan jika batas per host sudah tercapai
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.lock.wait(remaining):
+                    raise PoolTimeout(f'Tidak ada koneksi tersedia ke {host}:{port}')
+
+        return PooledHTTPConnection(host, port, self.timeout, self.connector), False
+
+    def release(self, conn, reusable=True):
+        """
+        Mengembalikan koneksi ke pool. Koneksi ditutup jika tidak bisa dipakai ulang
+        atau jumlah koneksi idle untuk host tersebut sudah penuh.
+
+        Args:
+        - conn (http.client.HTTPConnection): Koneksi yang dikembalikan.
+        - reusable (bool): False jika respons belum dibaca habis atau server meminta close.
+        """
+        key = (conn.host, conn.port)
+        with self.lock:
+            self.in_use[key] -= 1
+            if reusable and conn.sock is not None and len(self.idle[key]) < self.max_idle_per_host:
+                self.idle[key].append((conn, time.monotonic()))
+            else:
+                conn.close()
+            self.lock.notify()
+
+    def close(self):
+        """
+        Menutup semua koneksi idle di pool.
+        """
+        with self.lock:
+            for idle in self.idle.values():
+                while idle:
+                    idle.pop()[0].close()
+
+
+def is_alive(conn):
+    """
+    Memeriksa apakah koneksi idle masih terbuka. Socket idle yang bisa dibaca berarti
+    server sudah menutup koneksi (EOF) atau mengirim data yang tidak diharapkan.
+
+    Args:
+    - conn (http.client.HTTPConnection): Koneksi yang diperiksa.
+
+    Returns:
+    - bool: True jika koneksi masih bisa dipakai.
+    """
+    if conn.sock is None:
+        return False
+    try:
+        poller = select.poll()  # poll tidak dibatasi FD_SETSIZE seperti select.select
+        poller.register(conn.sock, select.POLLIN)
+        return not poller.poll(0)
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,397 @@
+import socket  # Import modul socket untuk resolusi nama dan koneksi
+import errno  # Import modul errno untuk kode EINPROGRESS
+import selectors  # Import modul selectors untuk menunggu beberapa percobaan koneksi sekaligus
+import threading  # Import modul threading untuk sinkronisasi cache
+import asyncio  # Import modul asyncio untuk versi koneksi non-blocking pada mode async
+import ipaddress  # Import modul ipaddress untuk mengenali alamat IP literal
+import concurrent.futures  # Import modul concurrent.futures untuk resolusi di thread latar belakang
+import collections  # Import modul collections untuk OrderedDict (LRU)
+import time  # Import modul time untuk TTL cache
+
+# TTL default (detik) untuk hasil resolusi yang berhasil dan yang gagal (negative caching).
+# getaddrinfo tidak memberikan TTL dari record DNS, sehingga TTL ini dikonfigurasi di proxy.
+DEFAULT_TTL = 60
+DEFAULT_NEGATIVE_TTL = 10
+
+# Lama (detik) entri kedaluwarsa masih boleh dipakai sambil diperbarui di latar belakang
+DEFAULT_STALE_TTL = 300
+
+# Bagian dari TTL setelah entri diperbarui di latar belakang sebelum kedaluwarsa (refresh-ahead)
+REFRESH_AHEAD = 0.8
+
+# Batas waktu default (detik) untuk resolusi dan koneksi ke server target
+DEFAULT_RESOLVE_TIMEOUT = 5
+DEFAULT_CONNECT_TIMEOUT = 10
+
+# Jeda (detik) sebelum percobaan koneksi ke alamat berikutnya dimulai (RFC 8305)
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+
+# Jumlah host maksimal di cache; host yang paling lama tidak dipakai dibuang lebih dulu
+DEFAULT_MAX_ENTRIES = 10000
+
+# Jumlah thread untuk resolusi di latar belakang
+RESOLVER_WORKERS = 8
+
+
+class CacheEntry:
+    """
+    Hasil resolusi satu host.
+
+    Atribut:
+    - addresses: List pasangan (family, alamat IP) atau None jika resolusi gagal.
+    - error: Exception socket.gaierror jika resolusi gagal.
+    - resolved_at: Waktu resolusi (time.monotonic()).
+    - ttl: Lama entri dianggap segar (detik).
+    """
+
+    def __init__(self, addresses, error, resolved_at, ttl):
+        self.addresses = addresses
+        self.error = error
+        self.resolved_at = resolved_at
+        self.ttl = ttl
+
+    def age(self, now):
+        """
+        Menghitung umur entri (detik).
+        """
+        return now - self.resolved_at
+
+
+class DNSCache:
+    """
+    Cache resolusi DNS dengan TTL, negative caching, dan resolusi di thread latar belakang,
+    ditambah koneksi Happy Eyeballs (RFC 8305) yang membalap alamat IPv6 dan IPv4.
+
+    Entri yang mendekati kedaluwarsa diperbarui di latar belakang, dan entri yang sudah
+    kedaluwarsa tetap dipakai (sampai stale_ttl) sambil diperbarui, sehingga permintaan
+    tidak menunggu getaddrinfo kecuali untuk host yang benar-benar baru.
+
+    Metode:
+    - resolve: Mengembalikan daftar sockaddr untuk host:port.
+    - create_connection: Membuka koneksi TCP ke host:port dengan Happy Eyeballs.
+    - async_create_connection: Versi asyncio dari create_connection.
+
+    Atribut:
+    - ttl: TTL hasil resolusi yang berhasil (detik).
+    - negative_ttl: TTL hasil resolusi yang gagal (detik).
+    - stale_ttl: Lama entri kedaluwarsa masih boleh dipakai (detik).
+    - resolve_timeout: Batas waktu menunggu resolusi (detik).
+    - connect_timeout: Batas waktu total koneksi (detik).
+    - happy_eyeballs_delay: Jeda antar percobaan koneksi (detik).
+    - max_entries: Jumlah host maksimal di cache (LRU).
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 resolve_timeout=DEFAULT_RESOLVE_TIMEOUT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 happy_eyeballs_delay=DEFAULT_HAPPY_EYEBALLS_DELAY, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.resolve_timeout = resolve_timeout
+        self.connect_timeout = connect_timeout
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = collections.OrderedDict()  # host -> CacheEntry, urutan LRU
+        self.in_flight = {}  # host -> Future resolusi yang sedang berjalan
+        self.executor = concurrent.futures.ThreadPoolExecutor(RESOLVER_WORKERS, thread_name_prefix='dns')
+
+    def resolve(self, host, port):
+        """
+        Mengembalikan daftar sockaddr untuk host:port, diurutkan bergantian antara IPv6 dan IPv4
+        sesuai urutan hasil resolver (RFC 8305).
+
+        Args:
+        - host (str): Nama host atau alamat IP.
+        - port (int): Port tujuan.
+
+        Returns:
+        - list: List pasangan (family, sockaddr).
+
+        Raises:
+        - socket.gaierror: Jika host tidak bisa di-resolve (termasuk dari negative cache).
+        - TimeoutError: Jika resolusi melebihi resolve_timeout.
+        """
+        literal = ip_literal(host)
+        if literal is not None:
+            return [make_sockaddr(literal, port)]
+
+        with self.lock:
+            entry = self.entries.get(host)
+            if entry is not None:
+                self.entries.move_to_end(host)
+        now = time.monotonic()
+        if not self.usable(entry, now):
+            # Host baru (atau entri terlalu lama): harus menunggu resolusi
+            entry = self.wait_for(self.refresh(host))
+        elif entry.age(now) > entry.ttl * REFRESH_AHEAD:
+            self.refresh(host)  # Diperbarui di latar belakang, entri lama tetap dipakai sekarang
+
+        if entry.error is not None:
+            raise entry.error
+        return [make_sockaddr(address, port) for address in entry.addresses]
+
+    def usable(self, entry, now):
+        """
+        Mengembalikan True jika entri boleh dipakai tanpa menunggu resolusi baru: entri gagal
+        selama negative_ttl, entri berhasil selama ttl ditambah stale_ttl.
+        """
+        if entry is None:
+            return False
+        return entry.age(now) <= entry.ttl + (self.stale_ttl if entry.addresses else 0)
+
+    def cached(self, host):
+        """
+        Mengembalikan True jika resolve() untuk host bisa langsung dijawab dari cache.
+        """
+        if ip_literal(host) is not None:
+            return True
+        with self.lock:
+            entry = self.entries.get(host)
+        return self.usable(entry, time.monotonic())
+
+    def refresh(self, host):
+        """
+        Menjadwalkan resolusi host di thread latar belakang. Permintaan bersamaan untuk host
+        yang sama memakai Future yang sama.
+
+        Returns:
+        - concurrent.futures.Future: Future yang menghasilkan CacheEntry.
+        """
+        with self.lock:
+            future = self.in_flight.get(host)
+            if future is None:
+                future = self.executor.submit(self.lookup, host)
+                self.in_flight[host] = future
+        return future
+
+    def wait_for(self, future):
+        """
+        Menunggu hasil resolusi dengan batas waktu resolve_timeout.
+        """
+        try:
+            return future.result(self.resolve_timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError('Resolusi DNS melebihi batas waktu') from None
+
+    def lookup(self, host):
+        """
+        Menjalankan getaddrinfo untuk host lalu menyimpan hasilnya (berhasil atau gagal) ke cache.
+        Error selain socket.gaierror (misalnya nama host yang tidak bisa di-encode) tidak di-cache
+        dan diteruskan lewat Future ke semua yang menunggu.
+
+        Returns:
+        - CacheEntry: Entri hasil resolusi.
+        """
+        try:
+            try:
+                infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                addresses = interleave([(family, sockaddr) for family, _, _, _, sockaddr in infos])
+                entry = CacheEntry(addresses, None, time.monotonic(), self.ttl)
+            except socket.gaierror as e:
+                entry = CacheEntry(None, e, time.monotonic(), self.negative_ttl)
+            with self.lock:
+                self.entries[host] = entry
+                self.entries.move_to_end(host)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            return entry
+        finally:
+            # Selalu dilepas agar error tidak membuat host menunggu Future yang sama selamanya
+            with self.lock:
+                self.in_flight.pop(host, None)
+
+    def create_connection(self, host, port, timeout=None):
+        """
+        Membuka koneksi TCP ke host:port. Alamat hasil resolusi dicoba bergantian (IPv6/IPv4)
+        dengan jeda happy_eyeballs_delay; percobaan pertama yang berhasil dipakai.
+
+        Args:
+        - host (str): Nama host atau alamat IP.
+        - port (int): Port tujuan.
+        - timeout (float, optional): Timeout yang dipasang pada socket hasil koneksi.
+
+        Returns:
+        - socket.socket: Socket yang sudah terhubung.
+        """
+        addresses = self.resolve(host, port)
+        sock = happy_eyeballs_connect(addresses, self.connect_timeout, self.happy_eyeballs_delay)
+        sock.settimeout(timeout)
+        return sock
+
+    async def async_create_connection(self, host, port):
+        """
+        Versi asyncio dari create_connection. Resolusi hanya dijalankan di executor jika host
+        belum ada di cache, sehingga event loop tidak pernah memanggil getaddrinfo secara langsung.
+
+        Returns:
+        - socket.socket: Socket non-blocking yang sudah terhubung.
+        """
+        if self.cached(host):
+            addresses = self.resolve(host, port)
+        else:
+            # Executor default dipakai agar thread yang menunggu tidak memenuhi executor resolusi
+            addresses = await asyncio.get_running_loop().run_in_executor(None, self.resolve, host, port)
+        return await asyncio.wait_for(
+            async_happy_eyeballs_connect(addresses, self.happy_eyeballs_delay), self.connect_timeout)
+
+
+def ip_literal(host):
+    """
+    Mengembalikan pasangan (family, alamat) jika host adalah alamat IP literal, None jika bukan.
+    """
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+    return family, (host,)
+
+
+def make_sockaddr(address, port):
+    """
+    Menyusun pasangan (family, sockaddr) dari hasil resolusi dan port.
+    """
+    family, sockaddr = address
+    if family == socket.AF_INET6:
+        scope_id = sockaddr[3] if len(sockaddr) > 3 else 0
+        return family, (sockaddr[0], port, 0, scope_id)
+    return family, (sockaddr[0], port)
+
+
+def interleave(addresses):
+    """
+    Menyusun ulang alamat agar family bergantian, dimulai dari family alamat pertama (RFC 8305).
+    Alamat duplikat dibuang.
+
+    Args:
+    - addresses (list): List pasangan (family, sockaddr) sesuai urutan getaddrinfo.
+
+    Returns:
+    - list: List pasangan (family, sockaddr) yang sudah diselang-seling.
+    """
+    seen = set()
+    groups = {}
+    for family, sockaddr in addresses:
+        if (family, sockaddr[0]) in seen:
+            continue
+        seen.add((family, sockaddr[0]))
+        groups.setdefault(family, []).append((family, sockaddr))
+    ordered = []
+    queues = list(groups.values())
+    while any(queues):
+        for queue in queues:
+            if queue:
+                ordered.append(queue.pop(0))
+    return ordered
+
+
+def happy_eyeballs_connect(addresses, timeout, delay):
+    """
+    Membalap percobaan koneksi ke beberapa alamat: percobaan berikutnya dimulai setelah
+    percobaan sebelumnya gagal atau setelah jeda delay, dan koneksi pertama yang berhasil dipakai.
+
+    Args:
+    - addresses (list): List pasangan (family, sockaddr).
+    - timeout (float): Batas waktu total (detik).
+    - delay (float): Jeda antar percobaan (detik).
+
+    Returns:
+    - socket.socket: Socket yang terhubung (mode blocking).
+
+    Raises:
+    - OSError: Error terakhir jika semua percobaan gagal, atau TimeoutError jika melebihi timeout.
+    """
+    deadline = time.monotonic() + timeout
+    pending = list(addresses)
+    attempts = {}
+    last_error = None
+    next_start = 0
+    sel = selectors.DefaultSelector()
+    try:
+        while pending or attempts:
+            now = time.monotonic()
+            if now >= deadline:
+                raise TimeoutError('Koneksi ke server target melebihi batas waktu')
+
+            # Memulai percobaan berikutnya jika belum ada percobaan aktif atau jeda sudah lewat
+            if pending and (not attempts or now >= next_start):
+                family, sockaddr = pending.pop(0)
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(sockaddr)
+                if err in (0, errno.EINPROGRESS):
+                    attempts[sock] = sockaddr
+                    sel.register(sock, selectors.EVENT_WRITE)
+                    next_start = now + delay
+                else:
+                    sock.close()
+                    last_error = OSError(err, f'Gagal terhubung ke {sockaddr[0]}')
+                continue
+
+            wait = deadline - now
+            if pending:
+                wait = min(wait, max(0, next_start - now))
+            for key, _ in sel.select(wait):
+                sock = key.fileobj
+                sel.unregister(sock)
+                sockaddr = attempts.pop(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    sock.setblocking(True)
+                    return sock
+                sock.close()
+                last_error = OSError(err, f'Gagal terhubung ke {sockaddr[0]}')
+                next_start = 0  # Percobaan gagal: langsung mulai alamat berikutnya
+        raise last_error or OSError('Tidak ada alamat untuk dihubungi')
+    finally:
+        for sock in attempts:
+            sock.close()
+        sel.close()
+
+
+async def async_happy_eyeballs_connect(addresses, delay):
+    """
+    Versi asyncio dari happy_eyeballs_connect (tanpa batas waktu total; dibungkus dengan
+    asyncio.wait_for oleh pemanggil).
+
+    Args:
+    - addresses (list): List pasangan (family, sockaddr).
+    - delay (float): Jeda antar percobaan (detik).
+
+    Returns:
+    - socket.socket: Socket non-blocking yang terhubung.
+    """
+    loop = asyncio.get_running_loop()
+    pending = list(addresses)
+    attempts = {}
+    last_error = None
+
+    async def attempt(family, sockaddr):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, sockaddr)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    try:
+        while pending or attempts:
+            if pending:
+                family, sockaddr = pending.pop(0)
+                attempts[asyncio.ensure_future(attempt(family, sockaddr))] = sockaddr
+            done, _ = await asyncio.wait(attempts, timeout=delay if pending else None,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempts.pop(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        raise last_error or OSError('Tidak ada alamat untuk dihubungi')
+    finally:
+        for task in attempts:
+            task.cancel()
+            # Socket dari percobaan yang kebetulan juga berhasil harus ditutup
+            task.add_done_callback(lambda t: t.cancelled() or t.exception() or t.result().close())
@@ -1,5 +1,30 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import contextlib  # Import modul contextlib untuk context manager sumber halaman
+import functools  # Import modul functools untuk membaca file per potongan
+import os  # Import modul os untuk path file dan folder
+import re  # Import modul re untuk nama file hasil
+import sys  # Import modul sys untuk menulis teks ke stdout secara streaming
+import zlib  # Import modul zlib untuk body cache yang terkompresi gzip/deflate
+
 import requests
-from bs4 import BeautifulSoup
+
+import http_client
+import keyword_scan
+import response_cache
+
+# brotli (opsional) untuk body cache dengan Content-Encoding br
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Proxy, URL, dan kata kunci default
+DEFAULT_PROXY = 'http://localhost:9919'
+DEFAULT_URL = 'https://en.wikipedia.org/wiki/Proxy_server'
+DEFAULT_KEYWORDS = ['software']
+
+# Ekstensi file yang dibaca dari folder
+HTML_EXTENSIONS = ('.html', '.htm')
 
 def fetch_html_via_proxy(url, proxy):
     """
@@ -12,13 +37,9 @@ def fetch_html_via_proxy(url, proxy):
     Returns:
     - bytes: Konten HTML dalam bentuk bytes jika permintaan berhasil, None jika gagal.
     """
-    proxies = {
-        'http': proxy,
-        'https': proxy
-    }
     try:
-        # Mengirim permintaan GET ke URL menggunakan proxy
-        response = requests.get(url, proxies=proxies)
+        # Mengirim permintaan GET ke URL menggunakan proxy lewat klien HTTP bersama (koneksi persisten)
+        response = http_client.get_client(proxy).get(url)
         return response.content
     except requests.exceptions.RequestException as e:
         # Menangani kesalahan jika permintaan gagal
@@ -34,44 +55,233 @@ def remove_and_count_occurrences(html_content, word):
     - word (str): Kata yang akan dihapus dan dihitung kemunculannya dalam teks.
 
     Returns:
-    - tuple: Dua elemen tuple yang berisi teks HTML yang telah dimodifikasi dan jumlah kemunculan kata yang dihapus. 
+    - tuple: Dua elemen tuple yang berisi teks HTML yang telah dimodifikasi (huruf kecil) dan jumlah kemunculan kata yang dihapus.
     (None, 0) jika tidak dapat menemukan elemen 'body' dalam HTML.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    body = soup.find('body')
-    if body:
-        # Menghitung jumlah kemunculan kata yang ditargetkan
-        count = body.text.lower().count(word)
-        body_text = body.get_text()
-        # Menghapus semua kemunculan kata yang ditargetkan dari teks body
-        body_without_word = body_text.lower().replace(word, '')
-        return body_without_word.strip(), count
+    pieces = []
+    # Menghitung dan menghapus kata dalam satu kali baca teks body (tanpa membangun pohon HTML)
+    found_body, counts = keyword_scan.scan_html([html_content], keyword_scan.KeywordAutomaton([word]),
+                                                redact=True, write=pieces.append)
+    if found_body:
+        return ''.join(pieces).lower().strip(), counts[word]
     # Mengembalikan None dan 0 jika elemen 'body' tidak ditemukan
     return None, 0
 
+def charset_from_content_type(content_type, default='utf-8'):
+    """
+    Mengambil charset dari header Content-Type, misalnya 'text/html; charset=UTF-8' -> 'UTF-8'.
+    """
+    for part in (content_type or '').split(';')[1:]:
+        name, _, value = part.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return default
+
+def decode_content(chunks, content_encoding):
+    """
+    Mendekompresi potongan body sesuai Content-Encoding secara bertahap.
+
+    Args:
+    - chunks (iterable): Potongan body terkompresi.
+    - content_encoding (str): Nilai header Content-Encoding (None berarti tidak terkompresi).
+
+    Yields:
+    - bytes: Potongan body asli.
+    """
+    content_encoding = (content_encoding or 'identity').strip().lower()
+    if content_encoding == 'identity':
+        yield from chunks
+        return
+    if content_encoding in ('gzip', 'x-gzip', 'deflate'):
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)  # Header gzip atau zlib dikenali otomatis
+        for chunk in chunks:
+            yield decompressor.decompress(chunk)
+        yield decompressor.flush()
+    elif content_encoding == 'br' and brotli is not None:
+        decompressor = brotli.Decompressor()
+        for chunk in chunks:
+            yield decompressor.process(chunk)
+    else:
+        raise ValueError(f'Content-Encoding {content_encoding} tidak didukung')
+
+def read_chunks(f):
+    """
+    Iterasi isi file yang sudah dibuka per potongan.
+    """
+    return iter(functools.partial(f.read, keyword_scan.DEFAULT_CHUNK_SIZE), b'')
+
+@contextlib.contextmanager
+def open_url(url, proxy):
+    """
+    Membuka halaman dari URL (lewat proxy jika ada) sebagai potongan body.
+
+    Yields:
+    - tuple: (iterator potongan body, encoding).
+    """
+    with http_client.get_client(proxy or None).stream(url) as response:
+        if response.status_code != 200:
+            raise ValueError(f'HTTP {response.status_code} {response.reason}')
+        yield response.chunks, charset_from_content_type(response.headers.get('Content-Type'))
+
+@contextlib.contextmanager
+def open_file(path):
+    """
+    Membuka file HTML sebagai potongan body.
+
+    Yields:
+    - tuple: (iterator potongan body, encoding).
+    """
+    with open(path, 'rb') as f:
+        yield read_chunks(f), 'utf-8'
+
+@contextlib.contextmanager
+def open_cached(path):
+    """
+    Membuka satu entri cache disk proxy.py sebagai potongan body (didekompresi jika perlu).
+
+    Yields:
+    - tuple: (iterator potongan body, encoding).
+    """
+    with open(path, 'rb') as f:
+        entry = response_cache.CacheEntry.from_meta(response_cache.read_meta(f), b'')
+        yield (decode_content(read_chunks(f), entry.header('Content-Encoding')),
+               charset_from_content_type(entry.header('Content-Type')))
+
+def cached_pages(cache_dir):
+    """
+    Iterasi path entri cache disk proxy.py yang berisi halaman HTML dengan status 200.
+    """
+    for path in response_cache.disk_files(cache_dir):
+        try:
+            with open(path, 'rb') as f:
+                entry = response_cache.CacheEntry.from_meta(response_cache.read_meta(f), b'')
+        except (OSError, ValueError, KeyError):
+            continue
+        if entry.status == 200 and 'html' in (entry.header('Content-Type') or ''):
+            yield path
+
+def collect_sources(args):
+    """
+    Menyusun daftar halaman yang akan diperiksa dari argumen baris perintah.
+
+    Returns:
+    - list: List (nama, fungsi pembuka) untuk setiap halaman.
+    """
+    sources = list(args.sources)
+    if args.urls_file:
+        with open(args.urls_file, 'r', encoding='utf-8') as f:
+            sources.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    if not sources and not args.cache_dir:
+        sources = [DEFAULT_URL]
+
+    documents = []
+    for source in sources:
+        if source.startswith(('http://', 'https://')):
+            documents.append((source, functools.partial(open_url, source, args.proxy)))
+        elif os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                for name in sorted(names):
+                    if name.lower().endswith(HTML_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        documents.append((path, functools.partial(open_file, path)))
+        else:
+            documents.append((source, functools.partial(open_file, source)))
+    if args.cache_dir:
+        for path in cached_pages(args.cache_dir):
+            documents.append((path, functools.partial(open_cached, path)))
+    return documents
+
+def output_path(output_dir, index, name):
+    """
+    Path file teks hasil sensor untuk halaman ke-index.
+    """
+    slug = re.sub(r'[^\w.-]+', '_', name.rstrip('/').rsplit('/', 1)[-1])[:100] or 'halaman'
+    return os.path.join(output_dir, f'{index:04d}_{slug}.txt')
+
+def scan_document(opener, automaton, replacement='', write=None):
+    """
+    Menghitung (dan menyensor jika write diberikan) kata kunci pada satu halaman.
+
+    Returns:
+    - tuple: (found_body, counts), lihat keyword_scan.scan_html.
+    """
+    with opener() as (chunks, encoding):
+        return keyword_scan.scan_html(chunks, automaton, encoding, write is not None, replacement, write)
+
+def parse_args():
+    """
+    Membaca opsi baris perintah.
+
+    Returns:
+    - argparse.Namespace: Opsi yang telah dibaca.
+    """
+    parser = argparse.ArgumentParser(description='Menghitung dan menghapus kata kunci pada teks body halaman HTML')
+    parser.add_argument('sources', nargs='*',
+                        help=f'URL, file HTML, atau folder berisi file HTML (default: {DEFAULT_URL})')
+    parser.add_argument('-k', '--keyword', action='append', dest='keywords',
+                        help='Kata kunci yang dihitung dan dihapus, bisa diulang (default: software)')
+    parser.add_argument('--keywords-file', help='File berisi satu kata kunci per baris')
+    parser.add_argument('--urls-file', help='File berisi satu URL per baris')
+    parser.add_argument('--cache-dir', help='Folder cache disk proxy.py; semua halaman HTML di dalamnya diperiksa')
+    parser.add_argument('--proxy', default=DEFAULT_PROXY,
+                        help=f"Proxy untuk mengambil URL, '' berarti langsung (default: {DEFAULT_PROXY})")
+    parser.add_argument('--case-sensitive', action='store_true', help='Membedakan huruf besar dan kecil')
+    parser.add_argument('--whole-word', action='store_true', help='Hanya menghitung kata utuh')
+    parser.add_argument('--replacement', default='', help='Pengganti setiap kata kunci (default: dihapus)')
+    parser.add_argument('--output-dir', help='Folder untuk teks body yang sudah disensor (satu file .txt per halaman)')
+    parser.add_argument('--count-only', action='store_true', help='Hanya menghitung tanpa mencetak teks')
+    return parser.parse_args()
+
 def main():
     """
-    Fungsi utama untuk mengambil konten HTML dari sebuah URL melalui proxy, 
-    menghapus dan menghitung kemunculan kata "software" dalam teks HTML, 
-    serta menampilkan hasilnya.
+    Fungsi utama untuk mengambil konten HTML dari satu atau banyak URL (melalui proxy), file,
+    atau cache proxy, menghapus dan menghitung kemunculan kata kunci (default "software") dalam
+    teks HTML, serta menampilkan hasilnya.
     """
-    proxy = 'http://localhost:9919'
-    url = 'https://en.wikipedia.org/wiki/Proxy_server'
+    args = parse_args()
+    keywords = list(args.keywords or [])
+    if args.keywords_file:
+        with open(args.keywords_file, 'r', encoding='utf-8') as f:
+            keywords.extend(line.rstrip('\r\n') for line in f if line.strip())
+    automaton = keyword_scan.KeywordAutomaton(keywords or DEFAULT_KEYWORDS, args.case_sensitive, args.whole_word)
 
-    # Mengambil konten HTML dari URL menggunakan proxy
-    html_content = fetch_html_via_proxy(url, proxy)
+    documents = collect_sources(args)
+    # Satu halaman tanpa --output-dir: teks body yang sudah disensor dicetak seperti sebelumnya
+    print_text = len(documents) == 1 and not args.output_dir and not args.count_only
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
 
-    if html_content:
-        # Menghapus dan menghitung kemunculan kata "software" dalam teks HTML
-        body_without_software, count_deleted = remove_and_count_occurrences(html_content, 'software')
+    totals = dict.fromkeys(automaton.keywords, 0)
+    scanned = 0
+    for index, (name, opener) in enumerate(documents, 1):
+        try:
+            if print_text:
+                found_body, counts = scan_document(opener, automaton, args.replacement, sys.stdout.write)
+                print()
+            elif args.output_dir and not args.count_only:
+                with open(output_path(args.output_dir, index, name), 'w', encoding='utf-8') as f:
+                    found_body, counts = scan_document(opener, automaton, args.replacement, f.write)
+            else:
+                found_body, counts = scan_document(opener, automaton)
+        except (requests.exceptions.RequestException, OSError, ValueError, zlib.error) as e:
+            print(f'Gagal memproses {name}: {e}')
+            continue
 
-        if body_without_software:
-            print(body_without_software)
+        if not found_body:
+            print(f'{name}: elemen body tidak ditemukan')
+            continue
+        scanned += 1
+        for keyword, count in counts.items():
+            totals[keyword] += count
+        if print_text:
+            # Menampilkan jumlah kemunculan setiap kata kunci yang dihapus
+            for keyword, count in counts.items():
+                print(f'Jumlah kemunculan "{keyword}" yang dihapus: {count}')
+        else:
+            print(f'{name}: ' + ', '.join(f'"{keyword}" {count}' for keyword, count in counts.items()))
 
-        # Menampilkan jumlah kemunculan kata "software" yang dihapus
-        print(f'Jumlah kemunculan "software" yang dihapus: {count_deleted}')
-    else:
-        print(f'Gagal mengambil HTML dari {url} melalui proxy {proxy}')
+    if len(documents) > 1:
+        print(f'Total {scanned} halaman: ' + ', '.join(f'"{keyword}" {count}' for keyword, count in totals.items()))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,406 @@
+import codecs  # Import modul codecs untuk decoder bytes -> teks bertahap
+import collections  # Import modul collections untuk antrean BFS saat membangun automaton
+import html.parser  # Import modul html.parser untuk membaca HTML secara streaming
+import re  # Import modul re untuk melompati teks yang tidak mungkin menjadi awal kata kunci
+
+# Ukuran potongan body (bytes) yang dibaca sekaligus
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Tag yang isinya tidak termasuk teks halaman (sama seperti get_text() BeautifulSoup)
+HIDDEN_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Tag yang spasinya dipertahankan; di luar tag ini, teks yang hanya berisi spasi diringkas menjadi
+# satu ' ' atau '\n' (seperti BeautifulSoup)
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+
+# Karakter spasi ASCII (yang diringkas BeautifulSoup)
+ASCII_WHITESPACE = ' \t\n\r\f'
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho-Corasick untuk mencari banyak kata kunci sekaligus dalam satu kali baca teks.
+
+    Kecocokan dipilih dengan aturan leftmost-longest tanpa tumpang tindih: kecocokan yang mulai
+    paling kiri menang, dan jika mulai di posisi yang sama, kata kunci terpanjang yang menang.
+    Untuk satu kata kunci, jumlahnya sama dengan str.count().
+
+    Metode:
+    - scanner: Membuat KeywordScanner untuk satu dokumen.
+
+    Atribut:
+    - keywords: List kata kunci (tanpa duplikat, sesuai urutan asli).
+    - case_sensitive: False berarti huruf besar/kecil diabaikan (seperti str.lower()).
+    - whole_word: True berarti kecocokan harus diapit batas kata (bukan huruf, angka, atau '_').
+    - max_length: Panjang kata kunci terpanjang.
+    """
+
+    def __init__(self, keywords, case_sensitive=False, whole_word=False):
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.keywords = []
+        folded_keywords = {}
+        for keyword in keywords:
+            folded = self.fold(keyword)
+            if folded and folded not in folded_keywords:
+                folded_keywords[folded] = len(self.keywords)
+                self.keywords.append(keyword)
+        if not self.keywords:
+            raise ValueError('Minimal satu kata kunci yang tidak kosong diperlukan')
+        self.max_length = max(len(keyword) for keyword in folded_keywords)
+
+        # Trie: transisi, kedalaman node, dan indeks kata kunci yang berakhir di node
+        self.goto = [{}]
+        self.depth = [0]
+        self.output = [-1]
+        for folded, index in folded_keywords.items():
+            node = 0
+            for char in folded:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.depth.append(self.depth[node] + 1)
+                    self.output.append(-1)
+                node = next_node
+            self.output[node] = index
+
+        # Failure link dan dictionary link (node terdekat di rantai failure yang merupakan kata kunci)
+        self.fail = [0] * len(self.goto)
+        self.report = [0] * len(self.goto)
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            fail = self.fail[node]
+            self.report[node] = node if self.output[node] >= 0 else self.report[fail]
+            for char, child in self.goto[node].items():
+                state = fail
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                queue.append(child)
+        self.dictionary = [self.report[self.fail[node]] for node in range(len(self.goto))]
+
+        first_chars = ''.join(sorted(self.goto[0]))
+        self.first_char_pattern = re.compile('[' + re.escape(first_chars) + ']')
+
+    def fold(self, text):
+        """
+        Menyamakan huruf besar/kecil teks tanpa mengubah panjangnya, sehingga posisi karakter di
+        teks asli dan teks hasil fold tetap sama.
+        """
+        if self.case_sensitive:
+            return text
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded
+        # Beberapa karakter (misalnya 'İ') menjadi lebih dari satu karakter; karakter itu dibiarkan
+        return ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+    def scanner(self, redact=False, replacement=''):
+        """
+        Membuat KeywordScanner untuk satu dokumen.
+
+        Args:
+        - redact (bool): True untuk menghasilkan teks dengan kata kunci diganti replacement.
+        - replacement (str): Pengganti setiap kecocokan (default dihapus).
+
+        Returns:
+        - KeywordScanner: Scanner baru.
+        """
+        return KeywordScanner(self, redact, replacement)
+
+
+class KeywordScanner:
+    """
+    Penghitung dan penyensor kata kunci untuk satu dokumen yang teksnya diberikan sedikit demi
+    sedikit. Hanya sisa teks sepanjang kata kunci terpanjang yang disimpan di antara potongan,
+    sehingga memori tetap walaupun dokumennya besar, dan kata kunci yang terpotong di antara dua
+    potongan tetap ditemukan.
+
+    Metode:
+    - feed: Memproses potongan teks berikutnya.
+    - close: Menyelesaikan dokumen.
+
+    Atribut:
+    - counts: List jumlah kecocokan per kata kunci (urutan automaton.keywords).
+    """
+
+    def __init__(self, automaton, redact=False, replacement=''):
+        self.automaton = automaton
+        self.redact = redact
+        self.replacement = replacement
+        self.counts = [0] * len(automaton.keywords)
+        self.state = 0
+        self.buffer = ''  # Sisa teks yang masih diperlukan, dimulai di posisi base
+        self.base = 0
+        self.position = 0  # Posisi karakter berikutnya yang belum diproses
+        self.emitted = 0  # Teks sebelum posisi ini sudah dikeluarkan (mode redact)
+        self.last_end = 0  # Akhir kecocokan terakhir yang dipilih (kecocokan berikutnya tidak boleh tumpang tindih)
+        self.pending = []  # Kecocokan (start, end, indeks) yang belum pasti dipilih
+        self.unconfirmed = []  # Kecocokan whole_word yang menunggu karakter setelahnya
+        self.spans = []  # Kecocokan terpilih yang belum dikeluarkan (mode redact)
+
+    def feed(self, text):
+        """
+        Memproses potongan teks berikutnya.
+
+        Args:
+        - text (str): Potongan teks.
+
+        Returns:
+        - str: Teks hasil sensor yang sudah pasti (kosong jika redact False).
+        """
+        automaton = self.automaton
+        goto, fail, depth = automaton.goto, automaton.fail, automaton.depth
+        report, dictionary = automaton.report, automaton.dictionary
+        whole_word = automaton.whole_word
+        first_char = automaton.first_char_pattern.search
+        pending, unconfirmed = self.pending, self.unconfirmed
+
+        buffer = self.buffer + text
+        folded = automaton.fold(buffer)
+        base = self.base
+        state = self.state
+        i = self.position - base
+        length = len(buffer)
+        while i < length:
+            if not state and not unconfirmed:
+                # Di root tanpa kecocokan yang menunggu: lompat ke karakter awal kata kunci berikutnya
+                if pending:
+                    self.resolve(base + i)
+                match = first_char(folded, i)
+                if match is None:
+                    i = length
+                    break
+                i = match.start()
+            char = folded[i]
+            if unconfirmed:
+                if not is_word_char(char):
+                    pending.extend(match for match in unconfirmed if match[0] >= self.last_end)
+                unconfirmed.clear()
+
+            node = goto[state].get(char)
+            while node is None and state:
+                state = fail[state]
+                node = goto[state].get(char)
+            state = node or 0
+
+            hit = report[state]
+            while hit:
+                end = base + i + 1
+                start = end - depth[hit]
+                if start >= self.last_end and (not whole_word or start == 0 or not is_word_char(folded[start - 1 - base])):
+                    (unconfirmed if whole_word else pending).append((start, end, automaton.output[hit]))
+                hit = dictionary[hit]
+            i += 1
+            if pending:
+                self.resolve(self.frontier(base + i, state))
+
+        self.state = state
+        self.position = base + length
+        if pending:
+            self.resolve(self.frontier(self.position, state))
+        return self.flush(buffer, self.frontier(self.position, state))
+
+    def close(self):
+        """
+        Menyelesaikan dokumen: kecocokan yang masih menunggu diputuskan (akhir dokumen dianggap
+        batas kata).
+
+        Returns:
+        - str: Sisa teks hasil sensor (kosong jika redact False).
+        """
+        self.pending.extend(match for match in self.unconfirmed if match[0] >= self.last_end)
+        self.unconfirmed.clear()
+        self.resolve(float('inf'))
+        self.state = 0
+        return self.flush(self.buffer, self.position)
+
+    def frontier(self, position, state):
+        """
+        Posisi paling kiri tempat kecocokan yang belum ditemukan masih mungkin dimulai.
+        """
+        frontier = position - self.automaton.depth[state]
+        if self.unconfirmed:
+            frontier = min(frontier, min(start for start, _, _ in self.unconfirmed))
+        return frontier
+
+    def resolve(self, frontier):
+        """
+        Memilih kecocokan yang sudah pasti: kecocokan dengan posisi mulai terkecil (lalu terpanjang)
+        dipilih jika dimulai sebelum frontier, karena tidak ada kecocokan lain yang bisa mendahuluinya.
+        """
+        pending = self.pending
+        while pending:
+            best = min(pending, key=lambda match: (match[0], -match[1]))
+            if best[0] >= frontier:
+                break
+            start, end, index = best
+            self.counts[index] += 1
+            self.last_end = end
+            if self.redact:
+                self.spans.append((start, end))
+            pending[:] = [match for match in pending if match[0] >= end]
+
+    def flush(self, buffer, safe):
+        """
+        Mengeluarkan teks hasil sensor sampai posisi safe dan membuang teks yang tidak diperlukan
+        lagi dari buffer (satu karakter sebelum frontier disimpan untuk pemeriksaan batas kata).
+        """
+        base = self.base
+        if self.pending:
+            safe = min(safe, min(start for start, _, _ in self.pending))
+        safe = min(safe, base + len(buffer))
+        pieces = []
+        if self.redact:
+            emitted = self.emitted
+            for start, end in self.spans:
+                pieces.append(buffer[emitted - base:start - base])
+                pieces.append(self.replacement)
+                emitted = end
+            self.spans.clear()
+            if safe > emitted:
+                pieces.append(buffer[emitted - base:safe - base])
+                emitted = safe
+            self.emitted = emitted
+            keep = min(emitted, safe) - 1
+        else:
+            keep = safe - 1
+        keep = max(keep, base)
+        self.buffer = buffer[keep - base:]
+        self.base = keep
+        return ''.join(pieces)
+
+
+class BodyTextParser(html.parser.HTMLParser):
+    """
+    Parser HTML streaming yang meneruskan teks di dalam <body> ke callback on_text tanpa
+    membangun pohon dokumen. Teks yang diteruskan sama seperti get_text() BeautifulSoup: isi
+    script, style, template, rt, dan rp dilewati, dan teks yang hanya berisi spasi diringkas.
+
+    Atribut:
+    - found_body: True jika tag <body> ditemukan.
+    """
+
+    def __init__(self, on_text):
+        super().__init__(convert_charrefs=True)
+        self.on_text = on_text
+        self.found_body = False
+        self.body_depth = 0
+        self.hidden_depth = 0
+        self.preserve_depth = 0
+        self.spaces = ''  # Awal node teks yang sejauh ini hanya berisi spasi
+        self.in_text = False  # True jika node teks saat ini sudah berisi karakter selain spasi
+
+    def handle_starttag(self, tag, attrs):
+        self.end_text()
+        if tag == 'body':
+            self.found_body = True
+            self.body_depth += 1
+        elif self.body_depth and tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+
+    def handle_endtag(self, tag):
+        self.end_text()
+        if tag == 'body':
+            if self.body_depth:
+                self.body_depth -= 1
+        elif self.hidden_depth and tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth -= 1
+        elif self.preserve_depth and tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth -= 1
+
+    def handle_data(self, data):
+        if not self.body_depth or self.hidden_depth:
+            return
+        if self.preserve_depth or self.in_text:
+            self.on_text(data)
+        elif data.strip(ASCII_WHITESPACE):
+            # Satu node teks bisa datang dalam beberapa potongan; spasi di awalnya ikut diteruskan
+            self.on_text(self.spaces + data)
+            self.spaces = ''
+            self.in_text = True
+        else:
+            self.spaces += data
+
+    def handle_comment(self, data):
+        self.end_text()
+
+    def handle_decl(self, decl):
+        self.end_text()
+
+    def handle_pi(self, data):
+        self.end_text()
+
+    def unknown_decl(self, data):
+        self.end_text()
+        # Isi <![CDATA[...]]> termasuk teks halaman
+        if data.startswith('CDATA[') and self.body_depth and not self.hidden_depth:
+            self.on_text(data[len('CDATA['):])
+
+    def close(self):
+        super().close()
+        self.end_text()
+
+    def end_text(self):
+        """
+        Mengakhiri node teks saat ini: node yang hanya berisi spasi diteruskan sebagai satu ' '
+        atau '\n'.
+        """
+        if self.spaces:
+            self.on_text('\n' if '\n' in self.spaces else ' ')
+            self.spaces = ''
+        self.in_text = False
+
+
+def scan_html(chunks, automaton, encoding='utf-8', redact=False, replacement='', write=None):
+    """
+    Menghitung (dan menyensor) kata kunci pada teks body HTML dalam satu kali baca. Body dibaca
+    per potongan, di-decode secara bertahap, lalu teksnya langsung diteruskan ke automaton,
+    sehingga memori per dokumen tetap dan tidak bergantung pada ukuran halaman.
+
+    Args:
+    - chunks (iterable): Potongan body HTML (bytes atau str).
+    - automaton (KeywordAutomaton): Automaton kata kunci.
+    - encoding (str): Encoding body jika potongan berupa bytes.
+    - redact (bool): True untuk menghasilkan teks body dengan kata kunci disensor.
+    - replacement (str): Pengganti setiap kecocokan.
+    - write (callable, optional): Dipanggil dengan setiap potongan teks hasil sensor.
+
+    Returns:
+    - tuple: (found_body, counts); found_body False jika elemen 'body' tidak ditemukan, counts
+      adalah dictionary {kata kunci: jumlah}.
+    """
+    scanner = automaton.scanner(redact, replacement)
+    texts = []
+    parser = BodyTextParser(texts.append)
+    decoder = codecs.getincrementaldecoder(encoding)('replace')
+
+    def drain():
+        # Teks dari satu potongan body diproses sekaligus (bukan per node teks)
+        piece = scanner.feed(''.join(texts)) if texts else ''
+        texts.clear()
+        return piece
+
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        piece = drain()
+        if piece and write is not None:
+            write(piece)
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    piece = drain() + scanner.close()
+    if piece and write is not None:
+        write(piece)
+    return parser.found_body, dict(zip(automaton.keywords, scanner.counts))
+
+
+def is_word_char(char):
+    """
+    Memeriksa apakah karakter termasuk bagian kata (huruf, angka, atau '_').
+    """
+    return char.isalnum() or char == '_'
@@ -1,93 +1,783 @@
-import socket  # Import modul socket untuk koneksi socket
-import select  # Import modul select untuk multiplexing IO
-import http.server  # Import modul http.server untuk membuat HTTP server
-import urllib.parse  # Import modul urllib.parse untuk parsing URL
-
-class ProxyHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
-    """
-    Penanganan permintaan HTTP untuk proxy yang meneruskan permintaan koneksi CONNECT.
-
-    Metode:
-    - do_CONNECT: Menangani permintaan koneksi CONNECT.
-    - connect_to_target: Terhubung ke server target untuk permintaan CONNECT.
-    - exchange_data: Pertukaran data antara klien dan server target.
-
-    Atribut:
-    - self.path: Path atau URL yang diminta oleh klien.
-    - self.command: Metode permintaan (CONNECT).
-    - self.headers: Header permintaan dari klien.
-    - self.connection: Koneksi socket ke klien.
-    """
-
-    def do_CONNECT(self):
-        """
-        Menangani permintaan koneksi CONNECT dari klien.
-        """
-        self.connect_to_target()
-
-    def connect_to_target(self):
-        """
-        Terhubung ke server target sesuai dengan permintaan CONNECT dari klien.
-        """
-        try:
-            address = self.path.split(':')  # Memisahkan host dan port dari self.path
-            host = address[0]  # Mendapatkan host
-            port = int(address[1])  # Mendapatkan port
-
-            # Membuat koneksi ke server target
-            soc = socket.create_connection((host, port))
-
-            # Memberi respons ke klien bahwa koneksi berhasil dibuat
-            self.send_response(200, 'Connection established')
-            self.end_headers()
-
-            # Pertukaran data antara klien dan server target
-            self.exchange_data(soc)
-        except Exception as e:
-            self.send_error(500, str(e))  # Mengirim respons error jika terjadi exception
-
-    def exchange_data(self, soc):
-        """
-        Melakukan pertukaran data antara klien (melalui self.connection) dan server target (soc).
-        """
-        try:
-            soc.setblocking(0)  # Mengatur socket server agar non-blocking
-            self.connection.setblocking(0)  # Mengatur socket klien agar non-blocking
-
-            while True:
-                # Memilih socket yang siap untuk dibaca atau ditulis
-                read_sockets, _, _ = select.select([self.connection, soc], [], [])
-
-                # Menerima data dari klien dan meneruskannya ke server target
-                if self.connection in read_sockets:
-                    data = self.connection.recv(4096)
-                    if not data:
-                        break
-                    soc.sendall(data)
-
-                # Menerima data dari server target dan meneruskannya ke klien
-                if soc in read_sockets:
-                    data = soc.recv(4096)
-                    if not data:
-                        break
-                    self.connection.sendall(data)
-        finally:
-            soc.close()  # Menutup koneksi socket server
-            self.connection.close()  # Menutup koneksi socket klien
-
-def run(server_class=http.server.HTTPServer, handler_class=ProxyHTTPRequestHandler, port=9919):
-    """
-    Fungsi untuk menjalankan server proxy HTTP pada port yang ditentukan.
-
-    Args:
-    - server_class: Kelas server HTTP yang digunakan (default: http.server.HTTPServer).
-    - handler_class: Kelas penanganan permintaan HTTP (default: ProxyHTTPRequestHandler).
-    - port: Port tempat server proxy HTTP akan berjalan (default: 9919).
-    """
-    server_address = ('', port)  # Alamat server kosong artinya akan mendengarkan semua antarmuka
-    httpd = server_class(server_address, handler_class)
-    print(f'Mulai server proxy pada port {port}...')
-    httpd.serve_forever()  # Memulai server dan terus berjalan
-
-if __name__ == '__main__':
-    run()  # Memanggil fungsi run() jika script ini dijalankan sebagai program utama
+import socket  # Import modul socket untuk koneksi socket
+import http.server  # Import modul http.server untuk membuat HTTP server
+import http.client  # Import modul http.client untuk error koneksi ke server asal
+import urllib.parse  # Import modul urllib.parse untuk parsing URL
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import threading  # Import modul threading untuk statistik cache berkala dan slot tunnel
+import time  # Import modul time untuk interval statistik cache
+import signal  # Import modul signal untuk drain saat SIGTERM
+
+import async_proxy  # Import mode server berbasis asyncio
+import relay  # Import mesin relay tunnel (splice / ring buffer)
+import reactor  # Import reactor bersama untuk semua tunnel
+import connection_pool  # Import pool koneksi keep-alive ke server asal
+import response_cache  # Import cache respons (LRU memori + disk)
+import dns_cache  # Import cache DNS dan koneksi Happy Eyeballs
+import upstream_pool  # Import pool upstream proxy berbobot dengan circuit breaker
+import telemetry  # Import metrik Prometheus dan endpoint admin /metrics
+import supervisor  # Import supervisor pre-fork untuk mode multi-proses
+
+# Header hop-by-hop yang hanya berlaku untuk satu koneksi dan tidak boleh diteruskan (RFC 9110)
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-connection', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade',
+}
+
+# Ukuran potongan body respons yang diteruskan ke klien per iterasi
+FORWARD_CHUNK_SIZE = 65536
+
+# Batas waktu default (detik) menyelesaikan koneksi yang berjalan setelah SIGTERM
+DEFAULT_DRAIN_TIMEOUT = 30
+
+class ProxyHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Penanganan permintaan HTTP untuk proxy yang meneruskan permintaan koneksi CONNECT
+    dan permintaan HTTP biasa (GET, POST, HEAD) dengan URI absolut.
+
+    Metode:
+    - do_CONNECT: Menangani permintaan koneksi CONNECT.
+    - do_GET, do_POST, do_HEAD: Meneruskan permintaan HTTP biasa ke server asal.
+    - forward_request: Mengirim permintaan ke server asal lewat pool koneksi keep-alive,
+      atau menjawab dari cache respons jika tersedia.
+    - connect_to_target: Terhubung ke server target untuk permintaan CONNECT.
+    - exchange_data: Pertukaran data antara klien dan server target (tanpa reactor).
+    - hand_off_to_reactor: Menyerahkan pasangan socket tunnel ke reactor bersama.
+
+    Atribut:
+    - self.path: Path atau URL yang diminta oleh klien.
+    - self.command: Metode permintaan (CONNECT, GET, POST, HEAD).
+    - self.headers: Header permintaan dari klien.
+    - self.connection: Koneksi socket ke klien.
+    - relay_buffer_size: Ukuran buffer relay per arah tunnel (dalam bytes).
+    - use_splice: Memakai os.splice (tanpa salinan) untuk relay jika tersedia.
+    - reactor: TunnelReactor bersama. Jika None, setiap tunnel di-relay oleh handler-nya sendiri.
+    - max_tunnels: Jumlah maksimal tunnel aktif di reactor sebelum permintaan dijawab 503.
+    - tunnel_slots: BoundedSemaphore sebesar max_tunnels; slot diambil sebelum koneksi ke target
+      dan dilepas saat tunnel ditutup. Jika None, jumlah tunnel tidak dibatasi.
+    - pool: ConnectionPool bersama untuk koneksi keep-alive ke server asal.
+    - cache: ResponseCache bersama untuk permintaan GET. Jika None, cache tidak dipakai.
+    - resolver: DNSCache bersama untuk resolusi dan koneksi Happy Eyeballs ke server target.
+    - upstreams: UpstreamPool untuk meneruskan semua lalu lintas lewat upstream proxy.
+      Jika None, proxy terhubung langsung ke server target.
+    - metrics: telemetry.Metrics bersama untuk counter dan histogram endpoint /metrics
+      (diganti telemetry.NullMetrics oleh run() jika endpoint tidak aktif).
+    """
+
+    # HTTP/1.1 agar koneksi klien juga bisa keep-alive untuk permintaan HTTP biasa
+    protocol_version = 'HTTP/1.1'
+    # Header dan body respons dikirim dengan write terpisah; tanpa TCP_NODELAY klien keep-alive
+    # menunggu delayed ACK (~40 ms) di setiap respons
+    disable_nagle_algorithm = True
+    resolver = dns_cache.DNSCache()
+    pool = connection_pool.ConnectionPool(connector=resolver.create_connection)
+    cache = None
+    upstreams = None
+    metrics = telemetry.Metrics()
+    relay_buffer_size = relay.DEFAULT_BUFFER_SIZE
+    use_splice = True
+    reactor = None
+    max_tunnels = async_proxy.DEFAULT_MAX_TUNNELS
+    tunnel_slots = None
+
+    def handle_one_request(self):
+        """
+        Menangani satu permintaan. Saat server sedang drain, koneksi keep-alive ditutup
+        setelah respons selesai agar klien membuka koneksi baru ke worker lain.
+        """
+        super().handle_one_request()
+        if getattr(self.server, 'draining', False):
+            self.close_connection = True
+
+    def do_CONNECT(self):
+        """
+        Menangani permintaan koneksi CONNECT dari klien.
+        """
+        self.connect_to_target()
+
+    def connect_to_target(self):
+        """
+        Terhubung ke server target sesuai dengan permintaan CONNECT dari klien.
+        """
+        # Koneksi klien dipakai oleh tunnel sehingga tidak bisa menerima permintaan lain
+        self.close_connection = True
+
+        # Menolak tunnel baru jika semua slot sudah terpakai. Slot diambil secara atomik sebelum
+        # koneksi ke target dibuka; memeriksa reactor.active_tunnels saja meloloskan handler yang
+        # masih membuka koneksi sehingga batasnya terlewati
+        slots = self.tunnel_slots
+        if slots is not None and not slots.acquire(blocking=False):
+            self.send_error(503, 'Too many tunnels')
+            return
+
+        start = time.monotonic()
+        try:
+            address = self.path.split(':')  # Memisahkan host dan port dari self.path
+            host = address[0]  # Mendapatkan host
+            port = int(address[1])  # Mendapatkan port
+
+            upstream = None
+            if self.upstreams is not None:
+                # Membuat tunnel ke server target lewat salah satu upstream proxy
+                soc, upstream = self.upstreams.open_tunnel(host, port, self.connect_upstream)
+                soc.settimeout(None)
+            else:
+                # Membuat koneksi ke server target (cache DNS + Happy Eyeballs dengan batas waktu)
+                soc = self.resolver.create_connection(host, port)
+        except upstream_pool.UpstreamRefused as e:
+            if slots is not None:
+                slots.release()
+            # Status penolakan dari upstream (misalnya 403 atau 502) diteruskan apa adanya ke klien
+            self.metrics.error('connect', e)
+            self.send_error(e.status, e.reason or None)
+            return
+        except Exception as e:
+            if slots is not None:
+                slots.release()
+            self.metrics.error('connect', e)
+            self.send_error(500, str(e))  # Mengirim respons error jika terjadi exception
+            return
+        opened = time.monotonic()
+        self.metrics.tunnel_opened(host, opened - start)
+
+        def on_close(bytes_up, bytes_down):
+            if slots is not None:
+                slots.release()
+            # Upstream dilepas saat tunnel ditutup agar hitungan least-connections tetap akurat
+            if upstream is not None:
+                self.upstreams.release(upstream)
+            self.metrics.tunnel_closed(host, bytes_up, bytes_down, time.monotonic() - opened)
+
+        bytes_relayed = (0, 0)
+        try:
+            # Memberi respons ke klien bahwa koneksi berhasil dibuat
+            self.send_response(200, 'Connection established')
+            self.end_headers()
+
+            # Pertukaran data antara klien dan server target
+            if self.reactor is not None:
+                self.hand_off_to_reactor(soc, on_close)
+                return
+            bytes_relayed = self.exchange_data(soc)
+        except Exception as e:
+            self.metrics.error('relay', e)
+            self.send_error(500, str(e))  # Mengirim respons error jika terjadi exception
+        on_close(*bytes_relayed)
+
+    def connect_upstream(self, host, port):
+        """
+        Membuka koneksi ke upstream proxy dengan batas waktu koneksi dari resolver.
+        """
+        return self.resolver.create_connection(host, port, self.resolver.connect_timeout)
+
+    def do_GET(self):
+        """
+        Meneruskan permintaan GET ke server asal.
+        """
+        self.forward_request()
+
+    def do_POST(self):
+        """
+        Meneruskan permintaan POST ke server asal.
+        """
+        self.forward_request()
+
+    def do_HEAD(self):
+        """
+        Meneruskan permintaan HEAD ke server asal.
+        """
+        self.forward_request()
+
+    def forward_request(self):
+        """
+        Meneruskan permintaan HTTP biasa dengan URI absolut (misalnya 'http://host/path')
+        ke server asal memakai koneksi keep-alive dari pool, lalu meneruskan responsnya ke klien.
+        """
+        url = urllib.parse.urlsplit(self.path)
+        if url.scheme != 'http' or not url.hostname:
+            self.send_error(400, 'Proxy hanya menerima URI absolut http://')
+            return
+
+        host = url.hostname
+        port = url.port or 80
+        path = urllib.parse.urlunsplit(('', '', url.path or '/', url.query, ''))
+        body = self.read_request_body()
+        headers = forward_headers(self.headers)
+        headers.setdefault('Host', url.netloc)
+
+        # Menjawab dari cache jika entri masih segar, atau menyiapkan validasi ulang jika tidak
+        use_cache = self.cache is not None and self.command == 'GET'
+        entry = self.cache.lookup(self.path, self.headers) if use_cache else None
+        revalidating = False
+        if entry is not None:
+            request_directives = response_cache.parse_cache_control(self.headers)
+            if entry.is_fresh() and 'no-cache' not in request_directives and request_directives.get('max-age') != '0':
+                self.cache.record_hit(entry)
+                self.send_cached(entry, 'HIT')
+                self.metrics.request(self.command, host, entry.status, 'HIT')
+                return
+            # Validator milik klien diteruskan apa adanya; validator cache hanya dipakai jika klien tidak mengirimnya
+            if 'If-None-Match' not in self.headers and 'If-Modified-Since' not in self.headers:
+                validators = response_cache.conditional_headers(entry)
+                headers.update(validators)
+                revalidating = bool(validators)
+
+        upstream = None
+        start = time.monotonic()
+        try:
+            if self.upstreams is not None:
+                # Upstream proxy menerima URI absolut, bukan path saja
+                absolute_url = urllib.parse.urlunsplit(('http', url.netloc, url.path or '/', url.query, ''))
+                response, conn, upstream = self.send_via_upstreams(absolute_url, body, headers)
+            else:
+                response, conn = self.send_upstream(host, port, path, body, headers)
+        except Exception as e:
+            self.metrics.error('forward', e)
+            self.metrics.request(self.command, host, 502, 'NONE')
+            self.send_error(502, str(e))  # Mengirim respons error jika server asal gagal dihubungi
+            return
+        duration = time.monotonic() - start
+
+        reusable = False
+        try:
+            if revalidating and response.status == 304:
+                # Server asal menyatakan entri belum berubah: body diambil dari cache
+                response.read()
+                reusable = not response.will_close
+                entry = self.cache.refresh(self.path, entry, response.getheaders())
+                self.cache.record_revalidated(entry)
+                self.send_cached(entry, 'REVALIDATED')
+                self.metrics.request(self.command, host, entry.status, 'REVALIDATED', duration)
+                return
+
+            self.metrics.request(self.command, host, response.status, 'MISS' if use_cache else 'NONE', duration)
+            if not use_cache:
+                self.relay_response(response)
+            else:
+                self.cache.record_miss()
+                received_at = time.time()
+                captured = self.relay_response(response, self.cache.max_object_bytes, 'MISS')
+                if captured is not None:
+                    self.cache.store(self.path, self.headers, response.status, response.reason,
+                                     response.getheaders(), captured, received_at)
+            reusable = not response.will_close
+        finally:
+            response.close()
+            self.pool.release(conn, reusable)
+            if upstream is not None:
+                self.upstreams.release(upstream)
+
+    def send_via_upstreams(self, url, body, headers):
+        """
+        Mengirim permintaan lewat upstream proxy pilihan UpstreamPool. Jika upstream gagal,
+        kegagalannya dicatat dan permintaan idempoten (GET, HEAD) dicoba lewat upstream lain.
+
+        Args:
+        - url (str): URI absolut permintaan.
+        - body (bytes or None): Body permintaan.
+        - headers (dict): Header permintaan.
+
+        Returns:
+        - tuple: (http.client.HTTPResponse, http.client.HTTPConnection, UpstreamProxy). Pemanggil
+          wajib memanggil self.upstreams.release(upstream) setelah respons selesai diteruskan.
+        """
+        tried = []
+        while True:
+            upstream = self.upstreams.choose(exclude=tried)
+            if upstream is None:
+                raise upstream_pool.UpstreamError(f'Semua upstream gagal meneruskan {url}')
+            tried.append(upstream)
+            self.upstreams.acquire(upstream)
+            start = time.monotonic()
+            try:
+                response, conn = self.send_upstream(upstream.host, upstream.port, url, body, headers)
+            except (OSError, http.client.HTTPException):
+                self.upstreams.record_failure(upstream)
+                self.upstreams.release(upstream)
+                if self.command not in ('GET', 'HEAD'):
+                    raise
+                continue
+            self.upstreams.record_success(upstream, time.monotonic() - start)
+            return response, conn, upstream
+
+    def send_cached(self, entry, cache_status):
+        """
+        Mengirim respons dari entri cache ke klien. Jika validator klien (If-None-Match)
+        cocok dengan ETag entri, yang dikirim adalah 304 tanpa body.
+
+        Args:
+        - entry (response_cache.CacheEntry): Entri cache yang dikirim.
+        - cache_status (str): Nilai header X-Cache ('HIT' atau 'REVALIDATED').
+        """
+        etag = entry.header('ETag')
+        not_modified = etag is not None and etag in self.headers.get('If-None-Match', '')
+        status, reason = (304, 'Not Modified') if not_modified else (entry.status, entry.reason)
+
+        self.send_response_only(status, reason)
+        for name, value in entry.headers:
+            self.send_header(name, value)
+        self.send_header('Age', str(entry.age()))
+        self.send_header('X-Cache', cache_status)
+        if not not_modified:
+            self.send_header('Content-Length', str(entry.size))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.log_request(status)
+        if not not_modified:
+            self.wfile.write(entry.body)
+
+    def send_upstream(self, host, port, path, body, headers):
+        """
+        Mengirim permintaan ke server asal. Jika koneksi dari pool ternyata sudah ditutup
+        server, permintaan dikirim ulang sekali dengan koneksi baru.
+
+        Returns:
+        - tuple: (http.client.HTTPResponse, http.client.HTTPConnection).
+        """
+        while True:
+            conn, reused = self.pool.acquire(host, port)
+            try:
+                conn.request(self.command, path, body=body, headers=headers)
+                return conn.getresponse(), conn
+            except (ConnectionError, http.client.BadStatusLine):
+                self.pool.release(conn, reusable=False)
+                # Hanya metode idempoten yang aman dikirim ulang
+                if not reused or self.command not in ('GET', 'HEAD'):
+                    raise
+            except Exception:
+                self.pool.release(conn, reusable=False)
+                raise
+
+    def read_request_body(self):
+        """
+        Membaca body permintaan klien (Content-Length atau chunked).
+
+        Returns:
+        - bytes or None: Body permintaan, None jika permintaan tidak memiliki body.
+        """
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    # Membuang trailer sampai baris kosong
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else None
+
+    def relay_response(self, response, capture_limit=None, cache_status=None):
+        """
+        Meneruskan status, header, dan body respons server asal ke klien.
+
+        Body dengan Content-Length diteruskan apa adanya; body tanpa panjang diteruskan
+        dengan chunked encoding (HTTP/1.1) atau diakhiri dengan menutup koneksi (HTTP/1.0).
+
+        Args:
+        - response (http.client.HTTPResponse): Respons dari server asal.
+        - capture_limit (int, optional): Jika diisi, body juga dikumpulkan selama ukurannya
+          tidak melebihi batas ini (untuk disimpan ke cache).
+        - cache_status (str, optional): Nilai header X-Cache yang ditambahkan ke respons.
+
+        Returns:
+        - bytes or None: Body lengkap jika dikumpulkan dan tidak melebihi capture_limit, None jika tidak.
+        """
+        self.send_response_only(response.status, response.reason)
+        skipped = HOP_BY_HOP_HEADERS | connection_tokens(response.headers)
+        for name, value in response.getheaders():
+            if name.lower() not in skipped:
+                self.send_header(name, value)
+        if cache_status:
+            self.send_header('X-Cache', cache_status)
+
+        has_body = self.command != 'HEAD' and response.status >= 200 and response.status not in (204, 304)
+        chunked = has_body and response.length is None and self.request_version == 'HTTP/1.1'
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        elif has_body and response.length is None:
+            self.close_connection = True
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.log_request(response.status)
+
+        captured = [] if capture_limit is not None else None
+        captured_size = 0
+        if not has_body:
+            return b'' if captured is not None else None
+        while True:
+            data = response.read1(FORWARD_CHUNK_SIZE)
+            if not data:
+                break
+            if chunked:
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            else:
+                self.wfile.write(data)
+            if captured is not None:
+                captured_size += len(data)
+                if captured_size > capture_limit:
+                    captured = None  # Respons terlalu besar untuk cache, berhenti mengumpulkan
+                else:
+                    captured.append(data)
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
+        return b''.join(captured) if captured is not None else None
+
+    def exchange_data(self, soc):
+        """
+        Melakukan pertukaran data antara klien (melalui self.connection) dan server target (soc).
+
+        Relay memakai os.splice jika tersedia, atau ring buffer yang dialokasikan sekali
+        (lihat modul relay), sehingga tidak ada alokasi bytes baru per recv.
+
+        Returns:
+        - tuple: Jumlah bytes (klien -> target, target -> klien).
+        """
+        try:
+            return relay.relay(self.connection, soc, self.relay_buffer_size, self.use_splice)
+        finally:
+            soc.close()  # Menutup koneksi socket server
+            self.connection.close()  # Menutup koneksi socket klien
+
+    def hand_off_to_reactor(self, soc, on_close=None):
+        """
+        Menyerahkan socket klien dan socket server target (soc) ke reactor bersama.
+
+        Socket klien dilepas (detach) dari handler agar http.server tidak menutupnya saat
+        handler selesai; setelah ini reactor yang meneruskan data dan menutup kedua socket.
+        Fungsi on_close(bytes_up, bytes_down) (opsional) dipanggil reactor setelah tunnel ditutup.
+        """
+        client = socket.socket(fileno=self.connection.detach())
+        self.close_connection = True
+        self.reactor.register(client, soc, on_close)
+
+def connection_tokens(headers):
+    """
+    Mengambil nama header tambahan yang ditandai hop-by-hop lewat header Connection.
+
+    Args:
+    - headers (http.client.HTTPMessage): Header permintaan atau respons.
+
+    Returns:
+    - set: Nama header (huruf kecil) yang tidak boleh diteruskan.
+    """
+    return {token.strip().lower() for value in headers.get_all('Connection', []) for token in value.split(',')}
+
+def forward_headers(headers):
+    """
+    Menyalin header permintaan klien tanpa header hop-by-hop.
+
+    Args:
+    - headers (http.client.HTTPMessage): Header permintaan klien.
+
+    Returns:
+    - dict: Header yang akan dikirim ke server asal.
+    """
+    skipped = HOP_BY_HOP_HEADERS | connection_tokens(headers)
+    return {name: value for name, value in headers.items() if name.lower() not in skipped}
+
+class ProxyHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer yang menghitung handler yang sedang berjalan, sehingga server bisa
+    berhenti menerima koneksi lalu menunggu koneksi yang berjalan selesai (drain).
+
+    Atribut:
+    - active_requests: Jumlah koneksi klien yang sedang ditangani.
+    - draining: True setelah server mulai drain; koneksi keep-alive ditutup setelah respons berikutnya.
+    """
+
+    # Backlog listen; default socketserver (5) membuat koneksi bersamaan ditolak atau tertunda SYN retry
+    request_queue_size = 1024
+
+    def __init__(self, server_address, handler_class, bind_and_activate=True):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        self.active_lock = threading.Lock()
+        self.active_requests = 0
+        self.draining = False
+
+    def process_request_thread(self, request, client_address):
+        """
+        Menangani satu koneksi di thread-nya sambil mencatat jumlah koneksi yang berjalan.
+        """
+        with self.active_lock:
+            self.active_requests += 1
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self.active_lock:
+                self.active_requests -= 1
+
+    def drain(self, timeout, tunnel_reactor=None):
+        """
+        Menutup socket server lalu menunggu koneksi yang berjalan (dan tunnel di reactor) selesai.
+
+        Args:
+        - timeout (float): Batas waktu menunggu dalam detik.
+        - tunnel_reactor (reactor.TunnelReactor, optional): Reactor yang tunnel-nya ikut ditunggu.
+
+        Returns:
+        - bool: True jika semua koneksi selesai sebelum batas waktu.
+        """
+        self.draining = True
+        self.server_close()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            tunnels = tunnel_reactor.active_tunnels if tunnel_reactor is not None else 0
+            if self.active_requests == 0 and tunnels == 0:
+                return True
+            time.sleep(0.1)
+        return False
+
+def print_cache_stats(cache, interval):
+    """
+    Mencetak statistik cache respons secara berkala (hit ratio, bytes yang dihemat, pemakaian).
+
+    Args:
+    - cache (response_cache.ResponseCache): Cache yang dipantau.
+    - interval (float): Jeda antar pencetakan dalam detik.
+    """
+    while True:
+        time.sleep(interval)
+        stats = cache.stats()
+        print(f"[CACHE] hit ratio {stats['hit_ratio']:.1%}, hit {stats['hits']}, "
+              f"revalidasi {stats['revalidated']}, miss {stats['misses']}, "
+              f"dihemat {stats['bytes_saved']} bytes, memori {stats['memory_bytes']} bytes "
+              f"({stats['memory_entries']} entri), disk {stats['disk_bytes']} bytes ({stats['disk_entries']} entri)")
+
+def register_gauges(metrics, pool=None, cache=None, upstreams=None, tunnel_reactor=None):
+    """
+    Mendaftarkan gauge dari komponen proxy ke metrik, dibaca saat /metrics diminta.
+
+    Args:
+    - metrics (telemetry.Metrics): Metrik tujuan.
+    - pool (connection_pool.ConnectionPool, optional): Pool koneksi keep-alive.
+    - cache (response_cache.ResponseCache, optional): Cache respons.
+    - upstreams (upstream_pool.UpstreamPool, optional): Pool upstream proxy.
+    - tunnel_reactor (reactor.TunnelReactor, optional): Reactor tunnel bersama.
+    """
+    if tunnel_reactor is not None:
+        metrics.add_gauge('proxy_reactor_tunnels', 'Jumlah tunnel yang dipegang reactor',
+                          lambda: tunnel_reactor.active_tunnels)
+    if pool is not None:
+        metrics.add_gauge('proxy_pool_connections_created', 'Jumlah koneksi baru ke server asal',
+                          lambda: pool.created)
+        metrics.add_gauge('proxy_pool_connections_reused', 'Jumlah koneksi keep-alive yang dipakai ulang',
+                          lambda: pool.reused)
+    if cache is not None:
+        for name in ('hits', 'revalidated', 'misses', 'bytes_saved', 'memory_bytes', 'disk_bytes'):
+            metrics.add_gauge(f'proxy_cache_{name}', f'Statistik cache respons: {name}',
+                              lambda name=name: cache.stats()[name])
+    if upstreams is not None:
+        for name in ('active', 'requests', 'errors', 'ejected'):
+            metrics.add_gauge(f'proxy_upstream_{name}', f'Status upstream proxy: {name}',
+                              lambda name=name: [((('upstream', u['name']),), int(u[name]))
+                                                 for u in upstreams.stats()])
+
+def run(server_class=ProxyHTTPServer, handler_class=ProxyHTTPRequestHandler, port=9919,
+        mode='thread', max_tunnels=async_proxy.DEFAULT_MAX_TUNNELS,
+        buffer_size=relay.DEFAULT_BUFFER_SIZE, use_splice=True,
+        use_reactor=True, idle_timeout=reactor.DEFAULT_IDLE_TIMEOUT,
+        max_idle_per_host=connection_pool.DEFAULT_MAX_IDLE_PER_HOST,
+        max_per_host=connection_pool.DEFAULT_MAX_PER_HOST,
+        cache_memory_bytes=0, cache_dir=None, cache_disk_bytes=response_cache.DEFAULT_DISK_BYTES,
+        cache_stats_interval=0, dns_ttl=dns_cache.DEFAULT_TTL, dns_negative_ttl=dns_cache.DEFAULT_NEGATIVE_TTL,
+        connect_timeout=dns_cache.DEFAULT_CONNECT_TIMEOUT,
+        happy_eyeballs_delay=dns_cache.DEFAULT_HAPPY_EYEBALLS_DELAY, upstreams=None, metrics_port=0,
+        reuse_port=False, drain_timeout=DEFAULT_DRAIN_TIMEOUT):
+    """
+    Fungsi untuk menjalankan server proxy HTTP pada port yang ditentukan.
+
+    Args:
+    - server_class: Kelas server HTTP yang digunakan (default: ProxyHTTPServer, turunan
+      http.server.ThreadingHTTPServer yang mendukung drain, agar permintaan HTTP biasa yang
+      lambat tidak menahan klien lain).
+    - handler_class: Kelas penanganan permintaan HTTP (default: ProxyHTTPRequestHandler).
+    - port: Port tempat server proxy HTTP akan berjalan (default: 9919).
+    - mode: 'thread' untuk server http.server biasa, atau 'async' untuk server asyncio yang
+      menangani banyak tunnel CONNECT sekaligus dalam satu event loop (default: 'thread').
+    - max_tunnels: Jumlah maksimal tunnel CONNECT yang aktif bersamaan (mode 'async' atau
+      dengan reactor). Permintaan di atas batas ini dijawab dengan 503
+      (default: async_proxy.DEFAULT_MAX_TUNNELS).
+    - buffer_size: Ukuran buffer relay per arah tunnel (default: relay.DEFAULT_BUFFER_SIZE).
+    - use_splice: Memakai os.splice untuk relay pada mode 'thread' jika tersedia (default: True).
+    - use_reactor: Pada mode 'thread', menyerahkan semua tunnel ke satu TunnelReactor (epoll)
+      alih-alih me-relay di dalam handler (default: True).
+    - idle_timeout: Batas waktu (detik) tunnel di reactor boleh diam sebelum ditutup
+      (default: reactor.DEFAULT_IDLE_TIMEOUT).
+    - max_idle_per_host: Jumlah maksimal koneksi keep-alive idle per host server asal
+      (default: connection_pool.DEFAULT_MAX_IDLE_PER_HOST).
+    - max_per_host: Jumlah maksimal koneksi ke satu host server asal
+      (default: connection_pool.DEFAULT_MAX_PER_HOST).
+    - cache_memory_bytes: Kapasitas LRU cache respons di memori. Cache aktif jika nilai ini
+      lebih dari 0 atau cache_dir diisi (default: 0, cache tidak aktif).
+    - cache_dir: Direktori cache respons di disk (default: None, hanya memori).
+    - cache_disk_bytes: Kapasitas cache respons di disk (default: response_cache.DEFAULT_DISK_BYTES).
+    - cache_stats_interval: Interval (detik) mencetak statistik cache, 0 berarti tidak dicetak.
+    - dns_ttl: Lama (detik) hasil resolusi DNS disimpan (default: dns_cache.DEFAULT_TTL).
+    - dns_negative_ttl: Lama (detik) hasil resolusi DNS yang gagal disimpan (default: dns_cache.DEFAULT_NEGATIVE_TTL).
+    - connect_timeout: Batas waktu (detik) koneksi ke server target (default: dns_cache.DEFAULT_CONNECT_TIMEOUT).
+    - happy_eyeballs_delay: Jeda (detik) antar percobaan koneksi ke alamat IPv6/IPv4 berikutnya
+      (default: dns_cache.DEFAULT_HAPPY_EYEBALLS_DELAY).
+    - upstreams: UpstreamPool untuk meneruskan tunnel CONNECT dan permintaan HTTP lewat
+      upstream proxy (default: None, terhubung langsung ke server target).
+    - metrics_port: Port endpoint admin /metrics (format Prometheus) yang hanya mendengarkan
+      di 127.0.0.1 (default: 0, endpoint tidak aktif dan metrik tidak dicatat).
+    - reuse_port: Membuka port dengan SO_REUSEPORT agar beberapa proses worker bisa berbagi
+      port yang sama (default: False).
+    - drain_timeout: Batas waktu (detik) menyelesaikan koneksi yang berjalan setelah SIGTERM
+      (default: DEFAULT_DRAIN_TIMEOUT).
+    """
+    resolver = dns_cache.DNSCache(dns_ttl, dns_negative_ttl, connect_timeout=connect_timeout,
+                                  happy_eyeballs_delay=happy_eyeballs_delay)
+    if metrics_port:
+        metrics = handler_class.metrics
+        telemetry.start_admin_server(metrics, metrics_port)
+        print(f'Endpoint metrik pada http://127.0.0.1:{metrics_port}/metrics')
+    else:
+        # Tanpa endpoint /metrics tidak ada yang membaca metrik, jadi pencatatan dimatikan
+        metrics = handler_class.metrics = telemetry.NullMetrics()
+    if mode == 'async':
+        register_gauges(metrics, upstreams=upstreams)
+        print(f'Mulai server proxy (asyncio, maks {max_tunnels} tunnel) pada port {port}...')
+        async_proxy.serve(port, max_tunnels, buffer_size, resolver, upstreams, metrics, reuse_port, drain_timeout)
+        return
+
+    handler_class.resolver = resolver
+    handler_class.upstreams = upstreams
+
+    handler_class.pool = connection_pool.ConnectionPool(max_idle_per_host, max_per_host,
+                                                        connector=resolver.create_connection)
+    if cache_memory_bytes or cache_dir:
+        handler_class.cache = response_cache.ResponseCache(cache_memory_bytes, cache_dir, cache_disk_bytes)
+        if cache_stats_interval:
+            threading.Thread(target=print_cache_stats, args=(handler_class.cache, cache_stats_interval),
+                             daemon=True).start()
+    handler_class.relay_buffer_size = buffer_size
+    handler_class.use_splice = use_splice
+    if use_reactor:
+        # Socket klien, socket target, dan dua pipe splice per tunnel
+        async_proxy.raise_nofile_limit(max_tunnels, fds_per_tunnel=6)
+        handler_class.reactor = reactor.TunnelReactor(idle_timeout, buffer_size, use_splice)
+        handler_class.reactor.start()
+        handler_class.max_tunnels = max_tunnels
+        handler_class.tunnel_slots = threading.BoundedSemaphore(max_tunnels)
+    register_gauges(metrics, handler_class.pool, handler_class.cache, upstreams, handler_class.reactor)
+
+    server_address = ('', port)  # Alamat server kosong artinya akan mendengarkan semua antarmuka
+    httpd = server_class(server_address, handler_class, bind_and_activate=False)
+    httpd.allow_reuse_port = reuse_port  # SO_REUSEPORT harus dipasang sebelum bind
+    try:
+        httpd.server_bind()
+        httpd.server_activate()
+    except OSError:
+        httpd.server_close()
+        raise
+
+    # SIGTERM menghentikan loop server dari thread lain (shutdown() memblokir sampai loop berhenti)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=httpd.shutdown).start())
+    print(f'Mulai server proxy pada port {port}...')
+    httpd.serve_forever()  # Memulai server dan terus berjalan sampai SIGTERM
+
+    print(f'Menyelesaikan koneksi yang berjalan (maks {drain_timeout} detik)...')
+    if not httpd.drain(drain_timeout, handler_class.reactor):
+        print('Batas waktu drain habis, koneksi yang tersisa ditutup')
+    if handler_class.reactor is not None:
+        handler_class.reactor.stop()
+
+def parse_upstream_arg(spec):
+    """
+    Tipe argparse untuk --upstream: error parsing dilaporkan sebagai error argumen, bukan traceback.
+    """
+    try:
+        return upstream_pool.parse_upstream(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args():
+    """
+    Membaca opsi baris perintah untuk menjalankan server proxy.
+
+    Returns:
+    - argparse.Namespace: Opsi yang telah dibaca.
+    """
+    parser = argparse.ArgumentParser(description='Forward proxy HTTP')
+    parser.add_argument('--port', type=int, default=9919, help='Port server proxy (default: 9919)')
+    parser.add_argument('--mode', choices=['thread', 'async'], default='thread',
+                        help='Mode server: thread (http.server) atau async (asyncio)')
+    parser.add_argument('--max-tunnels', type=int, default=async_proxy.DEFAULT_MAX_TUNNELS,
+                        help='Jumlah maksimal tunnel CONNECT aktif (mode async atau dengan reactor)')
+    parser.add_argument('--buffer-size', type=int, default=relay.DEFAULT_BUFFER_SIZE,
+                        help='Ukuran buffer relay per arah tunnel dalam bytes')
+    parser.add_argument('--no-splice', action='store_true',
+                        help='Tidak memakai os.splice, selalu memakai ring buffer')
+    parser.add_argument('--no-reactor', action='store_true',
+                        help='Me-relay setiap tunnel di dalam handler-nya sendiri, tanpa reactor bersama')
+    parser.add_argument('--max-idle-per-host', type=int, default=connection_pool.DEFAULT_MAX_IDLE_PER_HOST,
+                        help='Jumlah maksimal koneksi keep-alive idle per host server asal')
+    parser.add_argument('--max-per-host', type=int, default=connection_pool.DEFAULT_MAX_PER_HOST,
+                        help='Jumlah maksimal koneksi ke satu host server asal')
+    parser.add_argument('--cache-memory-mb', type=int, default=0,
+                        help='Kapasitas cache respons HTTP di memori (MB), 0 berarti tidak aktif')
+    parser.add_argument('--cache-dir', help='Direktori cache respons HTTP di disk')
+    parser.add_argument('--cache-disk-mb', type=int, default=response_cache.DEFAULT_DISK_BYTES // 2**20,
+                        help='Kapasitas cache respons HTTP di disk (MB)')
+    parser.add_argument('--cache-stats-interval', type=float, default=0,
+                        help='Interval (detik) mencetak statistik cache, 0 berarti tidak dicetak')
+    parser.add_argument('--dns-ttl', type=float, default=dns_cache.DEFAULT_TTL,
+                        help='Lama (detik) hasil resolusi DNS disimpan di cache')
+    parser.add_argument('--dns-negative-ttl', type=float, default=dns_cache.DEFAULT_NEGATIVE_TTL,
+                        help='Lama (detik) hasil resolusi DNS yang gagal disimpan di cache')
+    parser.add_argument('--connect-timeout', type=float, default=dns_cache.DEFAULT_CONNECT_TIMEOUT,
+                        help='Batas waktu (detik) koneksi ke server target')
+    parser.add_argument('--happy-eyeballs-delay', type=float, default=dns_cache.DEFAULT_HAPPY_EYEBALLS_DELAY,
+                        help='Jeda (detik) sebelum mencoba alamat IPv6/IPv4 berikutnya')
+    parser.add_argument('--upstream', action='append', default=[], type=parse_upstream_arg,
+                        help="Upstream proxy 'host:port' atau 'host:port,bobot' (boleh diulang)")
+    parser.add_argument('--upstream-strategy', choices=upstream_pool.STRATEGIES, default='round_robin',
+                        help='Strategi pemilihan upstream proxy')
+    parser.add_argument('--upstream-failures', type=int, default=upstream_pool.DEFAULT_FAILURE_THRESHOLD,
+                        help='Jumlah kegagalan berturut-turut sebelum upstream dikeluarkan sementara')
+    parser.add_argument('--upstream-eject', type=float, default=upstream_pool.DEFAULT_EJECT_SECONDS,
+                        help='Lama (detik) upstream dikeluarkan sebelum dicoba lagi')
+    parser.add_argument('--metrics-port', type=int, default=0,
+                        help='Port endpoint /metrics (Prometheus) di 127.0.0.1, 0 berarti tidak aktif')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Jumlah proses worker yang berbagi port dengan SO_REUSEPORT (default: 1)')
+    parser.add_argument('--drain-timeout', type=float, default=DEFAULT_DRAIN_TIMEOUT,
+                        help='Batas waktu (detik) menyelesaikan koneksi yang berjalan setelah SIGTERM')
+    parser.add_argument('--idle-timeout', type=float, default=reactor.DEFAULT_IDLE_TIMEOUT,
+                        help='Batas waktu (detik) tunnel di reactor boleh diam sebelum ditutup')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    upstreams = None
+    if args.upstream:
+        upstreams = upstream_pool.UpstreamPool(args.upstream,
+                                               args.upstream_strategy, args.upstream_failures, args.upstream_eject,
+                                               args.connect_timeout)
+
+    def start_worker(index=0, reuse_port=False):
+        # Setiap worker memakai port metrik sendiri (metrics_port + index)
+        run(port=args.port, mode=args.mode, max_tunnels=args.max_tunnels,
+            buffer_size=args.buffer_size, use_splice=not args.no_splice,
+            use_reactor=not args.no_reactor, idle_timeout=args.idle_timeout,
+            max_idle_per_host=args.max_idle_per_host, max_per_host=args.max_per_host,
+            cache_memory_bytes=args.cache_memory_mb * 2**20, cache_dir=args.cache_dir,
+            cache_disk_bytes=args.cache_disk_mb * 2**20, cache_stats_interval=args.cache_stats_interval,
+            dns_ttl=args.dns_ttl, dns_negative_ttl=args.dns_negative_ttl, connect_timeout=args.connect_timeout,
+            happy_eyeballs_delay=args.happy_eyeballs_delay, upstreams=upstreams,
+            metrics_port=args.metrics_port + index if args.metrics_port else 0,
+            reuse_port=reuse_port, drain_timeout=args.drain_timeout)
+
+    # Memanggil fungsi run() jika script ini dijalankan sebagai program utama
+    if args.workers > 1:
+        print(f'Mulai {args.workers} worker proxy pada port {args.port} (SO_REUSEPORT)...')
+        supervisor.Supervisor(lambda index: start_worker(index, reuse_port=True),
+                              args.workers, args.drain_timeout).run()
+    else:
+        start_worker()
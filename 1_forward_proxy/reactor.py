@@ -0,0 +1,304 @@
+import socket  # Import modul socket untuk koneksi socket
+import selectors  # Import modul selectors (epoll di Linux) untuk multiplexing IO
+import threading  # Import modul threading untuk menjalankan reactor di thread terpisah
+import collections  # Import modul collections untuk antrean registrasi tunnel
+import time  # Import modul time untuk idle timeout
+
+import relay  # Import objek relay satu arah (splice / ring buffer)
+
+# Batas waktu default (detik) sebuah tunnel boleh diam tanpa data sebelum ditutup
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Interval (detik) pemeriksaan tunnel yang melewati idle timeout
+SWEEP_INTERVAL = 1.0
+
+
+class Tunnel:
+    """
+    Sepasang socket (klien dan server target) yang dikelola oleh TunnelReactor.
+
+    Atribut:
+    - client: Socket klien.
+    - target: Socket server target.
+    - upstream: Relay satu arah klien -> target.
+    - downstream: Relay satu arah target -> klien.
+    - last_active: Waktu terakhir ada data yang lewat (time.monotonic()).
+    - on_close: Fungsi (bytes_up, bytes_down) yang dipanggil setelah tunnel ditutup (boleh None).
+    """
+
+    def __init__(self, client, target, buffer_size, use_splice, on_close=None):
+        self.client = client
+        self.target = target
+        self.upstream = relay.make_pipe(client, target, buffer_size, use_splice)
+        self.downstream = relay.make_pipe(target, client, buffer_size, use_splice)
+        self.pipes = (self.upstream, self.downstream)
+        self.shut = set()  # Arah yang sudah di-half-close (berisi objek pipe)
+        self.masks = {client: 0, target: 0}  # Event yang sedang didaftarkan per socket
+        self.last_active = time.monotonic()
+        self.on_close = on_close
+
+    def wanted_events(self, sock):
+        """
+        Menghitung event yang perlu ditunggu untuk socket sock.
+
+        Args:
+        - sock (socket.socket): Socket klien atau target.
+
+        Returns:
+        - int: Kombinasi selectors.EVENT_READ dan selectors.EVENT_WRITE.
+        """
+        mask = 0
+        for pipe in self.pipes:
+            if pipe.src is sock and pipe.can_read():
+                mask |= selectors.EVENT_READ
+            if pipe.dst is sock and pipe.pending:
+                mask |= selectors.EVENT_WRITE
+        return mask
+
+    def finished(self):
+        """
+        Mengembalikan True jika kedua arah sudah selesai (EOF dan data tertunda terkirim).
+        """
+        return len(self.shut) == 2
+
+
+class TunnelReactor:
+    """
+    Reactor bersama yang memegang semua tunnel CONNECT yang terbuka dalam satu selector
+    (epoll di Linux), sehingga tidak ada thread atau loop select.select per tunnel.
+
+    Setiap arah tunnel ditutup sendiri-sendiri (half-close): saat satu pihak mengirim EOF,
+    data tertundanya dikirim habis lalu arah tulis ke pihak lain di-shutdown, sementara arah
+    sebaliknya tetap berjalan. Tunnel yang diam lebih lama dari idle_timeout ditutup.
+
+    Metode:
+    - start: Menjalankan reactor di thread daemon.
+    - register: Menyerahkan sepasang socket ke reactor (aman dipanggil dari thread lain).
+    - stop: Menghentikan reactor dan menutup semua tunnel.
+
+    Atribut:
+    - idle_timeout: Batas waktu diam sebuah tunnel dalam detik (None berarti tanpa batas).
+    - buffer_size: Ukuran buffer relay per arah tunnel.
+    - use_splice: Memakai os.splice jika tersedia.
+    - active_tunnels: Jumlah tunnel yang sedang dipegang reactor.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, buffer_size=relay.DEFAULT_BUFFER_SIZE,
+                 use_splice=True):
+        self.idle_timeout = idle_timeout
+        self.buffer_size = buffer_size
+        self.use_splice = use_splice
+        self.selector = selectors.DefaultSelector()
+        self.tunnels = set()
+        self.pending_tunnels = collections.deque()
+        self.running = False
+        self.thread = None
+
+        # Socketpair untuk membangunkan selector saat ada tunnel baru dari thread lain
+        self.wakeup_r, self.wakeup_w = socket.socketpair()
+        self.wakeup_r.setblocking(False)
+        self.wakeup_w.setblocking(False)
+        self.selector.register(self.wakeup_r, selectors.EVENT_READ, None)
+
+    @property
+    def active_tunnels(self):
+        """
+        Jumlah tunnel yang sedang dipegang reactor, termasuk yang belum masuk selector.
+        """
+        return len(self.tunnels) + len(self.pending_tunnels)
+
+    def start(self):
+        """
+        Menjalankan loop reactor di thread daemon.
+        """
+        self.running = True
+        self.thread = threading.Thread(target=self.loop, name='tunnel-reactor', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Menghentikan loop reactor dan menunggu thread-nya selesai.
+        """
+        self.running = False
+        self.wakeup()
+        if self.thread is not None:
+            self.thread.join()
+
+    def register(self, client, target, on_close=None):
+        """
+        Menyerahkan sepasang socket ke reactor. Sejak saat ini reactor yang bertanggung jawab
+        meneruskan data dan menutup kedua socket.
+
+        Args:
+        - client (socket.socket): Socket klien.
+        - target (socket.socket): Socket server target.
+        - on_close (callable, optional): Dipanggil (di thread reactor) setelah tunnel ditutup dengan
+          jumlah bytes klien -> target dan target -> klien.
+        """
+        client.setblocking(False)
+        target.setblocking(False)
+        self.pending_tunnels.append((client, target, on_close))
+        self.wakeup()
+
+    def wakeup(self):
+        """
+        Membangunkan selector yang sedang menunggu event.
+        """
+        try:
+            self.wakeup_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # Buffer socketpair penuh berarti reactor memang akan bangun
+
+    def loop(self):
+        """
+        Loop utama reactor: menunggu event, meneruskan data, dan menutup tunnel yang selesai
+        atau melewati idle timeout.
+        """
+        next_sweep = time.monotonic() + SWEEP_INTERVAL
+        try:
+            while self.running:
+                self.accept_pending()
+                for key, mask in self.selector.select(SWEEP_INTERVAL):
+                    if key.data is None:
+                        self.drain_wakeup()
+                        continue
+                    self.handle_event(key.data, key.fileobj, mask)
+
+                now = time.monotonic()
+                if now >= next_sweep:
+                    self.sweep_idle(now)
+                    next_sweep = now + SWEEP_INTERVAL
+        finally:
+            for tunnel in list(self.tunnels):
+                self.close_tunnel(tunnel)
+            while self.pending_tunnels:
+                client, target, on_close = self.pending_tunnels.popleft()
+                client.close()
+                target.close()
+                self.notify_closed(on_close, 0, 0)
+
+    def drain_wakeup(self):
+        """
+        Membuang byte pembangun dari socketpair.
+        """
+        try:
+            while self.wakeup_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def accept_pending(self):
+        """
+        Memasukkan tunnel yang baru diserahkan lewat register() ke dalam selector.
+        """
+        while self.pending_tunnels:
+            client, target, on_close = self.pending_tunnels.popleft()
+            try:
+                tunnel = Tunnel(client, target, self.buffer_size, self.use_splice, on_close)
+            except OSError:
+                client.close()
+                target.close()
+                self.notify_closed(on_close, 0, 0)
+                continue
+            self.tunnels.add(tunnel)
+            self.update_interest(tunnel)
+
+    def handle_event(self, tunnel, sock, mask):
+        """
+        Menangani event baca/tulis pada salah satu socket tunnel.
+
+        Args:
+        - tunnel (Tunnel): Tunnel pemilik socket.
+        - sock (socket.socket): Socket yang siap.
+        - mask (int): Event yang terjadi.
+        """
+        if tunnel not in self.tunnels:
+            return  # Tunnel sudah ditutup oleh event sebelumnya dalam batch yang sama
+        try:
+            for pipe in tunnel.pipes:
+                if mask & selectors.EVENT_READ and pipe.src is sock and pipe.can_read():
+                    if pipe.fill():
+                        tunnel.last_active = time.monotonic()
+                    pipe.flush()  # Mencoba langsung mengirim tanpa menunggu event tulis
+                if mask & selectors.EVENT_WRITE and pipe.dst is sock:
+                    if pipe.flush():
+                        tunnel.last_active = time.monotonic()
+
+                # Half-close: EOF dari sumber dan semua data sudah terkirim
+                if pipe.eof and not pipe.pending and pipe not in tunnel.shut:
+                    tunnel.shut.add(pipe)
+                    pipe.dst.shutdown(socket.SHUT_WR)
+        except (ConnectionError, OSError):
+            self.close_tunnel(tunnel)
+            return
+
+        if tunnel.finished():
+            self.close_tunnel(tunnel)
+        else:
+            self.update_interest(tunnel)
+
+    def update_interest(self, tunnel):
+        """
+        Menyesuaikan event yang didaftarkan di selector untuk kedua socket tunnel.
+
+        Args:
+        - tunnel (Tunnel): Tunnel yang akan diperbarui.
+        """
+        for sock in (tunnel.client, tunnel.target):
+            mask = tunnel.wanted_events(sock)
+            if mask == tunnel.masks[sock]:
+                continue
+            if not mask:
+                self.selector.unregister(sock)
+            elif not tunnel.masks[sock]:
+                self.selector.register(sock, mask, tunnel)
+            else:
+                self.selector.modify(sock, mask, tunnel)
+            tunnel.masks[sock] = mask
+
+    def sweep_idle(self, now):
+        """
+        Menutup tunnel yang tidak mengalirkan data lebih lama dari idle_timeout.
+
+        Args:
+        - now (float): Waktu sekarang (time.monotonic()).
+        """
+        if self.idle_timeout is None:
+            return
+        for tunnel in list(self.tunnels):
+            if now - tunnel.last_active > self.idle_timeout:
+                self.close_tunnel(tunnel)
+
+    def close_tunnel(self, tunnel):
+        """
+        Mengeluarkan tunnel dari selector lalu menutup kedua socket dan relay-nya.
+
+        Args:
+        - tunnel (Tunnel): Tunnel yang akan ditutup.
+        """
+        self.tunnels.discard(tunnel)
+        for sock in (tunnel.client, tunnel.target):
+            if tunnel.masks[sock]:
+                self.selector.unregister(sock)
+                tunnel.masks[sock] = 0
+            sock.close()
+        for pipe in tunnel.pipes:
+            pipe.close()
+        self.notify_closed(tunnel.on_close, tunnel.upstream.bytes_relayed, tunnel.downstream.bytes_relayed)
+
+    def notify_closed(self, on_close, bytes_up, bytes_down):
+        """
+        Memanggil callback on_close sebuah tunnel. Error dari callback hanya dicetak agar tidak
+        menghentikan thread reactor beserta semua tunnel lain yang dipegangnya.
+
+        Args:
+        - on_close (callable): Callback tunnel (boleh None).
+        - bytes_up (int): Jumlah bytes klien -> target.
+        - bytes_down (int): Jumlah bytes target -> klien.
+        """
+        if on_close is None:
+            return
+        try:
+            on_close(bytes_up, bytes_down)
+        except Exception as e:
+            print(f'[REACTOR] Callback on_close gagal: {e!r}')
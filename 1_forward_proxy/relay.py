@@ -0,0 +1,254 @@
+import os  # Import modul os untuk pipe dan os.splice
+import fcntl  # Import modul fcntl untuk mengatur ukuran pipe
+import socket  # Import modul socket untuk koneksi socket
+import selectors  # Import modul selectors untuk multiplexing IO
+
+# Ukuran buffer default per arah relay (dalam bytes)
+DEFAULT_BUFFER_SIZE = 65536
+
+# os.splice hanya tersedia di Linux (Python 3.10+)
+HAS_SPLICE = hasattr(os, 'splice')
+
+# Konstanta fcntl untuk membaca dan mengubah kapasitas pipe (Linux), tidak selalu diekspor oleh modul fcntl
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+F_GETPIPE_SZ = getattr(fcntl, 'F_GETPIPE_SZ', 1032)
+
+
+class BufferedPipe:
+    """
+    Satu arah relay (src -> dst) yang memakai ring buffer bytearray yang dialokasikan sekali.
+
+    Data dibaca dengan recv_into langsung ke memoryview buffer sehingga tidak ada objek
+    bytes baru per recv. Penulisan memakai send biasa sehingga penulisan parsial
+    ditangani dengan menggeser posisi baca buffer, bukan dengan menyalin ulang data.
+
+    Atribut:
+    - src: Socket sumber data.
+    - dst: Socket tujuan data.
+    - eof: True jika src sudah mengirim EOF.
+    - pending: Jumlah bytes di buffer yang belum terkirim ke dst.
+    - bytes_relayed: Total bytes yang sudah terkirim ke dst.
+    """
+
+    def __init__(self, src, dst, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.src = src
+        self.dst = dst
+        self.size = buffer_size
+        self.buffer = memoryview(bytearray(buffer_size))
+        self.start = 0  # Posisi byte pertama yang belum terkirim
+        self.pending = 0
+        self.eof = False
+        self.bytes_relayed = 0
+
+    def can_read(self):
+        """
+        Mengembalikan True jika buffer masih punya ruang kosong dan src belum EOF.
+        """
+        return not self.eof and self.pending < self.size
+
+    def fill(self):
+        """
+        Membaca data dari src ke ruang kosong buffer.
+
+        Returns:
+        - int or None: Jumlah bytes yang dibaca (0 berarti EOF), None jika src belum siap.
+        """
+        end = (self.start + self.pending) % self.size
+        # Ruang kosong yang bersebelahan: sampai akhir buffer atau sampai posisi start
+        limit = self.size if end >= self.start else self.start
+        if self.pending == 0:
+            self.start = end = 0
+            limit = self.size
+        try:
+            n = self.src.recv_into(self.buffer[end:limit])
+        except (BlockingIOError, InterruptedError):
+            return None
+        if n == 0:
+            self.eof = True
+        self.pending += n
+        return n
+
+    def flush(self):
+        """
+        Mengirim data yang tertunda di buffer ke dst sebanyak yang bisa diterima dst.
+
+        Returns:
+        - int: Jumlah bytes yang terkirim (0 jika dst sedang penuh).
+        """
+        if not self.pending:
+            return 0
+        end = min(self.start + self.pending, self.size)
+        try:
+            n = self.dst.send(self.buffer[self.start:end])
+        except (BlockingIOError, InterruptedError):
+            return 0
+        self.start = (self.start + n) % self.size
+        self.pending -= n
+        self.bytes_relayed += n
+        return n
+
+    def close(self):
+        """
+        Melepaskan buffer.
+        """
+        self.buffer.release()
+
+
+class SplicePipe:
+    """
+    Satu arah relay (src -> dst) tanpa salinan ke ruang pengguna menggunakan os.splice.
+
+    Data dipindahkan dari socket src ke pipe kernel lalu dari pipe ke socket dst,
+    sehingga isi data tidak pernah disalin ke memori Python.
+
+    Atribut:
+    - src: Socket sumber data.
+    - dst: Socket tujuan data.
+    - eof: True jika src sudah mengirim EOF.
+    - pending: Jumlah bytes di pipe yang belum terkirim ke dst.
+    - bytes_relayed: Total bytes yang sudah terkirim ke dst.
+    """
+
+    def __init__(self, src, dst, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.src = src
+        self.dst = dst
+        self.pipe_r, self.pipe_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        try:
+            fcntl.fcntl(self.pipe_w, F_SETPIPE_SZ, buffer_size)
+        except OSError:
+            pass  # Tetap memakai kapasitas pipe default jika tidak diizinkan
+        self.size = fcntl.fcntl(self.pipe_w, F_GETPIPE_SZ)
+        self.flags = os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK
+        self.pending = 0
+        self.eof = False
+        self.bytes_relayed = 0
+
+    def can_read(self):
+        """
+        Mengembalikan True jika pipe masih punya ruang kosong dan src belum EOF.
+        """
+        return not self.eof and self.pending < self.size
+
+    def fill(self):
+        """
+        Memindahkan data dari src ke pipe.
+
+        Returns:
+        - int or None: Jumlah bytes yang dipindahkan (0 berarti EOF), None jika src belum siap.
+        """
+        try:
+            n = os.splice(self.src.fileno(), self.pipe_w, self.size - self.pending, flags=self.flags)
+        except (BlockingIOError, InterruptedError):
+            return None
+        if n == 0:
+            self.eof = True
+        self.pending += n
+        return n
+
+    def flush(self):
+        """
+        Memindahkan data yang tertunda di pipe ke dst.
+
+        Returns:
+        - int: Jumlah bytes yang terkirim (0 jika dst sedang penuh).
+        """
+        if not self.pending:
+            return 0
+        try:
+            n = os.splice(self.pipe_r, self.dst.fileno(), self.pending, flags=self.flags)
+        except (BlockingIOError, InterruptedError):
+            return 0
+        self.pending -= n
+        self.bytes_relayed += n
+        return n
+
+    def close(self):
+        """
+        Menutup kedua ujung pipe (aman dipanggil lebih dari sekali).
+        """
+        if self.pipe_r >= 0:
+            os.close(self.pipe_r)
+            os.close(self.pipe_w)
+            self.pipe_r = self.pipe_w = -1
+
+
+def make_pipe(src, dst, buffer_size=DEFAULT_BUFFER_SIZE, use_splice=True):
+    """
+    Membuat satu arah relay, memakai SplicePipe jika tersedia dan BufferedPipe jika tidak.
+
+    Args:
+    - src (socket.socket): Socket sumber data.
+    - dst (socket.socket): Socket tujuan data.
+    - buffer_size (int): Ukuran buffer atau kapasitas pipe (default: DEFAULT_BUFFER_SIZE).
+    - use_splice (bool): Memakai os.splice jika tersedia (default: True).
+
+    Returns:
+    - BufferedPipe or SplicePipe: Objek relay satu arah.
+    """
+    if use_splice and HAS_SPLICE and src.family != socket.AF_UNIX:
+        try:
+            return SplicePipe(src, dst, buffer_size)
+        except OSError:
+            pass
+    return BufferedPipe(src, dst, buffer_size)
+
+
+def relay(client, server, buffer_size=DEFAULT_BUFFER_SIZE, use_splice=True):
+    """
+    Meneruskan data dua arah antara client dan server sampai salah satu pihak mengirim EOF
+    atau koneksi terputus. Data dari pihak yang mengirim EOF dikirim habis sebelum relay selesai.
+
+    Setiap arah hanya membaca dari sumber jika buffernya masih punya ruang, dan hanya
+    menunggu tujuan bisa ditulis jika ada data tertunda. Dengan begitu penulisan parsial
+    ditangani dan pengirim yang cepat tertahan oleh penerima yang lambat (backpressure).
+
+    Args:
+    - client (socket.socket): Socket klien.
+    - server (socket.socket): Socket server target.
+    - buffer_size (int): Ukuran buffer per arah (default: DEFAULT_BUFFER_SIZE).
+    - use_splice (bool): Memakai os.splice jika tersedia (default: True).
+
+    Returns:
+    - tuple: Jumlah bytes yang diteruskan (klien -> server, server -> klien).
+    """
+    client.setblocking(False)
+    server.setblocking(False)
+    upstream = make_pipe(client, server, buffer_size, use_splice)
+    downstream = make_pipe(server, client, buffer_size, use_splice)
+    pipes = (upstream, downstream)
+    sel = selectors.DefaultSelector()
+    try:
+        while True:
+            # Mengirim data tertunda lebih dulu, lalu mengisi buffer dari sumber yang siap
+            for pipe in pipes:
+                pipe.flush()
+            if any(pipe.eof and not pipe.pending for pipe in pipes):
+                break
+
+            # Menentukan event yang ditunggu untuk setiap socket
+            events = {client: 0, server: 0}
+            for pipe in pipes:
+                if pipe.pending:
+                    events[pipe.dst] |= selectors.EVENT_WRITE
+                if pipe.can_read():
+                    events[pipe.src] |= selectors.EVENT_READ
+            for sock, mask in events.items():
+                if mask:
+                    if sock in sel.get_map():
+                        sel.modify(sock, mask)
+                    else:
+                        sel.register(sock, mask)
+                elif sock in sel.get_map():
+                    sel.unregister(sock)
+
+            ready = {key.fileobj for key, mask in sel.select() if mask & selectors.EVENT_READ}
+            for pipe in pipes:
+                if pipe.src in ready and pipe.can_read():
+                    pipe.fill()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        sel.close()
+        for pipe in pipes:
+            pipe.close()
+    return upstream.bytes_relayed, downstream.bytes_relayed
@@ -0,0 +1,510 @@
+import os  # Import modul os untuk operasi file cache di disk
+import json  # Import modul json untuk metadata entri cache
+import struct  # Import modul struct untuk panjang header file cache
+import hashlib  # Import modul hashlib untuk nama file cache
+import threading  # Import modul threading untuk sinkronisasi antar handler
+import collections  # Import modul collections untuk OrderedDict (LRU)
+import email.utils  # Import modul email.utils untuk parsing tanggal HTTP
+import time  # Import modul time untuk menghitung umur entri
+
+# Kapasitas default cache di memori dan di disk (dalam bytes)
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024
+
+# Ukuran maksimal satu respons yang boleh disimpan di cache (dalam bytes)
+DEFAULT_MAX_OBJECT_BYTES = 16 * 1024 * 1024
+
+# Status yang boleh disimpan (cacheable by default menurut RFC 9111)
+CACHEABLE_STATUSES = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Header yang tidak disimpan bersama entri cache karena hanya berlaku untuk satu koneksi/respons
+UNSTORED_HEADERS = {
+    'connection', 'keep-alive', 'proxy-connection', 'proxy-authenticate', 'transfer-encoding',
+    'te', 'trailer', 'upgrade', 'content-length', 'age', 'x-cache',
+}
+
+
+class CacheEntry:
+    """
+    Satu respons yang tersimpan di cache.
+
+    Atribut:
+    - status, reason: Status respons.
+    - headers: List pasangan (nama, nilai) header respons.
+    - body: Body respons (bytes).
+    - stored_at: Waktu (epoch) respons diterima atau terakhir divalidasi ulang.
+    - initial_age: Nilai header Age saat respons diterima (detik).
+    - freshness: Umur maksimal respons dianggap segar (detik), 0 berarti selalu divalidasi ulang.
+    - vary: Dictionary header permintaan yang disebut di Vary beserta nilainya.
+    """
+
+    def __init__(self, status, reason, headers, body, stored_at, initial_age, freshness, vary):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.initial_age = initial_age
+        self.freshness = freshness
+        self.vary = vary
+
+    def header(self, name):
+        """
+        Mengambil nilai header pertama dengan nama name (tidak peka huruf besar/kecil).
+        """
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def age(self, now=None):
+        """
+        Menghitung umur entri saat ini (detik).
+        """
+        now = time.time() if now is None else now
+        return max(0, int(now - self.stored_at)) + self.initial_age
+
+    def is_fresh(self, now=None):
+        """
+        Mengembalikan True jika entri masih boleh diberikan tanpa validasi ulang.
+        """
+        return self.age(now) < self.freshness
+
+    def matches(self, request_headers):
+        """
+        Memeriksa apakah header permintaan cocok dengan varian yang disimpan (header Vary).
+        """
+        return all(request_headers.get(name, '') == value for name, value in self.vary.items())
+
+    @property
+    def size(self):
+        """
+        Ukuran body entri dalam bytes.
+        """
+        return len(self.body)
+
+    def to_meta(self):
+        """
+        Mengubah entri (tanpa body) ke dictionary untuk disimpan sebagai JSON.
+        """
+        return {
+            'status': self.status, 'reason': self.reason, 'headers': self.headers,
+            'stored_at': self.stored_at, 'initial_age': self.initial_age,
+            'freshness': self.freshness, 'vary': self.vary,
+        }
+
+    @classmethod
+    def from_meta(cls, meta, body):
+        """
+        Membuat entri dari metadata JSON dan body.
+        """
+        return cls(meta['status'], meta['reason'], [tuple(h) for h in meta['headers']], body,
+                   meta['stored_at'], meta['initial_age'], meta['freshness'], meta['vary'])
+
+
+class ResponseCache:
+    """
+    Cache respons HTTP bersama untuk permintaan yang diteruskan proxy, dengan dua tingkat:
+    LRU di memori untuk objek yang sering diakses, dan penyimpanan di disk yang dibatasi
+    ukurannya (satu file per URL, dinamai dengan hash SHA-256 dari kunci cache).
+
+    Kesegaran respons mengikuti Cache-Control (no-store, private, no-cache, max-age, s-maxage)
+    dan Expires. Respons yang sudah kedaluwarsa tetapi punya ETag/Last-Modified divalidasi
+    ulang dengan If-None-Match/If-Modified-Since.
+
+    Metode:
+    - lookup: Mencari entri untuk URL dan header permintaan.
+    - store: Menyimpan respons jika boleh di-cache.
+    - record_hit, record_revalidated, record_miss: Mencatat statistik.
+    - stats: Mengembalikan statistik cache (hit ratio, bytes yang dihemat, dll.).
+
+    Atribut:
+    - memory_bytes: Kapasitas LRU di memori.
+    - disk_dir: Direktori cache di disk (None berarti hanya memori).
+    - disk_bytes: Kapasitas cache di disk.
+    - max_object_bytes: Ukuran maksimal satu respons yang disimpan.
+    """
+
+    def __init__(self, memory_bytes=DEFAULT_MEMORY_BYTES, disk_dir=None, disk_bytes=DEFAULT_DISK_BYTES,
+                 max_object_bytes=DEFAULT_MAX_OBJECT_BYTES):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.max_object_bytes = max_object_bytes
+        self.lock = threading.Lock()
+        self.memory = collections.OrderedDict()  # key -> CacheEntry
+        self.memory_used = 0
+        self.disk_index = collections.OrderedDict()  # nama file -> ukuran file
+        self.disk_used = 0
+        self.counters = collections.Counter()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.load_disk_index()
+
+    def lookup(self, url, request_headers):
+        """
+        Mencari entri cache untuk URL, memeriksa memori lebih dulu lalu disk.
+
+        Args:
+        - url (str): URL absolut permintaan.
+        - request_headers: Header permintaan klien (untuk mencocokkan Vary).
+
+        Returns:
+        - CacheEntry or None: Entri yang cocok, None jika tidak ada.
+        """
+        key = cache_key(url)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+        if entry is None and self.disk_dir:
+            entry = self.read_disk(key)
+            if entry is not None:
+                with self.lock:
+                    self.put_memory(key, entry)
+        if entry is not None and not entry.matches(request_headers):
+            return None
+        return entry
+
+    def store(self, url, request_headers, status, reason, headers, body, now=None):
+        """
+        Menyimpan respons ke cache jika diizinkan oleh status dan header-nya.
+
+        Args:
+        - url (str): URL absolut permintaan.
+        - request_headers: Header permintaan klien.
+        - status (int), reason (str): Status respons.
+        - headers (list): List pasangan (nama, nilai) header respons.
+        - body (bytes): Body respons lengkap.
+        - now (float, optional): Waktu respons diterima (epoch).
+
+        Returns:
+        - CacheEntry or None: Entri yang disimpan, None jika respons tidak boleh di-cache.
+        """
+        now = time.time() if now is None else now
+        entry = build_entry(request_headers, status, reason, headers, body, now)
+        if entry is None or entry.size > self.max_object_bytes:
+            return None
+        key = cache_key(url)
+        with self.lock:
+            self.put_memory(key, entry)
+            self.counters['stores'] += 1
+        if self.disk_dir:
+            self.write_disk(key, entry)
+        return entry
+
+    def refresh(self, url, entry, not_modified_headers, now=None):
+        """
+        Memperbarui entri setelah validasi ulang berhasil (respons 304): header baru dari
+        respons 304 menggantikan header lama dan umur entri dihitung ulang.
+
+        Args:
+        - url (str): URL absolut permintaan.
+        - entry (CacheEntry): Entri yang divalidasi ulang.
+        - not_modified_headers (list): Header dari respons 304.
+        - now (float, optional): Waktu respons 304 diterima (epoch).
+
+        Returns:
+        - CacheEntry: Entri yang sudah diperbarui.
+        """
+        now = time.time() if now is None else now
+        updated = {name.lower() for name, _ in not_modified_headers}
+        headers = [(n, v) for n, v in entry.headers if n.lower() not in updated]
+        headers += [(n, v) for n, v in not_modified_headers if n.lower() not in UNSTORED_HEADERS]
+        directives = parse_cache_control(headers)
+        entry = CacheEntry(entry.status, entry.reason, headers, entry.body, now,
+                           parse_age(headers), freshness_lifetime(headers, directives, now), entry.vary)
+        key = cache_key(url)
+        with self.lock:
+            self.put_memory(key, entry)
+        if self.disk_dir:
+            self.write_disk(key, entry)
+        return entry
+
+    def put_memory(self, key, entry):
+        """
+        Menaruh entri di LRU memori lalu membuang entri paling lama jika kapasitas terlampaui.
+        Harus dipanggil saat memegang self.lock.
+        """
+        old = self.memory.pop(key, None)
+        if old is not None:
+            self.memory_used -= old.size
+        if entry.size > self.memory_bytes:
+            return
+        self.memory[key] = entry
+        self.memory_used += entry.size
+        while self.memory_used > self.memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_used -= evicted.size
+            self.counters['memory_evictions'] += 1
+
+    def disk_path(self, key):
+        """
+        Mengembalikan path file cache untuk kunci key (dua tingkat direktori agar tidak terlalu
+        banyak file dalam satu direktori).
+        """
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def load_disk_index(self):
+        """
+        Membangun indeks LRU disk dari file yang sudah ada, diurutkan dari yang paling lama diakses.
+        """
+        files = []
+        for path in disk_files(self.disk_dir):
+            stat = os.stat(path)
+            files.append((stat.st_mtime, os.path.basename(path), stat.st_size))
+        for _, name, size in sorted(files):
+            self.disk_index[name] = size
+            self.disk_used += size
+
+    def read_disk(self, key):
+        """
+        Membaca entri dari disk.
+
+        Returns:
+        - CacheEntry or None: Entri dari disk, None jika tidak ada atau rusak.
+        """
+        path = self.disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = read_meta(f)
+                body = f.read()
+            os.utime(path)  # Menandai file baru saja diakses untuk LRU setelah restart
+        except (OSError, ValueError, struct.error):
+            return None
+        with self.lock:
+            if key in self.disk_index:
+                self.disk_index.move_to_end(key)
+        return CacheEntry.from_meta(meta, body)
+
+    def write_disk(self, key, entry):
+        """
+        Menulis entri ke disk secara atomik (file sementara lalu os.replace) dan membuang
+        file paling lama jika kapasitas disk terlampaui.
+        """
+        path = self.disk_path(key)
+        meta = json.dumps(entry.to_meta()).encode('utf-8')
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(struct.pack('>I', len(meta)))
+                f.write(meta)
+                f.write(entry.body)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        size = 4 + len(meta) + entry.size
+
+        evicted = []
+        with self.lock:
+            self.disk_used += size - self.disk_index.pop(key, 0)
+            self.disk_index[key] = size
+            while self.disk_used > self.disk_bytes and len(self.disk_index) > 1:
+                old_key, old_size = self.disk_index.popitem(last=False)
+                self.disk_used -= old_size
+                evicted.append(old_key)
+                self.counters['disk_evictions'] += 1
+        for old_key in evicted:
+            try:
+                os.remove(self.disk_path(old_key))
+            except OSError:
+                pass
+
+    def record_hit(self, entry):
+        """
+        Mencatat respons yang diberikan langsung dari cache.
+        """
+        with self.lock:
+            self.counters['hits'] += 1
+            self.counters['bytes_saved'] += entry.size
+
+    def record_revalidated(self, entry):
+        """
+        Mencatat respons yang divalidasi ulang dengan 304 (body tidak diunduh ulang).
+        """
+        with self.lock:
+            self.counters['revalidated'] += 1
+            self.counters['bytes_saved'] += entry.size
+
+    def record_miss(self):
+        """
+        Mencatat permintaan yang harus mengambil body dari server asal.
+        """
+        with self.lock:
+            self.counters['misses'] += 1
+
+    def stats(self):
+        """
+        Mengembalikan statistik cache untuk memantau dan menyesuaikan kapasitas.
+
+        Returns:
+        - dict: hits, revalidated, misses, hit_ratio, bytes_saved, stores, evictions,
+          serta pemakaian memori dan disk.
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            lookups = self.counters['hits'] + self.counters['revalidated'] + self.counters['misses']
+            stats.update({
+                'hit_ratio': (self.counters['hits'] + self.counters['revalidated']) / lookups if lookups else 0.0,
+                'memory_entries': len(self.memory),
+                'memory_bytes': self.memory_used,
+                'disk_entries': len(self.disk_index),
+                'disk_bytes': self.disk_used,
+            })
+        for name in ('hits', 'revalidated', 'misses', 'bytes_saved', 'stores', 'memory_evictions', 'disk_evictions'):
+            stats.setdefault(name, 0)
+        return stats
+
+
+def cache_key(url):
+    """
+    Menghitung kunci cache (hash SHA-256 heksadesimal) untuk URL.
+    """
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def disk_files(disk_dir):
+    """
+    Iterasi path semua file entri cache di disk (file sementara dilewati).
+    """
+    for root, _, names in os.walk(disk_dir):
+        for name in names:
+            if not name.endswith('.tmp'):
+                yield os.path.join(root, name)
+
+
+def read_meta(f):
+    """
+    Membaca metadata entri dari file cache yang sudah dibuka; setelahnya posisi file berada di
+    awal body, sehingga body bisa dibaca per potongan.
+
+    Returns:
+    - dict: Metadata entri (lihat CacheEntry.to_meta).
+    """
+    (meta_len,) = struct.unpack('>I', f.read(4))
+    return json.loads(f.read(meta_len))
+
+
+def parse_cache_control(headers):
+    """
+    Mem-parsing semua header Cache-Control menjadi dictionary direktif.
+
+    Args:
+    - headers: List pasangan (nama, nilai) atau objek dengan metode get_all.
+
+    Returns:
+    - dict: Nama direktif (huruf kecil) -> nilai (str) atau True jika tanpa nilai.
+    """
+    if hasattr(headers, 'get_all'):
+        values = headers.get_all('Cache-Control', [])
+    else:
+        values = [value for name, value in headers if name.lower() == 'cache-control']
+    directives = {}
+    for value in values:
+        for part in value.split(','):
+            name, _, arg = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def parse_http_date(value):
+    """
+    Mengubah tanggal HTTP (misalnya header Date/Expires) menjadi epoch, None jika tidak valid.
+    """
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_age(headers):
+    """
+    Mengambil nilai header Age (detik) dari list header, 0 jika tidak ada atau tidak valid.
+    """
+    for name, value in headers:
+        if name.lower() == 'age':
+            try:
+                return max(0, int(value))
+            except ValueError:
+                return 0
+    return 0
+
+
+def freshness_lifetime(headers, directives, now):
+    """
+    Menghitung lama respons dianggap segar (detik) dari s-maxage, max-age, atau Expires.
+
+    Args:
+    - headers (list): List pasangan (nama, nilai) header respons.
+    - directives (dict): Direktif Cache-Control respons.
+    - now (float): Waktu respons diterima (epoch), dipakai jika header Date tidak ada.
+
+    Returns:
+    - int: Lama kesegaran dalam detik (0 berarti harus selalu divalidasi ulang).
+    """
+    if 'no-cache' in directives:
+        return 0
+    for name in ('s-maxage', 'max-age'):
+        if name in directives:
+            try:
+                return max(0, int(directives[name]))
+            except (TypeError, ValueError):
+                return 0
+    values = {name.lower(): value for name, value in headers}
+    expires = parse_http_date(values.get('expires'))
+    if expires is not None:
+        date = parse_http_date(values.get('date')) or now
+        return max(0, int(expires - date))
+    return 0
+
+
+def build_entry(request_headers, status, reason, headers, body, now):
+    """
+    Membuat CacheEntry dari respons jika respons boleh disimpan oleh cache bersama.
+
+    Returns:
+    - CacheEntry or None: Entri baru, None jika respons tidak boleh di-cache.
+    """
+    if status not in CACHEABLE_STATUSES:
+        return None
+    request_directives = parse_cache_control(request_headers)
+    directives = parse_cache_control(headers)
+    if 'no-store' in request_directives or 'no-store' in directives or 'private' in directives:
+        return None
+    # Permintaan dengan Authorization hanya boleh disimpan jika server mengizinkan secara eksplisit
+    if request_headers.get('Authorization') and not ({'public', 's-maxage', 'must-revalidate'} & set(directives)):
+        return None
+
+    values = {name.lower(): value for name, value in headers}
+    vary_names = [v.strip() for v in values.get('vary', '').split(',') if v.strip()]
+    if '*' in vary_names:
+        return None
+
+    freshness = freshness_lifetime(headers, directives, now)
+    has_validator = 'etag' in values or 'last-modified' in values
+    if freshness == 0 and not has_validator:
+        return None  # Tidak pernah segar dan tidak bisa divalidasi ulang, tidak ada gunanya disimpan
+
+    stored_headers = [(n, v) for n, v in headers if n.lower() not in UNSTORED_HEADERS]
+    vary = {name: request_headers.get(name, '') for name in vary_names}
+    return CacheEntry(status, reason, stored_headers, body, now, parse_age(headers), freshness, vary)
+
+
+def conditional_headers(entry):
+    """
+    Membuat header validasi ulang (If-None-Match / If-Modified-Since) untuk entri.
+
+    Returns:
+    - dict: Header kondisional, kosong jika entri tidak punya ETag maupun Last-Modified.
+    """
+    headers = {}
+    if entry.header('ETag'):
+        headers['If-None-Match'] = entry.header('ETag')
+    if entry.header('Last-Modified'):
+        headers['If-Modified-Since'] = entry.header('Last-Modified')
+    return headers
@@ -0,0 +1,153 @@
+import os  # Import modul os untuk fork, waitpid, dan kill
+import signal  # Import modul signal untuk SIGTERM/SIGINT
+import time  # Import modul time untuk jeda restart dan batas waktu drain
+
+# Jeda (detik) antar pemeriksaan status proses worker
+POLL_INTERVAL = 0.2
+
+# Worker yang mati sebelum berjalan selama ini (detik) dianggap crash saat start
+MIN_UPTIME = 5
+
+# Jeda awal dan maksimal (detik) sebelum worker yang crash saat start dijalankan ulang
+RESTART_BACKOFF = 1
+MAX_RESTART_BACKOFF = 30
+
+# Waktu tambahan (detik) setelah drain_timeout sebelum worker yang belum selesai dihentikan paksa
+KILL_GRACE = 5
+
+
+class Supervisor:
+    """
+    Supervisor pre-fork: menjalankan beberapa proses worker yang masing-masing membuka port
+    yang sama dengan SO_REUSEPORT, sehingga kernel membagi koneksi baru ke semua worker dan
+    relay tidak lagi dibatasi GIL satu proses.
+
+    Worker yang crash dijalankan ulang (dengan backoff jika crash berulang saat start).
+    SIGTERM atau SIGINT ke supervisor diteruskan sebagai SIGTERM ke semua worker agar mereka
+    berhenti menerima koneksi baru dan menyelesaikan koneksi yang sedang berjalan (drain).
+    Worker yang belum selesai setelah drain_timeout + KILL_GRACE detik dihentikan dengan SIGKILL.
+
+    Metode:
+    - run: Menjalankan semua worker dan mengawasinya sampai supervisor dihentikan.
+
+    Atribut:
+    - target: Fungsi target(worker_index) yang dijalankan di setiap proses worker.
+    - workers: Jumlah proses worker.
+    - drain_timeout: Batas waktu (detik) worker menyelesaikan koneksi setelah SIGTERM.
+    - children: Dictionary pid -> (worker_index, waktu start).
+    """
+
+    def __init__(self, target, workers, drain_timeout):
+        self.target = target
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.children = {}
+        self.backoff = {}  # worker_index -> jeda restart berikutnya
+        self.restart_at = {}  # worker_index -> waktu (time.monotonic()) worker boleh dijalankan ulang
+        self.stopping = False
+        self.stop_deadline = None
+
+    def run(self):
+        """
+        Menjalankan worker dan mengawasi mereka sampai semua worker berhenti setelah SIGTERM.
+        """
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while self.children or not self.stopping:
+            self.reap()
+            now = time.monotonic()
+            if self.stopping:
+                if now >= self.stop_deadline:
+                    self.signal_children(signal.SIGKILL)
+            else:
+                for index, when in list(self.restart_at.items()):
+                    if now >= when:
+                        del self.restart_at[index]
+                        self.spawn(index)
+            time.sleep(POLL_INTERVAL)
+        print('Semua worker berhenti')
+
+    def spawn(self, index):
+        """
+        Menjalankan satu proses worker dengan fork.
+
+        Args:
+        - index (int): Nomor worker (0 sampai workers - 1).
+        """
+        pid = os.fork()
+        if pid == 0:
+            # Proses worker: SIGINT dari terminal diabaikan, supervisor yang mengirim SIGTERM
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                self.target(index)
+            except BaseException as e:
+                print(f'[WORKER {index}] Berhenti karena error: {e!r}')
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = (index, time.monotonic())
+        print(f'[SUPERVISOR] Worker {index} berjalan (pid {pid})')
+
+    def reap(self):
+        """
+        Mengambil status worker yang sudah berhenti dan menjadwalkan restart jika perlu.
+        """
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            index, started = self.children.pop(pid, (None, None))
+            if index is None or self.stopping:
+                continue
+
+            # Worker yang crash segera setelah start dijalankan ulang dengan jeda yang terus bertambah
+            uptime = time.monotonic() - started
+            delay = 0
+            if uptime < MIN_UPTIME:
+                delay = self.backoff.get(index, RESTART_BACKOFF)
+                self.backoff[index] = min(delay * 2, MAX_RESTART_BACKOFF)
+            else:
+                self.backoff.pop(index, None)
+            print(f'[SUPERVISOR] Worker {index} (pid {pid}) berhenti dengan status {describe_status(status)}, '
+                  f'dijalankan ulang dalam {delay} detik')
+            self.restart_at[index] = time.monotonic() + delay
+
+    def handle_stop(self, signum, frame):
+        """
+        Handler SIGTERM/SIGINT: meneruskan SIGTERM ke semua worker untuk drain.
+        """
+        if self.stopping:
+            return
+        self.stopping = True
+        self.stop_deadline = time.monotonic() + self.drain_timeout + KILL_GRACE
+        self.restart_at.clear()
+        print(f'[SUPERVISOR] Menghentikan {len(self.children)} worker (drain maks {self.drain_timeout} detik)...')
+        self.signal_children(signal.SIGTERM)
+
+    def signal_children(self, signum):
+        """
+        Mengirim sinyal ke semua worker yang masih berjalan.
+        """
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def describe_status(status):
+    """
+    Menjelaskan status keluar dari os.waitpid, misalnya 'exit 1' atau 'sinyal SIGKILL'.
+    """
+    if os.WIFSIGNALED(status):
+        return f'sinyal {signal.Signals(os.WTERMSIG(status)).name}'
+    return f'exit {os.waitstatus_to_exitcode(status)}'
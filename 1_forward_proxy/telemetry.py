@@ -0,0 +1,369 @@
+import bisect  # Import modul bisect untuk mencari bucket histogram
+import threading  # Import modul threading untuk shard metrik per thread
+import http.server  # Import modul http.server untuk endpoint admin /metrics
+
+# Batas bucket (detik) histogram latensi koneksi ke server target dan durasi permintaan HTTP
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Batas bucket (detik) histogram umur tunnel
+LIFETIME_BUCKETS = (0.1, 1, 5, 15, 60, 300, 900, 3600)
+
+# Counter yang diekspor: nama -> keterangan
+COUNTERS = {
+    'proxy_tunnels_opened_total': 'Jumlah tunnel CONNECT yang berhasil dibuka',
+    'proxy_tunnels_closed_total': 'Jumlah tunnel CONNECT yang sudah ditutup',
+    'proxy_tunnel_bytes_total': 'Bytes yang diteruskan tunnel per arah (dihitung saat tunnel ditutup)',
+    'proxy_host_tunnels_total': 'Jumlah tunnel per host target',
+    'proxy_host_bytes_total': 'Bytes tunnel per host target dan arah',
+    'proxy_requests_total': 'Jumlah permintaan HTTP biasa per metode, status, dan hasil cache',
+    'proxy_host_requests_total': 'Jumlah permintaan HTTP biasa per host target',
+    'proxy_errors_total': 'Jumlah error per tahap dan tipe exception',
+}
+
+# Histogram yang diekspor: nama -> (batas bucket, keterangan)
+HISTOGRAMS = {
+    'proxy_connect_latency_seconds': (LATENCY_BUCKETS, 'Lama membuat koneksi atau tunnel ke server target'),
+    'proxy_tunnel_lifetime_seconds': (LIFETIME_BUCKETS, 'Umur tunnel CONNECT dari dibuka sampai ditutup'),
+    'proxy_request_duration_seconds': (LATENCY_BUCKETS, 'Lama menunggu header respons dari server asal'),
+}
+
+# Jumlah maksimal host target yang diberi label sendiri; host lain digabung sebagai 'other'
+MAX_TRACKED_HOSTS = 1000
+
+
+class MetricShard:
+    """
+    Counter dan histogram milik satu thread. Hanya thread pemilik yang menulis ke shard,
+    sehingga pencatatan tidak memerlukan lock.
+
+    Atribut:
+    - thread: Thread pemilik shard.
+    - counters: Dictionary (nama, label) -> nilai.
+    - histograms: Dictionary (nama, label) -> list jumlah per bucket (terakhir untuk +Inf) dan total nilai.
+    """
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.counters = {}
+        self.histograms = {}
+
+    def merge(self, counters, histograms):
+        """
+        Menjumlahkan isi shard ini ke dictionary counters dan histograms.
+        """
+        for key, value in self.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, (buckets, total) in self.histograms.copy().items():
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+
+
+class Metrics:
+    """
+    Kumpulan metrik proxy (tunnel aktif, latensi koneksi, bytes per arah, umur tunnel,
+    counter per host target, dan error per tipe) dalam format teks Prometheus.
+
+    Setiap thread menulis ke shard-nya sendiri (threading.local) tanpa lock; shard baru
+    dijumlahkan saat endpoint /metrics dibaca. Shard milik thread yang sudah selesai
+    digabung ke satu shard pensiun setiap kali shard baru dibuat (dan saat render), sehingga
+    jumlah shard mengikuti jumlah thread yang hidup pada server thread-per-koneksi walaupun
+    /metrics tidak pernah dibaca.
+
+    Metode:
+    - inc / observe: Menambah counter atau mencatat nilai histogram.
+    - tunnel_opened / tunnel_closed / request / error: Pencatatan untuk kejadian proxy.
+    - add_gauge: Mendaftarkan gauge yang nilainya dibaca saat render.
+    - render: Menyusun teks Prometheus.
+
+    Atribut:
+    - gauges: List (nama, keterangan, fungsi) gauge yang didaftarkan.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.shards = []
+        self.retired = MetricShard(None)
+        self.hosts = set()
+        self.gauges = []
+
+    def shard(self):
+        """
+        Mengembalikan shard milik thread saat ini, membuatnya jika belum ada.
+        """
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = MetricShard(threading.current_thread())
+            self.local.shard = shard
+            with self.lock:
+                self.retire_dead_shards()
+                self.shards.append(shard)
+            return shard
+
+    def retire_dead_shards(self):
+        """
+        Menggabungkan shard milik thread yang sudah selesai ke shard pensiun (dipanggil dengan lock).
+        """
+        live = []
+        for shard in self.shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                # Thread sudah selesai dan tidak akan menulis lagi
+                shard.merge(self.retired.counters, self.retired.histograms)
+        self.shards = live
+
+    def inc(self, name, labels=(), value=1):
+        """
+        Menambah counter.
+
+        Args:
+        - name (str): Nama counter (kunci COUNTERS).
+        - labels (tuple): Pasangan (nama label, nilai) yang sudah terurut.
+        - value (int): Besar penambahan.
+        """
+        counters = self.shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        """
+        Mencatat satu nilai ke histogram.
+
+        Args:
+        - name (str): Nama histogram (kunci HISTOGRAMS).
+        - value (float): Nilai yang dicatat.
+        - labels (tuple): Pasangan (nama label, nilai).
+        """
+        histograms = self.shard().histograms
+        key = (name, labels)
+        bounds = HISTOGRAMS[name][0]
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [[0] * (len(bounds) + 1), 0]
+        histogram[0][bisect.bisect_left(bounds, value)] += 1
+        histogram[1] += value
+
+    def host_label(self, host):
+        """
+        Mengembalikan label host, atau 'other' jika host baru melebihi MAX_TRACKED_HOSTS.
+        """
+        if host in self.hosts:
+            return host
+        with self.lock:
+            if len(self.hosts) < MAX_TRACKED_HOSTS:
+                self.hosts.add(host)
+                return host
+        return 'other'
+
+    def tunnel_opened(self, host, connect_latency):
+        """
+        Mencatat tunnel yang berhasil dibuka beserta lama koneksinya.
+        """
+        self.inc('proxy_tunnels_opened_total')
+        self.inc('proxy_host_tunnels_total', (('host', self.host_label(host)),))
+        self.observe('proxy_connect_latency_seconds', connect_latency)
+
+    def tunnel_closed(self, host, bytes_up, bytes_down, lifetime):
+        """
+        Mencatat tunnel yang ditutup: bytes per arah dan umur tunnel.
+
+        Args:
+        - host (str): Host target tunnel.
+        - bytes_up (int): Bytes dari klien ke server target.
+        - bytes_down (int): Bytes dari server target ke klien.
+        - lifetime (float): Umur tunnel dalam detik.
+        """
+        host = self.host_label(host)
+        self.inc('proxy_tunnels_closed_total')
+        self.inc('proxy_tunnel_bytes_total', (('direction', 'upstream'),), bytes_up)
+        self.inc('proxy_tunnel_bytes_total', (('direction', 'downstream'),), bytes_down)
+        self.inc('proxy_host_bytes_total', (('direction', 'upstream'), ('host', host)), bytes_up)
+        self.inc('proxy_host_bytes_total', (('direction', 'downstream'), ('host', host)), bytes_down)
+        self.observe('proxy_tunnel_lifetime_seconds', lifetime)
+
+    def request(self, method, host, status, cache_status, duration=None):
+        """
+        Mencatat satu permintaan HTTP biasa.
+
+        Args:
+        - method (str): Metode HTTP.
+        - host (str): Host server asal.
+        - status (int): Kode status yang dikirim ke klien.
+        - cache_status (str): 'HIT', 'REVALIDATED', 'MISS', atau 'NONE' jika cache tidak dipakai.
+        - duration (float, optional): Lama menunggu header respons dari server asal.
+        """
+        self.inc('proxy_requests_total', (('cache', cache_status), ('method', method), ('status', str(status))))
+        self.inc('proxy_host_requests_total', (('host', self.host_label(host)),))
+        if duration is not None:
+            self.observe('proxy_request_duration_seconds', duration)
+
+    def error(self, stage, exc):
+        """
+        Mencatat error berdasarkan tahap ('connect', 'relay', 'forward', ...) dan tipe exception.
+        """
+        self.inc('proxy_errors_total', (('stage', stage), ('type', type(exc).__name__)))
+
+    def add_gauge(self, name, help_text, func):
+        """
+        Mendaftarkan gauge yang nilainya dihitung saat render.
+
+        Args:
+        - name (str): Nama gauge.
+        - help_text (str): Keterangan gauge.
+        - func: Fungsi tanpa argumen yang mengembalikan angka, atau list (label, nilai).
+        """
+        self.gauges.append((name, help_text, func))
+
+    def snapshot(self):
+        """
+        Menjumlahkan semua shard.
+
+        Returns:
+        - tuple: (counters, histograms) hasil penjumlahan.
+        """
+        counters, histograms = {}, {}
+        with self.lock:
+            self.retire_dead_shards()
+            self.retired.merge(counters, histograms)
+            for shard in self.shards:
+                shard.merge(counters, histograms)
+        return counters, histograms
+
+    def render(self):
+        """
+        Menyusun semua metrik dalam format teks Prometheus (versi 0.0.4).
+
+        Returns:
+        - str: Isi respons /metrics.
+        """
+        counters, histograms = self.snapshot()
+        lines = []
+
+        active = (counters.get(('proxy_tunnels_opened_total', ()), 0)
+                  - counters.get(('proxy_tunnels_closed_total', ()), 0))
+        lines += ['# HELP proxy_tunnels_active Jumlah tunnel CONNECT yang sedang terbuka',
+                  '# TYPE proxy_tunnels_active gauge', f'proxy_tunnels_active {active}']
+
+        for name, help_text in COUNTERS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            samples = sorted((labels, value) for (key, labels), value in counters.items() if key == name)
+            if not samples and name in ('proxy_tunnels_opened_total', 'proxy_tunnels_closed_total'):
+                samples = [((), 0)]
+            for labels, value in samples:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+
+        for name, (bounds, help_text) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (key, labels), (buckets, total) in sorted(histograms.items()):
+                if key != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(bounds + ('+Inf',), buckets):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else repr(float(bound))
+                    lines.append(f'{name}_bucket{format_labels(labels + (("le", le),))} {cumulative}')
+                lines.append(f'{name}_sum{format_labels(labels)} {total}')
+                lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+
+        for name, help_text, func in self.gauges:
+            try:
+                value = func()
+            except Exception:
+                continue  # Gauge yang gagal dibaca tidak boleh menggagalkan seluruh /metrics
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+            if isinstance(value, list):
+                for labels, sample in value:
+                    lines.append(f'{name}{format_labels(labels)} {sample}')
+            else:
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class NullMetrics:
+    """
+    Pengganti Metrics saat endpoint /metrics tidak aktif: semua pencatatan diabaikan sehingga
+    tidak ada shard atau counter yang disimpan.
+    """
+
+    def inc(self, name, labels=(), value=1):
+        pass
+
+    def observe(self, name, value, labels=()):
+        pass
+
+    def tunnel_opened(self, host, connect_latency):
+        pass
+
+    def tunnel_closed(self, host, bytes_up, bytes_down, lifetime):
+        pass
+
+    def request(self, method, host, status, cache_status, duration=None):
+        pass
+
+    def error(self, stage, exc):
+        pass
+
+    def add_gauge(self, name, help_text, func):
+        pass
+
+    def render(self):
+        return ''
+
+
+def format_labels(labels):
+    """
+    Menyusun label Prometheus, misalnya (('host', 'a'),) -> '{host="a"}'.
+    """
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+
+class AdminHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Endpoint admin lokal: GET /metrics mengembalikan metrik dalam format teks Prometheus.
+    """
+
+    metrics = None
+
+    def do_GET(self):
+        """
+        Menangani permintaan GET ke endpoint admin.
+        """
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404, 'Not found')
+            return
+        body = self.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """
+        Tidak mencetak log untuk setiap scrape /metrics.
+        """
+
+
+def start_admin_server(metrics, port, host='127.0.0.1'):
+    """
+    Menjalankan endpoint admin /metrics di thread daemon.
+
+    Args:
+    - metrics (Metrics): Metrik yang diekspor.
+    - port (int): Port endpoint admin.
+    - host (str): Alamat yang didengarkan (default: '127.0.0.1', hanya lokal).
+
+    Returns:
+    - http.server.ThreadingHTTPServer: Server admin yang sedang berjalan.
+    """
+    handler_class = type('MetricsHandler', (AdminHTTPRequestHandler,), {'metrics': metrics})
+    server = http.server.ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-admin', daemon=True).start()
+    return server
@@ -0,0 +1,439 @@
+import socket  # Import modul socket untuk koneksi ke upstream proxy
+import threading  # Import modul threading untuk sinkronisasi antar handler
+import asyncio  # Import modul asyncio untuk versi tunnel non-blocking pada mode async
+import random  # Import modul random untuk pemilihan berbobot latensi
+import time  # Import modul time untuk latensi dan waktu ejeksi
+
+# Strategi pemilihan upstream yang tersedia
+STRATEGIES = ('round_robin', 'least_connections', 'latency')
+
+# Jumlah kegagalan berturut-turut sebelum upstream dikeluarkan sementara (circuit breaker)
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Lama (detik) upstream dikeluarkan sebelum dicoba lagi (half-open)
+DEFAULT_EJECT_SECONDS = 30
+
+# Bobot perataan EWMA latensi (semakin besar, semakin cepat mengikuti latensi terbaru)
+EWMA_ALPHA = 0.3
+
+# Batas waktu default (detik) koneksi ke upstream sampai respons CONNECT-nya selesai dibaca
+DEFAULT_CONNECT_TIMEOUT = 10
+
+# Ukuran maksimal header respons CONNECT dari upstream (dalam bytes)
+MAX_CONNECT_RESPONSE = 65536
+
+
+class UpstreamError(OSError):
+    """
+    Dimunculkan jika upstream proxy menolak atau gagal membuat tunnel.
+    """
+
+
+class UpstreamRefused(UpstreamError):
+    """
+    Dimunculkan jika upstream proxy menjawab CONNECT dengan status bukan 2xx (misalnya 403 atau 502
+    untuk target yang ditolak atau tidak bisa dihubungi). Upstream-nya sendiri sehat, sehingga
+    jawaban ini tidak dihitung sebagai kegagalan dan tidak dicoba lewat upstream lain.
+
+    Atribut:
+    - status: Kode status dari upstream.
+    - reason: Alasan status dari upstream.
+    """
+
+    def __init__(self, message, status, reason):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class UpstreamProxy:
+    """
+    Satu upstream proxy beserta status kesehatannya.
+
+    Atribut:
+    - host, port: Alamat upstream proxy.
+    - weight: Bobot relatif dalam pemilihan.
+    - active: Jumlah koneksi yang sedang memakai upstream ini.
+    - latency: EWMA latensi membuat koneksi/tunnel (detik), None jika belum pernah diukur.
+    - failures: Jumlah kegagalan berturut-turut.
+    - ejected_until: Waktu (time.monotonic()) sampai upstream dikeluarkan dari pemilihan.
+    - requests, errors: Total pemakaian dan total kegagalan.
+    """
+
+    def __init__(self, host, port, weight=1):
+        self.host = host
+        self.port = port
+        self.weight = weight
+        self.active = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected_until = 0
+        self.current_weight = 0  # Untuk smooth weighted round robin
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def name(self):
+        """
+        Nama upstream dalam format 'host:port'.
+        """
+        return f'{self.host}:{self.port}'
+
+    def is_available(self, now):
+        """
+        Mengembalikan True jika upstream tidak sedang dikeluarkan oleh circuit breaker.
+        """
+        return now >= self.ejected_until
+
+
+class UpstreamPool:
+    """
+    Kumpulan upstream proxy berbobot untuk meneruskan tunnel CONNECT dan permintaan HTTP,
+    dengan pemantauan kesehatan pasif dan circuit breaker.
+
+    Setiap kegagalan koneksi menambah hitungan kegagalan berturut-turut upstream; setelah
+    failure_threshold kali, upstream dikeluarkan selama eject_seconds. Setelah itu upstream
+    kembali dicoba (half-open): satu keberhasilan memulihkannya, satu kegagalan mengeluarkannya lagi.
+
+    Metode:
+    - choose: Memilih upstream sesuai strategi.
+    - acquire / release: Menandai upstream sedang dipakai atau selesai dipakai.
+    - record_success / record_failure: Mencatat hasil pemakaian upstream.
+    - open_tunnel / async_open_tunnel: Membuat tunnel CONNECT ke host:port lewat upstream.
+    - stats: Status kesehatan setiap upstream.
+
+    Atribut:
+    - upstreams: List UpstreamProxy.
+    - strategy: 'round_robin' (berbobot), 'least_connections', atau 'latency'.
+    - failure_threshold: Jumlah kegagalan berturut-turut sebelum ejeksi.
+    - eject_seconds: Lama ejeksi (detik).
+    - connect_timeout: Batas waktu (detik) koneksi, pengiriman CONNECT, dan pembacaan jawabannya
+      pada async_open_tunnel.
+    """
+
+    def __init__(self, upstreams, strategy='round_robin', failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 eject_seconds=DEFAULT_EJECT_SECONDS, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Strategi upstream tidak dikenal: {strategy}')
+        self.upstreams = upstreams
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.eject_seconds = eject_seconds
+        self.connect_timeout = connect_timeout
+        self.lock = threading.Lock()
+
+    def choose(self, exclude=()):
+        """
+        Memilih upstream yang tersedia sesuai strategi. Jika semua upstream sedang dikeluarkan,
+        upstream yang paling cepat selesai masa ejeksinya tetap dipilih daripada gagal total.
+
+        Args:
+        - exclude (iterable): Upstream yang tidak boleh dipilih (sudah dicoba).
+
+        Returns:
+        - UpstreamProxy or None: Upstream terpilih, None jika tidak ada kandidat.
+        """
+        now = time.monotonic()
+        with self.lock:
+            candidates = [u for u in self.upstreams if u not in exclude]
+            if not candidates:
+                return None
+            available = [u for u in candidates if u.is_available(now)]
+            if not available:
+                return min(candidates, key=lambda u: u.ejected_until)
+
+            if self.strategy == 'least_connections':
+                return min(available, key=lambda u: (u.active + 1) / u.weight)
+
+            if self.strategy == 'latency':
+                # Upstream yang belum pernah diukur dianggap secepat upstream tercepat agar ikut dicoba
+                known = [u.latency for u in available if u.latency is not None]
+                default = min(known) if known else 1.0
+                scores = [u.weight / max(u.latency if u.latency is not None else default, 1e-3)
+                          for u in available]
+                return random.choices(available, weights=scores)[0]
+
+            # Smooth weighted round robin: pola pemilihan rata sesuai bobot
+            total = sum(u.weight for u in available)
+            for upstream in available:
+                upstream.current_weight += upstream.weight
+            chosen = max(available, key=lambda u: u.current_weight)
+            chosen.current_weight -= total
+            return chosen
+
+    def acquire(self, upstream):
+        """
+        Menandai satu koneksi mulai memakai upstream.
+        """
+        with self.lock:
+            upstream.active += 1
+            upstream.requests += 1
+
+    def release(self, upstream):
+        """
+        Menandai satu koneksi selesai memakai upstream.
+        """
+        with self.lock:
+            upstream.active -= 1
+
+    def record_success(self, upstream, latency):
+        """
+        Mencatat keberhasilan: memulihkan circuit breaker dan memperbarui EWMA latensi.
+
+        Args:
+        - upstream (UpstreamProxy): Upstream yang berhasil dipakai.
+        - latency (float): Lama membuat koneksi/tunnel (detik).
+        """
+        with self.lock:
+            upstream.failures = 0
+            upstream.ejected_until = 0
+            if upstream.latency is None:
+                upstream.latency = latency
+            else:
+                upstream.latency += EWMA_ALPHA * (latency - upstream.latency)
+
+    def record_failure(self, upstream):
+        """
+        Mencatat kegagalan dan mengeluarkan upstream jika kegagalan berturut-turut mencapai batas.
+
+        Args:
+        - upstream (UpstreamProxy): Upstream yang gagal.
+        """
+        with self.lock:
+            upstream.failures += 1
+            upstream.errors += 1
+            if upstream.failures >= self.failure_threshold:
+                upstream.ejected_until = time.monotonic() + self.eject_seconds
+
+    def open_tunnel(self, host, port, connector):
+        """
+        Membuat tunnel CONNECT ke host:port lewat upstream proxy. Jika koneksi ke upstream gagal,
+        upstream lain dicoba sampai semua upstream sudah dicoba sekali. Jawaban bukan 2xx dari
+        upstream tidak memicu failover (lihat UpstreamRefused).
+
+        Args:
+        - host (str), port (int): Server target.
+        - connector: Fungsi (host, port) -> socket untuk terhubung ke upstream.
+
+        Returns:
+        - tuple: (socket.socket, UpstreamProxy). Pemanggil wajib memanggil release(upstream)
+          setelah tunnel ditutup.
+
+        Raises:
+        - UpstreamRefused: Jika upstream menjawab CONNECT dengan status bukan 2xx.
+        - UpstreamError: Jika semua upstream gagal.
+        """
+        tried = []
+        while True:
+            upstream = self.choose(exclude=tried)
+            if upstream is None:
+                raise UpstreamError(f'Semua upstream gagal membuat tunnel ke {host}:{port}')
+            tried.append(upstream)
+            self.acquire(upstream)
+            start = time.monotonic()
+            sock = None
+            try:
+                sock = connector(upstream.host, upstream.port)
+                sock.sendall(connect_request(host, port))
+                read_connect_response(sock)
+            except UpstreamRefused:
+                # Penolakan untuk target ini, bukan kegagalan upstream: diteruskan ke klien
+                sock.close()
+                self.record_success(upstream, time.monotonic() - start)
+                self.release(upstream)
+                raise
+            except OSError:
+                if sock is not None:
+                    sock.close()
+                self.record_failure(upstream)
+                self.release(upstream)
+                continue
+            self.record_success(upstream, time.monotonic() - start)
+            return sock, upstream
+
+    async def async_open_tunnel(self, host, port, connector):
+        """
+        Versi asyncio dari open_tunnel.
+
+        Args:
+        - host (str), port (int): Server target.
+        - connector: Coroutine function (host, port) -> socket non-blocking untuk terhubung ke upstream.
+
+        Returns:
+        - tuple: (socket.socket, UpstreamProxy).
+
+        Raises:
+        - UpstreamRefused: Jika upstream menjawab CONNECT dengan status bukan 2xx.
+        - UpstreamError: Jika semua upstream gagal.
+        """
+        tried = []
+        while True:
+            upstream = self.choose(exclude=tried)
+            if upstream is None:
+                raise UpstreamError(f'Semua upstream gagal membuat tunnel ke {host}:{port}')
+            tried.append(upstream)
+            self.acquire(upstream)
+            start = time.monotonic()
+            try:
+                # Upstream yang menerima koneksi tetapi tidak pernah menjawab CONNECT dihitung gagal
+                sock = await asyncio.wait_for(async_connect_tunnel(upstream, host, port, connector),
+                                              self.connect_timeout)
+            except UpstreamRefused:
+                # Penolakan untuk target ini, bukan kegagalan upstream: diteruskan ke klien
+                self.record_success(upstream, time.monotonic() - start)
+                self.release(upstream)
+                raise
+            except (OSError, asyncio.TimeoutError):
+                self.record_failure(upstream)
+                self.release(upstream)
+                continue
+            self.record_success(upstream, time.monotonic() - start)
+            return sock, upstream
+
+    def stats(self):
+        """
+        Mengembalikan status kesehatan setiap upstream.
+
+        Returns:
+        - list: List dictionary berisi name, weight, active, latency, failures, ejected, requests, errors.
+        """
+        now = time.monotonic()
+        with self.lock:
+            return [{
+                'name': u.name, 'weight': u.weight, 'active': u.active, 'latency': u.latency,
+                'failures': u.failures, 'ejected': not u.is_available(now),
+                'requests': u.requests, 'errors': u.errors,
+            } for u in self.upstreams]
+
+
+def connect_request(host, port):
+    """
+    Menyusun permintaan CONNECT untuk upstream proxy.
+    """
+    authority = f'[{host}]:{port}' if ':' in host else f'{host}:{port}'
+    return f'CONNECT {authority} HTTP/1.1\r\nHost: {authority}\r\n\r\n'.encode('latin-1')
+
+
+def read_connect_response(sock):
+    """
+    Membaca respons CONNECT dari upstream tepat sampai akhir header (memakai MSG_PEEK agar
+    data tunnel setelah header tidak ikut terbaca).
+
+    Raises:
+    - UpstreamError: Jika upstream menutup koneksi atau tidak menjawab 200.
+    """
+    header, complete = b'', False
+    while not complete:
+        header, complete = read_header_chunk(sock, header)
+    check_connect_status(header)
+
+
+async def async_connect_tunnel(upstream, host, port, connector):
+    """
+    Terhubung ke upstream, mengirim CONNECT, dan membaca jawabannya (versi asyncio dari
+    langkah di open_tunnel). Socket ditutup jika langkah mana pun gagal atau dibatalkan.
+
+    Args:
+    - upstream (UpstreamProxy): Upstream tujuan.
+    - host (str), port (int): Server target.
+    - connector: Coroutine function (host, port) -> socket non-blocking.
+
+    Returns:
+    - socket.socket: Socket tunnel yang siap dipakai.
+    """
+    loop = asyncio.get_running_loop()
+    sock = await connector(upstream.host, upstream.port)
+    try:
+        await loop.sock_sendall(sock, connect_request(host, port))
+        header, complete = b'', False
+        while not complete:
+            await wait_readable(loop, sock)
+            try:
+                header, complete = read_header_chunk(sock, header)
+            except BlockingIOError:
+                continue
+        check_connect_status(header, upstream)
+    except BaseException:
+        # Termasuk CancelledError dari wait_for saat batas waktu habis
+        sock.close()
+        raise
+    return sock
+
+
+async def wait_readable(loop, sock):
+    """
+    Menunggu sampai socket non-blocking siap dibaca.
+    """
+    ready = loop.create_future()
+    loop.add_reader(sock.fileno(), lambda: ready.done() or ready.set_result(None))
+    try:
+        await ready
+    finally:
+        loop.remove_reader(sock.fileno())
+
+
+def read_header_chunk(sock, header):
+    """
+    Membaca satu potongan header respons CONNECT. Data diintip dulu dengan MSG_PEEK lalu hanya
+    bagian sampai akhir header yang diambil dari socket, sehingga data tunnel tetap di socket.
+
+    Args:
+    - sock (socket.socket): Socket ke upstream.
+    - header (bytes): Header yang sudah terbaca sebelumnya.
+
+    Returns:
+    - tuple: (header, selesai) dengan selesai bernilai True jika akhir header sudah terbaca.
+
+    Raises:
+    - UpstreamError: Jika upstream menutup koneksi atau header terlalu besar.
+    """
+    data = sock.recv(4096, socket.MSG_PEEK)
+    if not data:
+        raise UpstreamError('Upstream menutup koneksi sebelum tunnel dibuat')
+    end = (header + data).find(b'\r\n\r\n')
+    if end >= 0:
+        return header + sock.recv(end + 4 - len(header)), True
+    header += sock.recv(len(data))
+    if len(header) > MAX_CONNECT_RESPONSE:
+        raise UpstreamError('Header respons CONNECT dari upstream terlalu besar')
+    return header, False
+
+
+def check_connect_status(header, upstream=None):
+    """
+    Memastikan status respons CONNECT dari upstream adalah 2xx.
+
+    Raises:
+    - UpstreamRefused: Jika status valid tetapi bukan 2xx.
+    - UpstreamError: Jika baris status tidak valid.
+    """
+    status_line = header.split(b'\r\n', 1)[0].decode('latin-1')
+    parts = status_line.split(' ', 2)
+    source = f' dari {upstream.name}' if upstream else ''
+    if len(parts) < 2 or not (len(parts[1]) == 3 and parts[1].isdigit() and '1' <= parts[1][0] <= '5'):
+        raise UpstreamError(f'Respons CONNECT tidak valid{source}: {status_line}')
+    if not parts[1].startswith('2'):
+        reason = parts[2] if len(parts) > 2 else ''
+        raise UpstreamRefused(f'Upstream menolak CONNECT{source}: {status_line}', int(parts[1]), reason)
+
+
+def parse_upstream(spec):
+    """
+    Mem-parsing spesifikasi upstream 'host:port' atau 'host:port,bobot'.
+
+    Args:
+    - spec (str): Spesifikasi upstream (misalnya '10.0.0.5:3128,2').
+
+    Returns:
+    - UpstreamProxy: Objek upstream.
+
+    Raises:
+    - ValueError: Jika port atau bobot bukan bilangan bulat, atau bobot tidak positif
+      (bobot dipakai sebagai pembagi oleh strategi least_connections).
+    """
+    address, _, weight = spec.partition(',')
+    host, _, port = address.rpartition(':')
+    weight = int(weight) if weight else 1
+    if weight <= 0:
+        raise ValueError(f'Bobot upstream harus lebih dari 0: {spec}')
+    return UpstreamProxy(host.strip('[]'), int(port), weight)
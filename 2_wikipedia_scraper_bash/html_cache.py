@@ -0,0 +1,212 @@
+import functools  # Import modul functools untuk argumen tetap fungsi worker replay
+import gzip  # Import modul gzip sebagai kompresi default
+import hashlib  # Import modul hashlib untuk alamat blob (SHA-256 isi)
+import mmap  # Import modul mmap untuk membaca blob tanpa menyalin ke memori
+import os  # Import modul os untuk path dan rename atomik
+import sqlite3  # Import modul sqlite3 untuk indeks URL -> blob
+import threading  # Import modul threading untuk lock indeks
+import time  # Import modul time untuk waktu penyimpanan
+
+# zstandard (opsional) untuk kompresi yang lebih cepat dan lebih kecil; tanpa modul ini dipakai gzip
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+# Folder cache default
+DEFAULT_CACHE_DIR = 'html_cache'
+
+# Level kompresi default untuk zstd dan gzip
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+# Ekstensi file blob untuk setiap codec
+CODEC_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+# Jumlah halaman yang dikirim ke setiap proses worker replay sekaligus
+REPLAY_CHUNK_SIZE = 16
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+class HTMLCache:
+    """
+    Cache body HTML mentah di disk yang terkompresi dan dialamatkan dengan isi (content-addressed).
+
+    Setiap body disimpan sebagai blob objects/<2 karakter hash>/<hash SHA-256>.zst (atau .gz),
+    sehingga halaman dengan isi yang sama hanya disimpan sekali. Indeks SQLite menyimpan blob
+    terakhir untuk setiap URL beserta encoding teksnya, sehingga ekstraksi bisa dijalankan ulang
+    tanpa jaringan (lihat replay).
+
+    Metode:
+    - put: Menyimpan body sebuah URL.
+    - get: Mengambil body terakhir sebuah URL.
+    - entries: Daftar (url, hash, codec, encoding) semua URL di indeks.
+    - close: Menutup indeks.
+
+    Atribut:
+    - directory: Folder cache.
+    - codec: Codec kompresi untuk blob baru ('zstd' atau 'gzip').
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, codec=None):
+        self.directory = directory
+        self.codec = codec or ('zstd' if HAS_ZSTD else 'gzip')
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(os.path.join(directory, 'index.db'), timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        with self.connection:
+            self.connection.execute(INDEX_SCHEMA)
+
+    def put(self, url, body, encoding='utf-8'):
+        """
+        Menyimpan body sebuah URL. Blob ditulis ke file sementara lalu di-rename, sehingga blob
+        yang terlihat di cache selalu lengkap.
+
+        Args:
+        - url (str): URL halaman.
+        - body (bytes): Body respons (sudah didekompresi dari gzip/brotli HTTP).
+        - encoding (str): Encoding teks body.
+
+        Returns:
+        - str: Hash SHA-256 body.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = blob_path(self.directory, digest, self.codec)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(compress(body, self.codec))
+            os.replace(temp_path, path)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO entries (url, hash, codec, encoding, size, stored_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (url, digest, self.codec, encoding, len(body), time.time()))
+        return digest
+
+    def get(self, url):
+        """
+        Mengambil body terakhir sebuah URL.
+
+        Returns:
+        - tuple or None: (body dalam bytes, encoding), atau None jika URL tidak ada di cache.
+        """
+        with self.lock:
+            row = self.connection.execute('SELECT hash, codec, encoding FROM entries WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        digest, codec, encoding = row
+        return read_blob(blob_path(self.directory, digest, codec), codec), encoding
+
+    def entries(self):
+        """
+        Mengembalikan list (url, hash, codec, encoding) semua URL di indeks, sesuai urutan penyimpanan.
+        """
+        with self.lock:
+            return self.connection.execute('SELECT url, hash, codec, encoding FROM entries ORDER BY rowid').fetchall()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self):
+        """
+        Menutup indeks.
+        """
+        self.connection.close()
+
+
+def blob_path(directory, digest, codec):
+    """
+    Path blob untuk hash dan codec tertentu.
+    """
+    return os.path.join(directory, 'objects', digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+
+def compress(body, codec):
+    """
+    Mengompresi body dengan codec 'zstd' atau 'gzip'.
+    """
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+def read_blob(path, codec):
+    """
+    Membaca dan mendekompresi blob. File dipetakan ke memori (mmap) sehingga data terkompresi
+    langsung dibaca oleh dekompresor tanpa disalin ke buffer Python terlebih dahulu.
+
+    Returns:
+    - bytes: Body asli.
+    """
+    if codec == 'zstd' and not HAS_ZSTD:
+        raise RuntimeError(f'Blob {path} dikompresi dengan zstd, pasang modul zstandard untuk membacanya')
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if codec == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+
+def encoding_from_headers(headers, default='utf-8'):
+    """
+    Mengambil charset dari header Content-Type, misalnya 'text/html; charset=UTF-8' -> 'UTF-8'.
+    """
+    content_type = headers.get('Content-Type') or ''
+    for part in content_type.split(';')[1:]:
+        name, _, value = part.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return default
+
+
+def replay_entry(parse, directory, entry):
+    """
+    Worker replay: membaca satu blob dan mengekstraknya dengan parse(html, url).
+
+    Returns:
+    - tuple: (url, data, error); data None dan error berisi pesan jika gagal.
+    """
+    url, digest, codec, encoding = entry
+    try:
+        body = read_blob(blob_path(directory, digest, codec), codec)
+        return url, parse(body.decode(encoding, 'replace'), url), None
+    except Exception as e:
+        return url, None, repr(e)
+
+
+def replay(cache, parse, workers=None):
+    """
+    Menjalankan ulang ekstraksi untuk semua halaman di cache tanpa jaringan, paralel di
+    beberapa proses.
+
+    Args:
+    - cache (HTMLCache): Cache sumber.
+    - parse (callable): Fungsi ekstraksi parse(html, url) di level modul (harus bisa di-pickle).
+    - workers (int, optional): Jumlah proses; default jumlah core, 1 berarti tanpa proses tambahan.
+
+    Yields:
+    - tuple: (url, data, error) sesuai urutan indeks cache.
+    """
+    entries = cache.entries()
+    work = functools.partial(replay_entry, parse, cache.directory)
+    if workers == 1:
+        yield from map(work, entries)
+        return
+    # Pool proses baru diimpor saat replay paralel agar scraper biasa start lebih cepat
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(work, entries, chunksize=REPLAY_CHUNK_SIZE)
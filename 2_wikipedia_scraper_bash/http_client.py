@@ -0,0 +1,222 @@
+import contextlib  # Import modul contextlib untuk context manager respons streaming
+import threading  # Import modul threading untuk cache klien bersama
+
+import requests  # Import requests sebagai klien HTTP/1.1 default
+from requests.adapters import HTTPAdapter  # Import HTTPAdapter untuk mengatur ukuran pool koneksi
+from urllib3.util.request import ACCEPT_ENCODING  # 'gzip,deflate' (+ ',br' jika modul brotli terpasang)
+
+# httpx + h2 (opsional) untuk HTTP/2; tanpa keduanya klien memakai requests (HTTP/1.1)
+try:
+    import httpx
+    import h2  # noqa: F401  (hanya memastikan dukungan HTTP/2 tersedia)
+    HAS_HTTP2 = True
+except ImportError:
+    httpx = None
+    HAS_HTTP2 = False
+
+# Batas waktu default (detik) untuk membuka koneksi dan untuk menunggu data
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+# Jumlah koneksi persisten maksimal per host
+DEFAULT_POOL_SIZE = 10
+
+# Ukuran potongan body (bytes) default untuk respons streaming
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# User-Agent default (Wikimedia meminta User-Agent yang jelas untuk bot)
+DEFAULT_USER_AGENT = 'NolimitWikipediaScraper/1.0 (python-requests)'
+
+
+class HTTPClientError(requests.exceptions.RequestException):
+    """
+    Error permintaan dari backend httpx, dibungkus sebagai RequestException agar
+    penanganan error yang sudah ada untuk requests tetap berlaku.
+    """
+
+
+class Response:
+    """
+    Respons HTTP yang seragam untuk backend requests dan httpx.
+
+    Atribut:
+    - status_code: Kode status HTTP.
+    - reason: Alasan status (misalnya 'OK').
+    - headers: Header respons.
+    - content: Body respons dalam bytes (sudah didekompresi gzip/brotli).
+    - text: Body respons sebagai teks.
+    - http_version: Versi HTTP yang dipakai ('HTTP/1.1' atau 'HTTP/2').
+    """
+
+    def __init__(self, status_code, reason, headers, content, text, http_version):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.text = text
+        self.http_version = http_version
+
+
+class StreamingResponse:
+    """
+    Respons HTTP yang body-nya dibaca per potongan (lihat HTTPClient.stream).
+
+    Atribut:
+    - status_code: Kode status HTTP.
+    - reason: Alasan status (misalnya 'OK').
+    - headers: Header respons.
+    - chunks: Iterator potongan body dalam bytes (sudah didekompresi gzip/brotli).
+    - http_version: Versi HTTP yang dipakai ('HTTP/1.1' atau 'HTTP/2').
+    """
+
+    def __init__(self, status_code, reason, headers, chunks, http_version):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.chunks = chunks
+        self.http_version = http_version
+
+
+class HTTPClient:
+    """
+    Klien HTTP bersama untuk scraper dan find_software.py.
+
+    Koneksi disimpan dalam pool persisten (keep-alive) sehingga permintaan berikutnya ke host
+    yang sama (termasuk lewat proxy) tidak mengulang handshake TCP dan TLS. Setiap permintaan
+    memakai batas waktu koneksi dan baca, meminta kompresi gzip/brotli, dan memakai HTTP/2
+    jika httpx dan h2 terpasang.
+
+    Metode:
+    - get: Mengirim permintaan GET.
+    - stream: Mengirim permintaan GET dan membaca body per potongan.
+    - close: Menutup semua koneksi di pool.
+
+    Atribut:
+    - proxy: URL proxy (misalnya 'http://localhost:9919'), None berarti langsung.
+    - connect_timeout, read_timeout: Batas waktu koneksi dan baca dalam detik.
+    - http2: True jika klien memakai backend HTTP/2 (httpx).
+    """
+
+    def __init__(self, proxy=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE, http2=True, user_agent=DEFAULT_USER_AGENT):
+        self.proxy = proxy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2 and HAS_HTTP2
+        headers = {'User-Agent': user_agent, 'Accept-Encoding': ACCEPT_ENCODING}
+
+        if self.http2:
+            options = dict(http2=True, headers=headers, follow_redirects=True,
+                           timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                           limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size))
+            try:
+                self.session = httpx.Client(proxy=proxy, **options)
+            except TypeError:
+                # httpx versi lama memakai argumen proxies
+                self.session = httpx.Client(proxies=proxy, **options)
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(headers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            if proxy:
+                self.session.proxies.update({'http': proxy, 'https': proxy})
+
+    def get(self, url, headers=None):
+        """
+        Mengirim permintaan GET.
+
+        Args:
+        - url (str): URL tujuan.
+        - headers (dict, optional): Header tambahan.
+
+        Returns:
+        - Response: Respons HTTP.
+
+        Raises:
+        - requests.exceptions.RequestException: Jika permintaan gagal (koneksi, timeout, dll).
+        """
+        if self.http2:
+            try:
+                response = self.session.get(url, headers=headers)
+            except httpx.HTTPError as e:
+                raise HTTPClientError(str(e)) from e
+            return Response(response.status_code, response.reason_phrase, response.headers,
+                            response.content, response.text, response.http_version)
+
+        response = self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout))
+        return Response(response.status_code, response.reason, response.headers,
+                        response.content, response.text, 'HTTP/1.1')
+
+    @contextlib.contextmanager
+    def stream(self, url, headers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Mengirim permintaan GET tanpa memuat seluruh body ke memori. Dipakai dengan 'with';
+        koneksi dikembalikan ke pool setelah blok 'with' selesai.
+
+        Args:
+        - url (str): URL tujuan.
+        - headers (dict, optional): Header tambahan.
+        - chunk_size (int): Ukuran potongan body dalam bytes.
+
+        Yields:
+        - StreamingResponse: Respons HTTP dengan iterator potongan body.
+
+        Raises:
+        - requests.exceptions.RequestException: Jika permintaan atau pembacaan body gagal.
+        """
+        if self.http2:
+            try:
+                with self.session.stream('GET', url, headers=headers) as response:
+                    yield StreamingResponse(response.status_code, response.reason_phrase, response.headers,
+                                            response.iter_bytes(chunk_size), response.http_version)
+            except httpx.HTTPError as e:
+                raise HTTPClientError(str(e)) from e
+            return
+
+        response = self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout), stream=True)
+        try:
+            yield StreamingResponse(response.status_code, response.reason, response.headers,
+                                    response.iter_content(chunk_size), 'HTTP/1.1')
+        finally:
+            response.close()
+
+    def close(self):
+        """
+        Menutup semua koneksi di pool.
+        """
+        self.session.close()
+
+
+# Klien bersama per konfigurasi, dipakai ulang oleh semua pemanggil dalam satu proses
+shared_clients = {}
+shared_lock = threading.Lock()
+
+
+def get_client(proxy=None, **options):
+    """
+    Mengembalikan HTTPClient bersama untuk proxy dan opsi tertentu, membuatnya jika belum ada.
+
+    Args:
+    - proxy (str, optional): URL proxy.
+    - **options: Opsi lain untuk HTTPClient (connect_timeout, read_timeout, pool_size, http2, user_agent).
+
+    Returns:
+    - HTTPClient: Klien bersama.
+    """
+    key = (proxy, tuple(sorted(options.items())))
+    with shared_lock:
+        client = shared_clients.get(key)
+        if client is None:
+            client = shared_clients[key] = HTTPClient(proxy, **options)
+        return client
+
+
+def proxy_from_dict(proxies):
+    """
+    Mengambil URL proxy dari dictionary gaya requests ({'http': ..., 'https': ...}).
+    """
+    if not proxies:
+        return None
+    return proxies.get('https') or proxies.get('http')
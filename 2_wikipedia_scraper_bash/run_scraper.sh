@@ -3,16 +3,32 @@
 # Check if at least one argument is provided
 if [ $# -lt 1 ]; then
     echo "Usage: $0 [url] [optional: proxy_url]"
+    echo "       $0 - < file_with_one_url_per_line"
     exit 1
 fi
 
+# Other commands (--export, --refresh, --replay) run the scraper directly
+case "$1" in
+    --*) exec python wikipedia_scraper_bash.py "$@" ;;
+esac
+
 # Assign the first argument to URL variable
 URL=$1
 
 # Check if the second argument is provided (proxy_url)
 if [ $# -ge 2 ]; then
     PROXY_URL=$2
-    python wikipedia_scraper_bash.py "$URL" "$PROXY_URL"
-else
-    python wikipedia_scraper_bash.py "$URL"
 fi
+
+# SCRAPER_WORKER=0 runs a new scraper process for this URL instead of using the worker
+if [ "${SCRAPER_WORKER:-1}" = "0" ]; then
+    exec python wikipedia_scraper_bash.py "$URL" ${PROXY_URL:+"$PROXY_URL"}
+fi
+
+# Send the URL (or, with "-", every line of stdin) to the warm scraper worker. The worker is
+# started in the background if it is not running and exits after SCRAPER_WORKER_IDLE idle seconds.
+# The client only needs the standard library, so it skips site-packages (-S) to start faster
+if [ "$URL" = "-" ]; then
+    exec python -S scraper_worker.py --send --start --idle-timeout "${SCRAPER_WORKER_IDLE:-300}"
+fi
+exec python -S scraper_worker.py --send --start --idle-timeout "${SCRAPER_WORKER_IDLE:-300}" "$URL" ${PROXY_URL:+"$PROXY_URL"}
@@ -0,0 +1,331 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import contextlib  # Import modul contextlib untuk mengarahkan output scraper ke klien
+import fcntl  # Import modul fcntl untuk lock saat membuat dan menghapus socket
+import os  # Import modul os untuk path socket, FIFO, dan umask
+import signal  # Import modul signal untuk berhenti dengan rapi saat SIGTERM
+import socket  # Import modul socket untuk Unix socket
+import subprocess  # Import modul subprocess untuk menjalankan worker di background
+import sys  # Import modul sys untuk stdin, stdout, dan interpreter Python
+import threading  # Import modul threading untuk mengirim permintaan sambil membaca hasil
+import time  # Import modul time untuk menunggu worker siap
+
+# Modul scraper (requests, lxml, SQLite) baru diimpor saat worker dibuat, bukan di sini, sehingga
+# klien (--send) start secepat interpreter Python biasa
+
+# Path Unix socket worker (bisa diganti dengan variabel lingkungan SCRAPER_WORKER_SOCKET)
+DEFAULT_SOCKET_PATH = os.environ.get('SCRAPER_WORKER_SOCKET', 'scraper_worker.sock')
+
+# File log worker yang dijalankan di background oleh klien (--start)
+DEFAULT_LOG_PATH = 'scraper_worker.log'
+
+# Worker berhenti sendiri setelah sekian detik tanpa permintaan (0 berarti tidak pernah)
+DEFAULT_IDLE_TIMEOUT = 0
+
+# Lama klien menunggu worker siap (detik); worker baru perlu waktu untuk impor modul scraper
+DEFAULT_CONNECT_WAIT = 15
+CONNECT_RETRY_INTERVAL = 0.05
+
+# Jumlah koneksi klien yang boleh menunggu; permintaan dikerjakan berurutan oleh satu worker
+LISTEN_BACKLOG = 64
+
+
+def parse_request(line):
+    """
+    Membaca satu baris permintaan: '<url> [proxy_url]', sama dengan argumen run_scraper.sh.
+
+    Returns:
+    - tuple or None: (url, proxies), None untuk baris kosong atau komentar (#).
+    """
+    fields = line.split()
+    if not fields or fields[0].startswith('#'):
+        return None
+    proxy_url = fields[1] if len(fields) > 1 else None
+    return fields[0], {"http": proxy_url, "https": proxy_url} if proxy_url else None
+
+
+class ScraperWorker:
+    """
+    Scraper yang tetap hidup untuk banyak URL: modul scraper diimpor sekali, koneksi database
+    (indeks URL) dan cache HTML tetap terbuka, dan pool koneksi HTTP per proxy (http_client)
+    dipakai ulang antar permintaan. Setiap URL diproses dengan scrape_url yang sama dengan
+    wikipedia_scraper_bash.py, sehingga hasil dan pesannya identik.
+
+    Metode:
+    - handle: Memproses satu baris permintaan.
+    - handle_lines: Memproses semua baris dari sebuah stream.
+    - close: Menutup database dan cache.
+
+    Atribut:
+    - counts: Jumlah URL per hasil ('scraped', 'exists', 'failed').
+    """
+
+    def __init__(self):
+        import html_cache
+        import storage
+        import wikipedia_scraper_bash
+        self.scraper = wikipedia_scraper_bash
+        self.store = storage.PageStore()
+        cache_dir = wikipedia_scraper_bash.CACHE_DIR
+        self.cache = html_cache.HTMLCache(cache_dir) if cache_dir else None
+        self.counts = {'scraped': 0, 'exists': 0, 'failed': 0}
+
+    def handle(self, line, output):
+        """
+        Memproses satu baris permintaan dan menulis pesan scraper ke output.
+
+        Returns:
+        - str or None: Hasil scrape_url, None jika baris tidak berisi URL.
+        """
+        request = parse_request(line)
+        if request is None:
+            return None
+        url, proxies = request
+        with contextlib.redirect_stdout(output):
+            try:
+                result = self.scraper.scrape_url(self.store, url, proxies, self.cache)
+            except Exception as e:
+                print(f"Gagal melakukan scraping data dari {url}: {e!r}")
+                result = 'failed'
+        self.counts[result] += 1
+        return result
+
+    def handle_lines(self, lines, output):
+        for line in lines:
+            self.handle(line, output)
+            output.flush()
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+        self.store.close()
+
+
+@contextlib.contextmanager
+def socket_lock(path):
+    """
+    Lock eksklusif (file <path>.lock) selama socket diperiksa, dibuat, atau dihapus, agar dua
+    worker yang start bersamaan tidak saling menghapus socket.
+    """
+    with open(path + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def bind_socket(path):
+    """
+    Membuat Unix socket worker. Socket lama yang tidak dilayani lagi (worker mati) dihapus.
+
+    Returns:
+    - socket.socket: Socket yang sudah listen.
+
+    Raises:
+    - FileExistsError: Jika worker lain sedang melayani socket tersebut.
+    """
+    with socket_lock(path):
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise FileExistsError(f"Worker lain sudah berjalan di {path}")
+            finally:
+                probe.close()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Socket hanya bisa dipakai oleh pemilik proses
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(old_umask)
+        server.listen(LISTEN_BACKLOG)
+    return server
+
+
+def serve_socket(worker, server, path, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Melayani klien di Unix socket satu per satu: setiap koneksi mengirim baris permintaan dan
+    menerima pesan scraper secara streaming sampai semua barisnya selesai.
+
+    Args:
+    - worker (ScraperWorker): Worker yang memproses permintaan.
+    - server (socket.socket): Socket dari bind_socket.
+    - path (str): Path socket, dihapus saat worker berhenti.
+    - idle_timeout (float): Detik tanpa koneksi sebelum worker berhenti (0 berarti tidak pernah).
+    """
+    server.settimeout(idle_timeout or None)
+    try:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                print(f"Tidak ada permintaan selama {idle_timeout} detik, worker berhenti")
+                return
+            with connection:
+                connection.settimeout(None)
+                reader = connection.makefile('r', encoding='utf-8')
+                writer = connection.makefile('w', encoding='utf-8', buffering=1)
+                try:
+                    worker.handle_lines(reader, writer)
+                except OSError as e:
+                    # Klien terputus sebelum semua pesannya terkirim
+                    print(f"Koneksi klien terputus: {e!r}")
+                finally:
+                    reader.close()
+                    with contextlib.suppress(OSError):
+                        writer.close()
+    finally:
+        with socket_lock(path):
+            server.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+def serve_fifo(worker, path):
+    """
+    Membaca baris permintaan dari named pipe (FIFO) tanpa henti; setelah semua penulis menutup
+    FIFO, FIFO dibuka ulang dan worker menunggu penulis berikutnya. Pesan scraper ditulis ke stdout.
+    """
+    created = not os.path.exists(path)
+    if created:
+        os.mkfifo(path, 0o600)
+    try:
+        while True:
+            with open(path, 'r', encoding='utf-8') as fifo:
+                worker.handle_lines(fifo, sys.stdout)
+    finally:
+        if created:
+            os.unlink(path)
+
+
+def connect(path, wait=DEFAULT_CONNECT_WAIT, start=False, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Menghubungkan klien ke worker, menunggu sampai wait detik selama socket belum siap.
+
+    Args:
+    - path (str): Path socket worker.
+    - wait (float): Lama menunggu worker (detik).
+    - start (bool): Jalankan worker di background (log ke DEFAULT_LOG_PATH) jika belum berjalan.
+    - idle_timeout (float): Batas waktu idle untuk worker yang dijalankan klien.
+
+    Returns:
+    - socket.socket or None: Koneksi ke worker, None jika worker tidak bisa dihubungi.
+    """
+    deadline = time.monotonic() + wait
+    started = False
+    while True:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(path)
+            return client
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+        if start and not started:
+            start_worker(path, idle_timeout)
+            started = True
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(CONNECT_RETRY_INTERVAL)
+
+
+def start_worker(path, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Menjalankan worker socket di background (sesi baru, tetap hidup setelah klien selesai).
+    """
+    with open(DEFAULT_LOG_PATH, 'a') as log:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), '--socket', path,
+                          '--idle-timeout', str(idle_timeout)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def send(client, lines, output):
+    """
+    Mengirim baris permintaan ke worker dan menyalin pesan scraper ke output sampai worker
+    selesai. Pengiriman berjalan di thread terpisah agar batch besar tidak macet menunggu
+    pesan yang belum dibaca.
+    """
+    def write_requests():
+        with contextlib.suppress(OSError):
+            for line in lines:
+                client.sendall(line.encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+
+    sender = threading.Thread(target=write_requests, daemon=True)
+    sender.start()
+    with client.makefile('r', encoding='utf-8') as reader:
+        for message in reader:
+            output.write(message)
+            output.flush()
+    sender.join()
+
+
+def main():
+    """
+    Fungsi utama: menjalankan worker (Unix socket, --stdin, atau --fifo) atau, dengan --send,
+    menjadi klien yang mengirim URL ke worker yang sedang berjalan.
+    """
+    parser = argparse.ArgumentParser(description='Worker scraper Wikipedia yang tetap hidup untuk banyak URL')
+    parser.add_argument('request', nargs='*', help='Dengan --send: URL [proxy_url]; tanpa argumen, baris dibaca dari stdin')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help='Path Unix socket worker')
+    parser.add_argument('--stdin', action='store_true', help='Worker membaca baris permintaan dari stdin')
+    parser.add_argument('--fifo', help='Worker membaca baris permintaan dari named pipe ini (dibuat jika belum ada)')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='Worker socket berhenti setelah sekian detik tanpa permintaan (0: tidak pernah)')
+    parser.add_argument('--send', action='store_true', help='Klien: kirim permintaan ke worker di --socket')
+    parser.add_argument('--start', action='store_true',
+                        help=f'Dengan --send: jalankan worker di background jika belum berjalan (log: {DEFAULT_LOG_PATH})')
+    parser.add_argument('--wait', type=float, default=DEFAULT_CONNECT_WAIT, help='Dengan --send: lama menunggu worker (detik)')
+    args = parser.parse_args()
+    if args.request and not args.send:
+        parser.error('URL hanya bisa diberikan dengan --send')
+    if len(args.request) > 2:
+        parser.error('Dengan --send: URL [proxy_url]')
+
+    if args.send:
+        client = connect(args.socket, args.wait, args.start, args.idle_timeout)
+        if client is None:
+            print(f"Worker tidak bisa dihubungi di {args.socket}", file=sys.stderr)
+            sys.exit(1)
+        lines = [' '.join(args.request) + '\n'] if args.request else sys.stdin
+        with client:
+            send(client, lines, sys.stdout)
+        return
+
+    server = None
+    if not args.stdin and not args.fifo:
+        # Socket dibuat sebelum modul scraper diimpor sehingga klien bisa langsung terhubung dan menunggu
+        try:
+            server = bind_socket(args.socket)
+        except FileExistsError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
+    # SIGTERM menghentikan worker dengan rapi (database ditutup, socket dihapus)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    worker = None
+    try:
+        worker = ScraperWorker()
+        if args.stdin:
+            worker.handle_lines(sys.stdin, sys.stdout)
+        elif args.fifo:
+            print(f"Worker membaca permintaan dari {args.fifo}", flush=True)
+            serve_fifo(worker, args.fifo)
+        else:
+            print(f"Worker siap di {args.socket} (pid {os.getpid()})", flush=True)
+            serve_socket(worker, server, args.socket, args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if worker is not None:
+            worker.close()
+            counts = worker.counts
+            print(f"Selesai: {counts['scraped']} di-scrape, {counts['exists']} sudah ada, {counts['failed']} gagal",
+                  file=sys.stderr if args.stdin or args.fifo else sys.stdout)
+        elif server is not None:
+            server.close()
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import hashlib  # Import modul hashlib untuk hash isi halaman
+import json  # Import modul json untuk kategori dan ekspor JSON
+import os  # Import modul os untuk path, fsync, dan rename atomik
+import re  # Import modul re untuk membuang blok script sebelum hashing
+import sqlite3  # Import modul sqlite3 sebagai penyimpanan berindeks
+import time  # Import modul time untuk waktu scraping
+
+# File database dan file JSON default
+DEFAULT_DB_PATH = 'scraped_data.db'
+DEFAULT_JSON_PATH = 'scraped_data.json'
+
+# Batas waktu (detik) menunggu lock database jika beberapa scraper berjalan bersamaan
+LOCK_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    content TEXT,
+    created_at TEXT,
+    categories TEXT,
+    scraped_at REAL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    checked_at REAL
+)
+"""
+
+# Kolom yang ditambahkan setelah versi pertama tabel (dibuat dengan ALTER TABLE pada database lama)
+ADDED_COLUMNS = {'etag': 'TEXT', 'last_modified': 'TEXT', 'content_hash': 'TEXT', 'checked_at': 'REAL'}
+
+# Blok <script> berisi ID permintaan dan waktu respons yang berubah di setiap permintaan
+SCRIPT_PATTERN = re.compile(rb'<script\b[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+
+
+class PageStore:
+    """
+    Penyimpanan hasil scraping di SQLite dengan indeks unik pada URL.
+
+    Pemeriksaan "sudah pernah di-scrape" memakai indeks (tanpa memuat semua data), dan setiap
+    halaman ditambahkan dengan satu INSERT dalam transaksi sehingga penulisan bersifat
+    append-only dan atomik (tidak ada lagi penulisan ulang seluruh file JSON). Array JSON
+    dengan format lama bisa dibuat kapan saja dengan export_json.
+
+    Saat database baru dibuat dan file JSON lama sudah ada, isinya diimpor terlebih dahulu.
+
+    Untuk refresh inkremental, setiap halaman juga menyimpan validator HTTP (ETag dan
+    Last-Modified) serta hash isi halaman dari pengambilan terakhir.
+
+    Metode:
+    - contains: Memeriksa apakah URL sudah tersimpan.
+    - get: Mengambil data satu URL.
+    - add: Menambahkan data halaman baru.
+    - update: Mengganti data halaman yang isinya berubah.
+    - validators: Mengambil ETag, Last-Modified, dan hash isi terakhir sebuah URL.
+    - mark_checked: Mencatat bahwa halaman sudah diperiksa dan tidak berubah.
+    - urls: Iterasi semua URL yang tersimpan.
+    - pages: Iterasi semua data sesuai urutan penambahan.
+    - export_json: Menulis semua data sebagai array JSON.
+    - close: Menutup koneksi database.
+
+    Atribut:
+    - path: Path file database.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, import_json=DEFAULT_JSON_PATH):
+        self.path = path
+        is_new = not os.path.exists(path)
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        with self.connection:
+            self.connection.execute(SCHEMA)
+            columns = {row[1] for row in self.connection.execute('PRAGMA table_info(pages)')}
+            for name, kind in ADDED_COLUMNS.items():
+                if name not in columns:
+                    self.connection.execute(f'ALTER TABLE pages ADD COLUMN {name} {kind}')
+        if is_new and import_json and os.path.exists(import_json):
+            with open(import_json, 'r', encoding='utf-8') as f:
+                self.add_many(json.load(f))
+
+    def contains(self, url):
+        """
+        Memeriksa apakah URL sudah tersimpan.
+        """
+        return self.connection.execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone() is not None
+
+    def get(self, url):
+        """
+        Mengambil data satu URL.
+
+        Returns:
+        - dict or None: Data halaman, atau None jika URL belum tersimpan.
+        """
+        row = self.connection.execute(
+            'SELECT title, url, content, created_at, categories FROM pages WHERE url = ?', (url,)).fetchone()
+        return row_to_page(row) if row else None
+
+    def add(self, data, validators=(None, None, None)):
+        """
+        Menambahkan data halaman baru (URL yang sudah ada diabaikan).
+
+        Args:
+        - data (dict): Data halaman dengan kunci title, url, content, createdAt, categories.
+        - validators (tuple, optional): (etag, last_modified, content_hash) dari respons.
+
+        Returns:
+        - bool: True jika data ditambahkan, False jika URL sudah ada.
+        """
+        return self.add_many([data], validators) == 1
+
+    def add_many(self, items, validators=(None, None, None)):
+        """
+        Menambahkan banyak data halaman dalam satu transaksi.
+
+        Returns:
+        - int: Jumlah data yang benar-benar ditambahkan.
+        """
+        now = time.time()
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO pages (url, title, content, created_at, categories, scraped_at, '
+                'etag, last_modified, content_hash, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((item['url'], item['title'], item['content'], item['createdAt'],
+                  json.dumps(item['categories'], ensure_ascii=False), now, *validators, now) for item in items))
+            return self.connection.total_changes - before
+
+    def update(self, data, validators):
+        """
+        Mengganti data halaman yang isinya berubah (posisi halaman pada ekspor tetap).
+
+        Args:
+        - data (dict): Data halaman baru.
+        - validators (tuple): (etag, last_modified, content_hash) dari respons.
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                'UPDATE pages SET title = ?, content = ?, created_at = ?, categories = ?, scraped_at = ?, '
+                'etag = ?, last_modified = ?, content_hash = ?, checked_at = ? WHERE url = ?',
+                (data['title'], data['content'], data['createdAt'], json.dumps(data['categories'], ensure_ascii=False),
+                 now, *validators, now, data['url']))
+
+    def validators(self, url):
+        """
+        Mengambil validator dari pengambilan terakhir sebuah URL.
+
+        Returns:
+        - tuple: (etag, last_modified, content_hash), masing-masing bisa None.
+        """
+        row = self.connection.execute(
+            'SELECT etag, last_modified, content_hash FROM pages WHERE url = ?', (url,)).fetchone()
+        return row or (None, None, None)
+
+    def mark_checked(self, url, validators=None):
+        """
+        Mencatat bahwa halaman sudah diperiksa dan isinya tidak berubah, sekaligus memperbarui
+        validator jika server mengirim yang baru.
+        """
+        with self.connection:
+            if validators is None:
+                self.connection.execute('UPDATE pages SET checked_at = ? WHERE url = ?', (time.time(), url))
+            else:
+                self.connection.execute(
+                    'UPDATE pages SET etag = ?, last_modified = ?, content_hash = ?, checked_at = ? WHERE url = ?',
+                    (*validators, time.time(), url))
+
+    def urls(self):
+        """
+        Mengembalikan list semua URL yang tersimpan sesuai urutan penambahan.
+        """
+        return [row[0] for row in self.connection.execute('SELECT url FROM pages ORDER BY id')]
+
+    def pages(self):
+        """
+        Iterasi semua data halaman sesuai urutan penambahan.
+        """
+        cursor = self.connection.execute('SELECT title, url, content, created_at, categories FROM pages ORDER BY id')
+        for row in cursor:
+            yield row_to_page(row)
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def export_json(self, path=DEFAULT_JSON_PATH):
+        """
+        Menulis semua data sebagai array JSON dengan format yang sama seperti scraped_data.json
+        lama (indent=4). File ditulis ke file sementara, di-fsync, lalu di-rename secara atomik
+        sehingga pembaca tidak pernah melihat file setengah jadi. Data ditulis per halaman
+        tanpa memuat semuanya ke memori.
+
+        Args:
+        - path (str): Path file JSON tujuan.
+
+        Returns:
+        - int: Jumlah halaman yang diekspor.
+        """
+        temp_path = f'{path}.tmp'
+        count = 0
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for page in self.pages():
+                item = json.dumps(page, ensure_ascii=False, indent=4)
+                f.write(',\n' if count else '[\n')
+                f.write('\n'.join('    ' + line for line in item.split('\n')))
+                count += 1
+            f.write('\n]' if count else '[]')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return count
+
+    def close(self):
+        """
+        Menutup koneksi database.
+        """
+        self.connection.close()
+
+
+def content_hash(body):
+    """
+    Menghitung hash SHA-256 isi halaman tanpa blok <script>, sehingga perubahan yang hanya
+    berupa ID permintaan atau waktu respons tidak dianggap sebagai perubahan isi.
+
+    Args:
+    - body (bytes): Body respons.
+
+    Returns:
+    - str: Hash dalam bentuk heksadesimal.
+    """
+    return hashlib.sha256(SCRIPT_PATTERN.sub(b'', body)).hexdigest()
+
+
+def row_to_page(row):
+    """
+    Mengubah baris tabel pages menjadi dictionary dengan format scraped_data.json.
+    """
+    title, url, content, created_at, categories = row
+    return {
+        'title': title,
+        'url': url,
+        'content': content,
+        'createdAt': created_at,
+        'categories': json.loads(categories)
+    }
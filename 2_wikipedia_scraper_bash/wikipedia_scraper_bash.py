@@ -1,9 +1,25 @@
 import os
-import json
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 
+import http_client
+import fast_extract
+import storage
+import html_cache
+
+# Nilai default jika judul atau tanggal modifikasi terakhir tidak ditemukan
+TITLE_NOT_FOUND = "Title not found"
+DATE_NOT_FOUND = "Date not found."
+
+# Engine ekstraksi: 'bs4' (BeautifulSoup, empat kali pencarian pada pohon) atau engine satu
+# lintasan dari fast_extract: 'sax' (default, hasilnya identik dengan bs4) atau 'lxml' (lebih cepat,
+# tetapi content bisa berbeda dari bs4 pada HTML yang rusak; lihat fast_extract.DEFAULT_ENGINE)
+ENGINE_CHOICES = ['bs4'] + list(fast_extract.ENGINES)
+DEFAULT_ENGINE = fast_extract.DEFAULT_ENGINE
+
+# Folder cache HTML mentah (terkompresi); jika variabel lingkungan HTML_CACHE_DIR diisi, body setiap
+# halaman yang diambil disimpan di sana sehingga ekstraksi bisa dijalankan ulang dengan --replay
+CACHE_DIR = os.environ.get('HTML_CACHE_DIR')
+
 def get_page_content(url, proxies=None):
     """
     Mengambil konten halaman web dari URL yang diberikan.
@@ -16,12 +32,198 @@ def get_page_content(url, proxies=None):
     - dict or None: Data halaman web yang telah diambil, termasuk judul, URL, konten, tanggal modifikasi terakhir, dan kategori. Mengembalikan None jika permintaan gagal atau konten tidak dapat diambil.
     """
     # Mengirim permintaan GET ke URL dengan menggunakan proxy jika disediakan
-    response = requests.get(url, proxies=proxies)
+    response = fetch_page(url, proxies)
     
     # Memeriksa jika permintaan berhasil (status code 200)
     if response.status_code == 200:
+        return parse_page(response.text, url)
+    else:
+        # Menampilkan pesan jika permintaan tidak berhasil
+        print(f"Gagal mengambil halaman: {response.status_code} - {response.reason}")
+        return None
+
+def fetch_page(url, proxies=None, etag=None, last_modified=None):
+    """
+    Mengirim permintaan GET lewat klien HTTP bersama (koneksi persisten, timeout, kompresi
+    gzip/brotli, HTTP/2 jika tersedia). Jika etag atau last_modified diberikan, permintaan
+    dikirim bersyarat (If-None-Match/If-Modified-Since) sehingga server bisa menjawab 304.
+
+    Args:
+    - url (str): URL halaman web.
+    - proxies (dict, optional): Dictionary yang berisi proxy untuk permintaan HTTP dan HTTPS.
+    - etag (str, optional): ETag dari pengambilan sebelumnya.
+    - last_modified (str, optional): Header Last-Modified dari pengambilan sebelumnya.
+
+    Returns:
+    - http_client.Response: Respons HTTP.
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return http_client.get_client(http_client.proxy_from_dict(proxies)).get(url, headers=headers or None)
+
+def response_validators(response):
+    """
+    Mengambil validator dari respons 200: (ETag, Last-Modified, hash isi halaman).
+    """
+    return (response.headers.get('ETag'), response.headers.get('Last-Modified'),
+            storage.content_hash(response.content))
+
+def cache_response(cache, url, response):
+    """
+    Menyimpan body respons 200 ke cache HTML jika cache aktif.
+    """
+    if cache is not None:
+        cache.put(url, response.content, html_cache.encoding_from_headers(response.headers))
+
+def scrape_new_page(store, url, proxies=None, cache=None):
+    """
+    Mengambil, mengekstrak, dan menyimpan halaman yang belum pernah di-scrape, beserta
+    validatornya untuk refresh berikutnya. Jika cache diberikan, body mentahnya juga disimpan.
+
+    Returns:
+    - bool: True jika halaman berhasil disimpan.
+    """
+    response = fetch_page(url, proxies)
+    if response.status_code != 200:
+        print(f"Gagal mengambil halaman: {response.status_code} - {response.reason}")
+        return False
+    cache_response(cache, url, response)
+    store.add(parse_page(response.text, url), response_validators(response))
+    return True
+
+def scrape_url(store, url, proxies=None, cache=None):
+    """
+    Men-scrape satu URL dari baris perintah atau dari scraper_worker.py: URL yang sudah
+    tersimpan dilewati, selain itu halaman diambil, diekstrak, dan disimpan.
+
+    Args:
+    - store (storage.PageStore): Penyimpanan hasil scraping.
+    - url (str): URL halaman.
+    - proxies (dict, optional): Dictionary proxy.
+    - cache (html_cache.HTMLCache, optional): Cache tempat body HTML disimpan.
+
+    Returns:
+    - str: 'exists' (sudah pernah di-scrape), 'scraped', atau 'failed'.
+    """
+    # Periksa apakah URL sudah pernah di-scrape sebelumnya (lewat indeks URL)
+    if store.contains(url):
+        print(f"URL '{url}' sudah pernah di-scrape.")
+        return 'exists'
+    
+    # Lakukan scraping jika URL belum pernah di-scrape sebelumnya
+    print(f"Melakukan scraping data dari: {url}")
+    # Ambil dan ekstrak halaman, lalu tambahkan ke penyimpanan (satu INSERT atomik) beserta
+    # ETag, Last-Modified, dan hash isinya untuk refresh berikutnya
+    if scrape_new_page(store, url, proxies, cache):
+        print(f"Scraping berhasil untuk {url}")
+        return 'scraped'
+    print(f"Gagal melakukan scraping data dari {url}")
+    return 'failed'
+
+def refresh_page(store, url, proxies=None, cache=None):
+    """
+    Memeriksa ulang halaman yang sudah tersimpan dengan permintaan bersyarat. Ekstraksi hanya
+    dijalankan ulang jika isi halaman benar-benar berubah.
+
+    Args:
+    - store (storage.PageStore): Penyimpanan hasil scraping.
+    - url (str): URL halaman.
+    - proxies (dict, optional): Dictionary proxy.
+    - cache (html_cache.HTMLCache, optional): Cache tempat body baru disimpan.
+
+    Returns:
+    - str: 'not_modified' (server menjawab 304), 'unchanged' (hash isi sama), 'updated', atau 'failed'.
+    """
+    etag, last_modified, old_hash = store.validators(url)
+    response = fetch_page(url, proxies, etag, last_modified)
+    
+    # Server menyatakan halaman tidak berubah: tidak ada body yang diunduh atau diekstrak
+    if response.status_code == 304:
+        store.mark_checked(url)
+        return 'not_modified'
+    if response.status_code != 200:
+        print(f"Gagal mengambil halaman: {response.status_code} - {response.reason} ({url})")
+        return 'failed'
+    
+    # Server tidak mendukung permintaan bersyarat atau validator berubah: bandingkan hash isi
+    cache_response(cache, url, response)
+    validators = response_validators(response)
+    if validators[2] == old_hash:
+        store.mark_checked(url, validators)
+        return 'unchanged'
+    store.update(parse_page(response.text, url), validators)
+    return 'updated'
+
+def refresh_all(store, proxies=None, cache=None):
+    """
+    Memeriksa ulang semua halaman yang tersimpan dan mencetak ringkasannya.
+    """
+    counts = {'not_modified': 0, 'unchanged': 0, 'updated': 0, 'failed': 0}
+    urls = store.urls()
+    print(f"Memeriksa ulang {len(urls)} halaman...")
+    for url in urls:
+        try:
+            result = refresh_page(store, url, proxies, cache)
+        except Exception as e:
+            print(f"Gagal memeriksa ulang {url}: {e!r}")
+            result = 'failed'
+        counts[result] += 1
+        if result == 'updated':
+            print(f"Diperbarui: {url}")
+    print(f"Selesai: {counts['not_modified']} tidak berubah (304), {counts['unchanged']} isi sama, "
+          f"{counts['updated']} diperbarui, {counts['failed']} gagal")
+    return counts
+
+def replay_all(store, cache, workers=None):
+    """
+    Menjalankan ulang ekstraksi untuk semua halaman di cache HTML tanpa jaringan (misalnya
+    setelah fungsi extract_* diubah) dan menyimpan hasilnya. Validator halaman tidak diubah
+    karena body yang diekstrak sama dengan body dari pengambilan terakhir.
+
+    Args:
+    - store (storage.PageStore): Penyimpanan hasil scraping.
+    - cache (html_cache.HTMLCache): Cache sumber.
+    - workers (int, optional): Jumlah proses ekstraksi (default: jumlah core).
+
+    Returns:
+    - dict: Jumlah halaman 'updated', 'added', dan 'failed'.
+    """
+    counts = {'updated': 0, 'added': 0, 'failed': 0}
+    print(f"Mengekstrak ulang {len(cache)} halaman dari cache {cache.directory}...")
+    for url, data, error in html_cache.replay(cache, parse_page, workers):
+        if data is None:
+            print(f"Gagal mengekstrak ulang {url}: {error}")
+            counts['failed'] += 1
+        elif store.contains(url):
+            store.update(data, store.validators(url))
+            counts['updated'] += 1
+        else:
+            store.add(data)
+            counts['added'] += 1
+    print(f"Selesai: {counts['updated']} diperbarui, {counts['added']} ditambahkan, {counts['failed']} gagal")
+    return counts
+
+def parse_page(html, url, engine=DEFAULT_ENGINE):
+    """
+    Mengekstrak data halaman Wikipedia dari teks HTML.
+
+    Args:
+    - html (str): Teks HTML halaman.
+    - url (str): URL halaman tersebut.
+    - engine (str): Engine ekstraksi, salah satu dari ENGINE_CHOICES (default: DEFAULT_ENGINE).
+
+    Returns:
+    - dict: Data halaman web, termasuk judul, URL, konten, tanggal modifikasi terakhir, dan kategori.
+    """
+    if engine == 'bs4':
+        # BeautifulSoup baru diimpor di sini karena engine default tidak memakainya (mempercepat start)
+        from bs4 import BeautifulSoup
+        
         # Menginisialisasi objek BeautifulSoup untuk parsing HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser')
         
         # Mengekstrak judul halaman
         title = extract_title(soup)
@@ -34,21 +236,27 @@ def get_page_content(url, proxies=None):
         
         # Mengekstrak kategori-kategori dari halaman
         categories = extract_categories(soup)
-        
-        # Menyusun data dalam bentuk dictionary
-        data = {
-            'title': title,
-            'url': url,
-            'content': content,
-            'createdAt': last_mod_date,
-            'categories': categories
-        }
-        
-        return data
     else:
-        # Menampilkan pesan jika permintaan tidak berhasil
-        print(f"Gagal mengambil halaman: {response.status_code} - {response.reason}")
-        return None
+        # Judul, paragraf, tanggal, dan kategori dikumpulkan dalam satu lintasan
+        fields = fast_extract.extract(html, engine)
+        title = fields.title.strip() if fields.title is not None else TITLE_NOT_FOUND
+        content = ' '.join([p.replace("\n", " ") for p in fields.paragraphs])
+        if fields.last_modified is not None:
+            last_mod_date = parse_last_modified(fields.last_modified)
+        else:
+            last_mod_date = DATE_NOT_FOUND
+        categories = fields.categories
+    
+    # Menyusun data dalam bentuk dictionary
+    data = {
+        'title': title,
+        'url': url,
+        'content': content,
+        'createdAt': last_mod_date,
+        'categories': categories
+    }
+    
+    return data
 
 def extract_title(soup):
     """
@@ -67,7 +275,7 @@ def extract_title(soup):
     if title_span:
         title = title_span.text.strip()
     else:
-        title = "Title not found"
+        title = TITLE_NOT_FOUND
     return title
 
 def extract_content(soup):
@@ -102,29 +310,42 @@ def extract_last_modified_date(soup):
     
     # Mengambil tanggal modifikasi jika ditemukan
     if last_mod_tag:
-        # Mengambil teks informasi modifikasi terakhir
-        last_mod_str = last_mod_tag.get_text(strip=True).replace('This page was last edited on ', '')
-        
-        # Memisahkan tanggal dan waktu dari informasi yang diambil
-        date_str = last_mod_str.split(',')[0]
-        time_str = last_mod_str.split(',')[1].split('(')[0].strip()
-        
-        # Mengambil zona waktu jika tersedia, jika tidak, menggunakan default UTC
-        timezone_str = last_mod_str.split('(')[1].split(')')[0] if '(' in last_mod_str else 'UTC'
-        
-        # Menggabungkan informasi dalam format lengkap
-        full_date_str = f"{date_str}, {time_str} ({timezone_str})"
-        
-        # Mengubah format string ke objek datetime
-        last_mod_datetime = datetime.strptime(full_date_str, '%d %B %Y, at %H:%M (%Z)')
-        
-        # Mengubah format datetime ke ISO 8601 dan mengembalikan sebagai string
-        last_mod_date = last_mod_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
+        last_mod_date = parse_last_modified(last_mod_tag.get_text(strip=True))
     else:
         # Mengembalikan string default jika informasi tanggal tidak ditemukan
-        last_mod_date = "Date not found."
+        last_mod_date = DATE_NOT_FOUND
     return last_mod_date
 
+def parse_last_modified(text):
+    """
+    Mengubah teks footer-info-lastmod (misalnya 'This page was last edited on 5 March 2024, at 12:34 (UTC).')
+    menjadi tanggal ISO 8601.
+
+    Args:
+    - text (str): Teks informasi modifikasi terakhir.
+
+    Returns:
+    - str: Tanggal modifikasi terakhir dalam format 'YYYY-MM-DDTHH:MM:SSZ'.
+    """
+    # Mengambil teks informasi modifikasi terakhir
+    last_mod_str = text.replace('This page was last edited on ', '')
+    
+    # Memisahkan tanggal dan waktu dari informasi yang diambil
+    date_str = last_mod_str.split(',')[0]
+    time_str = last_mod_str.split(',')[1].split('(')[0].strip()
+    
+    # Mengambil zona waktu jika tersedia, jika tidak, menggunakan default UTC
+    timezone_str = last_mod_str.split('(')[1].split(')')[0] if '(' in last_mod_str else 'UTC'
+    
+    # Menggabungkan informasi dalam format lengkap
+    full_date_str = f"{date_str}, {time_str} ({timezone_str})"
+    
+    # Mengubah format string ke objek datetime
+    last_mod_datetime = datetime.strptime(full_date_str, '%d %B %Y, at %H:%M (%Z)')
+    
+    # Mengubah format datetime ke ISO 8601 dan mengembalikan sebagai string
+    return last_mod_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
+
 def extract_categories(soup):
     """
     Ekstrak kategori-kategori dari halaman web menggunakan objek BeautifulSoup.
@@ -153,55 +374,70 @@ def main():
     Fungsi utama untuk menjalankan proses scraping data dari halaman web.
 
     Menggunakan argumen dari baris perintah untuk URL dan opsional proxy_url.
-    Menyimpan data yang telah di-scrape ke dalam file 'scraped_data.json'.
+    Menyimpan data yang telah di-scrape ke dalam database 'scraped_data.db' (lihat storage.py).
+    Dengan argumen '--export [opsional: file_json]', semua data ditulis ke 'scraped_data.json'.
+    Dengan argumen '--refresh [opsional: proxy_url]', semua halaman yang tersimpan diperiksa ulang
+    dengan permintaan bersyarat dan hanya yang berubah yang diekstrak ulang.
+    Jika HTML_CACHE_DIR diisi, body HTML mentah setiap halaman disimpan di cache terkompresi, dan
+    dengan argumen '--replay [opsional: jumlah_proses]' semua halaman di cache diekstrak ulang tanpa jaringan.
     """
     import sys
     # Memeriksa jumlah argumen yang diberikan dari baris perintah
     if len(sys.argv) < 2:
         print("Penggunaan: python scraper.py [url] [opsional: proxy_url]")
+        print("            python scraper.py --export [opsional: file_json]")
+        print("            python scraper.py --refresh [opsional: proxy_url]")
+        print("            python scraper.py --replay [opsional: jumlah_proses]")
         return
     
-    # Mengambil URL dari argumen baris perintah
-    url = sys.argv[1]
-    
-    # Mengambil proxy_url jika disediakan sebagai argumen kedua
-    proxy_url = sys.argv[2] if len(sys.argv) > 2 else None
-    
-    # Menyiapkan dictionary proxies untuk digunakan jika proxy_url disediakan
-    proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else None
-    
-    # Muat data yang sudah ada jika tersedia dalam file 'scraped_data.json'
-    if os.path.exists('scraped_data.json'):
-        with open('scraped_data.json', 'r', encoding='utf-8') as f:
-            existing_data = json.load(f)
-    else:
-        existing_data = []
-    
-    # Periksa apakah URL sudah pernah di-scrape sebelumnya
-    url_found = False
-    for item in existing_data:
-        if item['url'] == url:
-            print(f"URL '{url}' sudah pernah di-scrape.")
-            url_found = True
-            break
+    # Mengekstrak ulang semua halaman dari cache HTML tanpa jaringan
+    if sys.argv[1] == '--replay':
+        cache_dir = CACHE_DIR or html_cache.DEFAULT_CACHE_DIR
+        if not os.path.isdir(cache_dir):
+            print(f"Folder cache {cache_dir} tidak ditemukan (isi HTML_CACHE_DIR saat scraping)")
+            return
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        store = storage.PageStore()
+        cache = html_cache.HTMLCache(cache_dir)
+        try:
+            replay_all(store, cache, workers)
+        finally:
+            cache.close()
+            store.close()
+        return
     
-    # Lakukan scraping jika URL belum pernah di-scrape sebelumnya
-    if not url_found:
-        print(f"Melakukan scraping data dari: {url}")
-        # Panggil fungsi get_page_content untuk mengambil data halaman web
-        page_data = get_page_content(url, proxies)
+    # Membuka penyimpanan; data lama di 'scraped_data.json' diimpor saat database pertama kali dibuat
+    store = storage.PageStore()
+    cache = html_cache.HTMLCache(CACHE_DIR) if CACHE_DIR else None
+    try:
+        # Mengekspor semua data sebagai array JSON untuk pembaca yang masih memakai file JSON
+        if sys.argv[1] == '--export':
+            path = sys.argv[2] if len(sys.argv) > 2 else storage.DEFAULT_JSON_PATH
+            count = store.export_json(path)
+            print(f"{count} halaman diekspor ke {path}")
+            return
         
-        # Jika data berhasil diambil, tambahkan ke existing_data dan simpan kembali ke 'scraped_data.json'
-        if page_data:
-            existing_data.append(page_data)
-            
-            # Simpan data yang telah di-update ke dalam file JSON
-            with open('scraped_data.json', 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, ensure_ascii=False, indent=4)
-            
-            print(f"Scraping berhasil untuk {url}")
-        else:
-            print(f"Gagal melakukan scraping data dari {url}")
+        # Memeriksa ulang semua halaman yang tersimpan (refresh inkremental)
+        if sys.argv[1] == '--refresh':
+            proxy_url = sys.argv[2] if len(sys.argv) > 2 else None
+            refresh_all(store, {"http": proxy_url, "https": proxy_url} if proxy_url else None, cache)
+            return
+        
+        # Mengambil URL dari argumen baris perintah
+        url = sys.argv[1]
+        
+        # Mengambil proxy_url jika disediakan sebagai argumen kedua
+        proxy_url = sys.argv[2] if len(sys.argv) > 2 else None
+        
+        # Menyiapkan dictionary proxies untuk digunakan jika proxy_url disediakan
+        proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else None
+        
+        # Men-scrape URL jika belum pernah di-scrape sebelumnya
+        scrape_url(store, url, proxies, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+        store.close()
 
 if __name__ == "__main__":
     main()
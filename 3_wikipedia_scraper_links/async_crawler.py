@@ -0,0 +1,396 @@
+import asyncio  # Import modul asyncio untuk menjalankan banyak permintaan sekaligus
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import multiprocessing  # Import modul multiprocessing untuk konteks start proses parser
+import random  # Import modul random untuk jitter pada backoff retry
+import time  # Import modul time untuk token bucket
+import urllib.parse  # Import modul urllib.parse untuk mengambil host dari URL
+from concurrent.futures import ProcessPoolExecutor  # Import pool proses untuk tahap parsing
+
+import aiohttp  # Import aiohttp sebagai klien HTTP asyncio
+
+import http_client  # Import konfigurasi klien HTTP bersama (User-Agent, timeout)
+import html_cache  # Import cache HTML mentah untuk replay tanpa jaringan
+import checkpoint  # Import jurnal halaman tahan crash
+
+from wikipedia_scraper_links import parse_page, urls, load_existing_data, save_data, ENGINE_CHOICES, DEFAULT_ENGINE
+
+# Jumlah permintaan maksimal yang berjalan bersamaan
+DEFAULT_CONCURRENCY = 32
+
+# Laju (permintaan per detik) dan burst token bucket per host
+DEFAULT_RATE_PER_HOST = 20
+DEFAULT_BURST = 40
+
+# Jumlah percobaan ulang dan batas backoff (detik) untuk permintaan yang gagal sementara
+DEFAULT_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+
+# Batas waktu total (detik) satu permintaan
+DEFAULT_TIMEOUT = 30
+
+# Status HTTP yang dianggap gagal sementara dan layak dicoba ulang
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Akhiran file checkpoint crawler ini (berbeda dari checkpoint wikipedia_scraper_links.py yang
+# menyimpan state frontier)
+CHECKPOINT_SUFFIX = '.async.checkpoint'
+
+# Mode pipeline: jumlah halaman yang boleh menunggu di antrean parsing per proses parser,
+# dan jumlah halaman yang dikirim ke setiap proses parser sekaligus
+PARSE_QUEUE_PER_WORKER = 4
+PARSE_PREFETCH = 2
+
+
+class TokenBucket:
+    """
+    Token bucket untuk membatasi laju permintaan ke satu host.
+
+    Token bertambah sebanyak rate per detik sampai maksimal burst. Setiap permintaan
+    mengambil satu token; jika token habis, permintaan menunggu sampai token tersedia.
+
+    Atribut:
+    - rate: Jumlah token per detik.
+    - burst: Kapasitas maksimal token.
+    - tokens: Jumlah token saat ini.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Mengambil satu token, menunggu jika token sedang habis.
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """
+        Menahan bucket selama seconds detik (misalnya karena header Retry-After dari server).
+        """
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class AsyncCrawler:
+    """
+    Crawler asyncio untuk halaman Wikipedia dengan jumlah permintaan bersamaan yang dibatasi,
+    token bucket per host, dan retry dengan backoff eksponensial ber-jitter.
+
+    Halaman yang berhasil diambil diekstrak dengan parse_page dari wikipedia_scraper_links,
+    sehingga hasilnya sama dengan scraper berurutan.
+
+    Secara default parsing berjalan di thread pool (dibatasi GIL). Dengan parse_workers > 0
+    crawler berjalan dalam mode pipeline: worker fetch hanya memasukkan body mentah (bytes) ke
+    antrean berukuran terbatas, dan parsing berjalan di ProcessPoolExecutor sehingga fetch dan
+    parsing memakai core yang berbeda. Jika antrean penuh, worker fetch menunggu (backpressure).
+
+    Metode:
+    - crawl: Mengambil dan mengekstrak semua URL.
+    - fetch: Mengambil satu URL dengan rate limit dan retry.
+
+    Atribut:
+    - concurrency: Jumlah permintaan maksimal yang berjalan bersamaan.
+    - rate_per_host, burst: Parameter token bucket per host.
+    - retries: Jumlah percobaan ulang untuk kegagalan sementara.
+    - timeout: Batas waktu total satu permintaan (detik).
+    - proxy: URL proxy HTTP (misalnya 'http://localhost:9919'), None berarti langsung.
+    - engine: Engine ekstraksi untuk parse_page (lihat ENGINE_CHOICES).
+    - parse_workers: Jumlah proses parser pada mode pipeline, 0 berarti parsing di thread.
+    - queue_size: Kapasitas antrean halaman yang menunggu parsing pada mode pipeline.
+    - cache: html_cache.HTMLCache tempat body mentah disimpan (untuk --replay), None berarti tidak disimpan.
+    - stats: Dictionary jumlah ok, failed, retries, dan parse_wait (detik total worker fetch
+      menunggu antrean parsing yang penuh).
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate_per_host=DEFAULT_RATE_PER_HOST, burst=DEFAULT_BURST,
+                 retries=DEFAULT_RETRIES, timeout=DEFAULT_TIMEOUT, proxy=None, engine=DEFAULT_ENGINE,
+                 parse_workers=0, queue_size=None, cache=None):
+        self.concurrency = concurrency
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self.proxy = proxy
+        self.engine = engine
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size or max(1, parse_workers) * PARSE_QUEUE_PER_WORKER
+        self.cache = cache
+        self.buckets = {}
+        self.stats = {'ok': 0, 'failed': 0, 'retries': 0, 'parse_wait': 0.0}
+
+    def bucket(self, url):
+        """
+        Mengembalikan token bucket untuk host dari url.
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self.buckets[host]
+
+    async def fetch(self, session, url):
+        """
+        Mengambil satu URL. Status 429/5xx, timeout, dan error koneksi dicoba ulang dengan
+        backoff eksponensial full jitter (atau sesuai Retry-After jika server mengirimnya).
+
+        Args:
+        - session (aiohttp.ClientSession): Sesi HTTP bersama.
+        - url (str): URL halaman.
+
+        Returns:
+        - tuple or None: (body dalam bytes, encoding), atau None jika gagal.
+        """
+        bucket = self.bucket(url)
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            retry_after = None
+            try:
+                async with session.get(url, proxy=self.proxy) as response:
+                    if response.status == 200:
+                        return await response.read(), response.get_encoding()
+                    if response.status not in RETRY_STATUSES:
+                        print(f"Gagal mengambil halaman: {response.status} - {response.reason} ({url})")
+                        return None
+                    error = f"{response.status} - {response.reason}"
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = repr(e)
+
+            if attempt == self.retries:
+                print(f"Gagal mengambil halaman setelah {attempt + 1} percobaan: {error} ({url})")
+                return None
+            self.stats['retries'] += 1
+            if retry_after is not None:
+                bucket.pause(retry_after)  # Host meminta jeda: tahan semua permintaan ke host tersebut
+                delay = retry_after
+            else:
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            await asyncio.sleep(delay)
+        return None
+
+    async def crawl(self, page_urls, on_result=None):
+        """
+        Mengambil dan mengekstrak semua URL dengan sejumlah worker yang berjalan bersamaan.
+
+        Hasil tidak ditahan di memori: setiap halaman langsung diserahkan ke on_result.
+
+        Args:
+        - page_urls (iterable): URL yang akan diambil (duplikat diabaikan).
+        - on_result (callable, optional): Dipanggil dengan (url, data) untuk setiap halaman
+          yang berhasil diekstrak, sesuai urutan selesainya.
+
+        Returns:
+        - int: Jumlah halaman yang berhasil diekstrak.
+        """
+        queue = asyncio.Queue()
+        for url in dict.fromkeys(page_urls):
+            queue.put_nowait(url)
+        ok = self.stats['ok']
+        loop = asyncio.get_running_loop()
+        pool = None
+        parse_queue = None
+        if self.parse_workers > 0:
+            # Proses parser dibuat dengan spawn agar tidak mewarisi thread dan event loop proses ini
+            pool = ProcessPoolExecutor(self.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+            parse_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def parse(url, page):
+            try:
+                # Parsing di thread atau proses parser agar event loop tetap melayani permintaan lain
+                data = await loop.run_in_executor(pool, parse_body, page[0], page[1], url, self.engine)
+            except Exception as e:
+                print(f"Gagal mengekstrak halaman {url}: {e!r}")
+                self.stats['failed'] += 1
+                return
+            self.stats['ok'] += 1
+            if on_result is not None:
+                on_result(url, data)
+
+        async def fetcher(session):
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                page = await self.fetch(session, url)
+                if page is not None and self.cache is not None:
+                    # Kompresi dan penulisan blob berjalan di thread agar event loop tidak tertahan
+                    await loop.run_in_executor(None, self.cache.put, url, *page)
+                if page is None:
+                    self.stats['failed'] += 1
+                elif parse_queue is None:
+                    await parse(url, page)
+                else:
+                    # Menunggu di sini jika parser tertinggal (antrean penuh)
+                    started = time.monotonic()
+                    await parse_queue.put((url, page))
+                    self.stats['parse_wait'] += time.monotonic() - started
+
+        async def parser():
+            while True:
+                item = await parse_queue.get()
+                if item is None:
+                    return
+                await parse(*item)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout, connect=http_client.DEFAULT_CONNECT_TIMEOUT)
+        headers = {'User-Agent': http_client.DEFAULT_USER_AGENT}  # aiohttp sudah meminta gzip/brotli
+        try:
+            parsers = []
+            if parse_queue is not None:
+                parsers = [asyncio.create_task(parser()) for _ in range(self.parse_workers * PARSE_PREFETCH)]
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+                await asyncio.gather(*(fetcher(session) for _ in range(self.concurrency)))
+            for _ in parsers:
+                await parse_queue.put(None)
+            await asyncio.gather(*parsers)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return self.stats['ok'] - ok
+
+
+def parse_body(body, encoding, url, engine):
+    """
+    Mendekode body halaman lalu mengekstraknya dengan parse_page. Dijalankan di thread pool
+    atau di proses parser pada mode pipeline.
+
+    Args:
+    - body (bytes): Body respons.
+    - encoding (str): Encoding body (dari header Content-Type atau deteksi aiohttp).
+    - url (str): URL halaman.
+    - engine (str): Engine ekstraksi.
+
+    Returns:
+    - dict: Data halaman.
+    """
+    return parse_page(body.decode(encoding, 'replace'), url, engine)
+
+
+def parse_retry_after(value):
+    """
+    Membaca header Retry-After dalam detik (format tanggal HTTP diabaikan).
+
+    Returns:
+    - float or None: Jeda dalam detik.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def read_urls(path):
+    """
+    Membaca daftar URL dari file teks (satu URL per baris, baris kosong dan '#' diabaikan).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def main():
+    """
+    Fungsi utama: mengambil URL dari file atau list urls bawaan secara bersamaan, lalu
+    menggabungkan hasilnya ke dalam 'scraped_data.json' (URL yang sudah ada dilewati).
+
+    Setiap halaman ditulis ke jurnal <output>.async.checkpoint.journal begitu selesai diekstrak.
+    Setelah crawl, isi jurnal digabungkan ke file output lalu jurnal dihapus. Jika crawl terhenti,
+    halaman di jurnal dipakai lagi saat perintah yang sama dijalankan ulang.
+    """
+    parser = argparse.ArgumentParser(description='Crawler Wikipedia asyncio dengan rate limit per host')
+    parser.add_argument('--urls-file', help='File berisi URL (satu per baris); default: list urls bawaan')
+    parser.add_argument('--output', default='scraped_data.json', help='File JSON hasil scraping')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Jumlah permintaan maksimal yang berjalan bersamaan')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_HOST, help='Permintaan per detik per host')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help='Burst token bucket per host')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help='Jumlah percobaan ulang')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Batas waktu per permintaan (detik)')
+    parser.add_argument('--proxy', help="Proxy HTTP, misalnya 'http://localhost:9919'")
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, choices=ENGINE_CHOICES, help='Engine ekstraksi HTML')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Mode pipeline: jumlah proses parser (0 berarti parsing di thread)')
+    parser.add_argument('--parse-queue', type=int,
+                        help=f'Kapasitas antrean halaman yang menunggu parsing (default {PARSE_QUEUE_PER_WORKER} '
+                             f'x --parse-workers)')
+    parser.add_argument('--cache-dir', help='Folder cache HTML mentah (terkompresi) untuk '
+                                            'wikipedia_scraper_links.py --replay')
+    parser.add_argument('--checkpoint-interval', type=float, default=checkpoint.DEFAULT_CHECKPOINT_INTERVAL,
+                        help='Jeda minimal (detik) antar fsync jurnal halaman')
+    args = parser.parse_args()
+
+    page_urls = read_urls(args.urls_file) if args.urls_file else urls
+    existing_data = load_existing_data(args.output)
+    done = {item['url'] for item in existing_data}
+
+    # Halaman dari crawl sebelumnya yang terhenti sudah ada di jurnal dan tidak diambil lagi
+    journal = checkpoint.Checkpoint(args.output + CHECKPOINT_SUFFIX, args.checkpoint_interval)
+    journaled = 0
+    if journal.exists():
+        _, pages = journal.resume()
+        journaled = len(pages)
+        done.update(page['url'] for page in pages)
+        print(f"{journaled} halaman dari crawl sebelumnya dilanjutkan dari {journal.path}")
+    else:
+        journal.start()
+        journal.save({})  # Jurnal kosong yang tercatat agar crawl yang terhenti bisa dilanjutkan
+
+    pending = [url for url in dict.fromkeys(page_urls) if url not in done]
+    print(f"[WIKIPEDIA CRAWLER DIMULAI] {len(pending)} URL baru, {len(page_urls) - len(pending)} sudah diambil\n")
+
+    cache = html_cache.HTMLCache(args.cache_dir) if args.cache_dir else None
+    crawler = AsyncCrawler(args.concurrency, args.rate, args.burst, args.retries, args.timeout, args.proxy,
+                           args.engine, args.parse_workers, args.parse_queue, cache)
+    start = time.monotonic()
+
+    def on_result(url, data):
+        journal.record(data)
+        if journal.due():
+            journal.save({})
+        print(f"{crawler.stats['ok']}. Scraping berhasil untuk {url}")
+
+    try:
+        asyncio.run(crawler.crawl(pending, on_result))
+    except KeyboardInterrupt:
+        journal.save({})
+        journal.close()
+        print(f"\nDihentikan. {journaled + crawler.stats['ok']} halaman tersimpan di {journal.journal_path}; "
+              f"jalankan perintah yang sama untuk melanjutkan")
+        return
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.monotonic() - start
+
+    # Gabungkan semua halaman dari jurnal (sesuai urutan URL masukan) ke file output
+    journal.save({})
+    _, pages = journal.resume()
+    position = {url: index for index, url in enumerate(page_urls)}
+    pages.sort(key=lambda page: position.get(page['url'], len(position)))
+    existing_urls = {item['url'] for item in existing_data}
+    existing_data.extend(page for page in pages if page['url'] not in existing_urls)
+    save_data(existing_data, args.output)
+    journal.finish()
+
+    print(f"\nBerhasil {crawler.stats['ok']}, gagal {crawler.stats['failed']}, retry {crawler.stats['retries']} "
+          f"dalam {elapsed:.1f} detik ({len(pending) / elapsed if elapsed else 0:.1f} URL/detik)")
+    if args.parse_workers:
+        print(f"Total waktu tunggu worker fetch karena antrean parsing penuh: {crawler.stats['parse_wait']:.1f} detik")
+    print(f"Data yang diambil telah disimpan di {args.output}")
+    print("\n[WIKIPEDIA CRAWLER SELESAI]")
+
+
+if __name__ == '__main__':
+    main()
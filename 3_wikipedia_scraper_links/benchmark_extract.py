@@ -0,0 +1,216 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import json  # Import modul json untuk menyimpan hasil benchmark
+import os  # Import modul os untuk folder halaman tersimpan
+import statistics  # Import modul statistics untuk median waktu per putaran
+import subprocess  # Import modul subprocess untuk membaca commit git
+import time  # Import modul time untuk mengukur durasi
+import urllib.parse  # Import modul urllib.parse untuk nama file dari URL
+
+import http_client  # Import klien HTTP bersama untuk mengunduh halaman
+from wikipedia_scraper_links import parse_page, urls, ENGINE_CHOICES
+
+# Folder default tempat halaman HTML disimpan
+DEFAULT_PAGES_DIR = 'pages'
+
+# Jumlah putaran pengukuran per engine
+DEFAULT_REPEAT = 5
+
+# Kerangka halaman bergaya Wikipedia untuk fixture HTML rusak (judul, tanggal, dan kategori ikut dibandingkan)
+MALFORMED_TEMPLATE = (
+    '<html><body><h1><span class="mw-page-title-main">Fixture</span></h1>{}'
+    '<ul><li id="footer-info-lastmod">This page was last edited on 5 March 2024, at 12:34 (UTC).</li></ul>'
+    '<div id="mw-normal-catlinks"><ul><li><a href="/wiki/Category:A">A</a></li></ul></div></body></html>'
+)
+
+# Isi HTML rusak yang diperbaiki secara berbeda oleh parser HTML: nama -> isi <body>
+MALFORMED_FIXTURES = {
+    'p_div': '<p>a<div>b</div>c</p>',
+    'p_table': '<p>a<table><tr><td>b</td></tr></table>c</p>',
+    'p_ul': '<p>a<ul><li>b</li></ul>c</p>',
+    'p_form': '<p>a<form>b</form>c</p>',
+    'p_heading': '<p>a<h2>h</h2>b</p>',
+    'p_blockquote': '<p>a<blockquote>q</blockquote>b</p>',
+    'p_pre': '<p>a<pre>x\n y</pre>b</p>',
+    'p_hr': '<p>a<br>b<hr>c</p>',
+    'nested_p': '<p>outer<p>inner</p>tail</p>',
+    'unclosed_p': '<p>a<p>b',
+    'stray_end_p': 'x</p>y<p>z',
+    'misnested_inline': '<b><p>x</b>y</p>',
+    'entities_without_semicolon': '<p>a &amp b &#x41 &notit; c</p>',
+    'comment_script': '<p>a<!-- c -->b<script>s</script>c</p>',
+}
+
+
+def page_filename(url):
+    """
+    Mengubah URL halaman menjadi nama file, misalnya '.../wiki/Proxy_server' -> 'Proxy_server.html'.
+    """
+    name = urllib.parse.unquote(urllib.parse.urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]) or 'index'
+    return name.replace(os.sep, '_') + '.html'
+
+
+def fetch_pages(page_urls, pages_dir, proxy=None):
+    """
+    Mengunduh halaman yang belum tersimpan ke pages_dir agar benchmark bisa diulang tanpa jaringan.
+
+    Args:
+    - page_urls (iterable): URL halaman.
+    - pages_dir (str): Folder tujuan.
+    - proxy (str, optional): URL proxy.
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    client = http_client.get_client(proxy)
+    for url in dict.fromkeys(page_urls):
+        path = os.path.join(pages_dir, page_filename(url))
+        if os.path.exists(path):
+            continue
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f"Gagal mengambil halaman: {response.status_code} - {response.reason} ({url})")
+            continue
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Disimpan: {path}")
+
+
+def load_pages(pages_dir):
+    """
+    Membaca semua file .html di pages_dir.
+
+    Returns:
+    - list: Pasangan (nama file, teks HTML), urut berdasarkan nama file.
+    """
+    pages = []
+    for name in sorted(os.listdir(pages_dir)):
+        if name.endswith('.html'):
+            with open(os.path.join(pages_dir, name), 'r', encoding='utf-8') as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def malformed_pages():
+    """
+    Halaman fixture HTML rusak untuk pemeriksaan diferensial terhadap bs4.
+
+    Returns:
+    - list: Pasangan (nama fixture, teks HTML).
+    """
+    return [(name, MALFORMED_TEMPLATE.format(body)) for name, body in MALFORMED_FIXTURES.items()]
+
+
+def run_engine(engine, pages, repeat):
+    """
+    Mengekstrak semua halaman dengan satu engine sebanyak repeat putaran.
+
+    Returns:
+    - tuple: (hasil per halaman dari putaran terakhir, list durasi per putaran dalam detik).
+    """
+    durations = []
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse_page(html, name, engine) for name, html in pages]
+        durations.append(time.perf_counter() - start)
+    return results, durations
+
+
+def compare(reference, results, pages):
+    """
+    Membandingkan hasil engine dengan hasil bs4.
+
+    Returns:
+    - list: Dictionary {'page', 'fields'} untuk setiap halaman yang hasilnya berbeda.
+    """
+    mismatches = []
+    for (name, _), expected, actual in zip(pages, reference, results):
+        fields = [key for key in expected if expected[key] != actual.get(key)]
+        if fields:
+            mismatches.append({'page': name, 'fields': fields})
+    return mismatches
+
+
+def git_commit():
+    """
+    Mengembalikan hash commit git saat ini, atau None jika bukan repository git.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """
+    Fungsi utama: mengukur waktu ekstraksi setiap engine pada halaman tersimpan dan memeriksa
+    bahwa hasilnya identik dengan engine bs4 (BeautifulSoup), juga pada fixture HTML rusak
+    (MALFORMED_FIXTURES), lalu mencetak hasilnya sebagai JSON.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark engine ekstraksi halaman Wikipedia')
+    parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR, help='Folder berisi halaman HTML tersimpan')
+    parser.add_argument('--fetch', action='store_true',
+                        help='Unduh dulu halaman yang belum tersimpan (dari --urls-file atau list urls bawaan)')
+    parser.add_argument('--urls-file', help='File berisi URL (satu per baris) untuk --fetch')
+    parser.add_argument('--proxy', help="Proxy untuk --fetch, misalnya 'http://localhost:9919'")
+    parser.add_argument('--engines', nargs='+', default=ENGINE_CHOICES, choices=ENGINE_CHOICES,
+                        help='Engine yang diukur (bs4 selalu dijalankan sebagai pembanding)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Jumlah putaran per engine')
+    parser.add_argument('--label', help='Label bebas untuk membedakan hasil')
+    parser.add_argument('--output', help='File JSON Lines tempat hasil ditambahkan')
+    args = parser.parse_args()
+
+    if args.fetch:
+        page_urls = urls
+        if args.urls_file:
+            with open(args.urls_file, 'r', encoding='utf-8') as f:
+                page_urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        fetch_pages(page_urls, args.pages_dir, args.proxy)
+    pages = load_pages(args.pages_dir) if os.path.isdir(args.pages_dir) else []
+    if not pages:
+        parser.error(f"Tidak ada file .html di {args.pages_dir} (gunakan --fetch untuk mengunduh halaman)")
+    total_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+
+    engines = ['bs4'] + [engine for engine in args.engines if engine != 'bs4']
+    malformed = malformed_pages()
+    reference = None
+    malformed_reference = None
+    baseline = None
+    results = {}
+    for engine in engines:
+        output, durations = run_engine(engine, pages, args.repeat)
+        malformed_output, _ = run_engine(engine, malformed, 1)
+        median = statistics.median(durations)
+        if reference is None:
+            reference, baseline = output, median
+            malformed_reference = malformed_output
+        mismatches = compare(reference, output, pages)
+        malformed_mismatches = compare(malformed_reference, malformed_output, malformed)
+        results[engine] = {
+            'seconds_per_round': round(median, 4),
+            'ms_per_page': round(median * 1000 / len(pages), 2),
+            'pages_per_second': round(len(pages) / median, 1),
+            'megabytes_per_second': round(total_bytes / median / 1e6, 2),
+            'speedup_vs_bs4': round(baseline / median, 2),
+            'identical': not mismatches,
+            'mismatches': mismatches,
+            'malformed_identical': not malformed_mismatches,
+            'malformed_mismatches': malformed_mismatches,
+        }
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'label': args.label,
+        'pages': len(pages),
+        'megabytes': round(total_bytes / 1e6, 2),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    print(json.dumps(record, indent=2))
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,396 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import collections  # Import modul collections untuk penghitung waktu per tahap
+import contextlib  # Import modul contextlib untuk membuang output scraper saat diukur
+import functools  # Import modul functools untuk membungkus fungsi yang diukur
+import json  # Import modul json untuk menyimpan hasil benchmark
+import multiprocessing  # Import modul multiprocessing untuk server fixture dan setiap putaran di proses terpisah
+import os  # Import modul os untuk path dan folder sementara
+import re  # Import modul re untuk judul halaman mirror
+import resource  # Import modul resource untuk memori puncak (max RSS)
+import shlex  # Import modul shlex untuk memecah opsi tambahan proxy.py
+import socket  # Import modul socket untuk memilih port kosong
+import statistics  # Import modul statistics untuk median durasi
+import subprocess  # Import modul subprocess untuk menjalankan proxy.py dan membaca commit git
+import sys  # Import modul sys untuk path interpreter Python dan argumen scraper
+import tempfile  # Import modul tempfile untuk file hasil scraping sementara
+import time  # Import modul time untuk mengukur durasi
+
+import checkpoint
+import fast_extract
+import fixture_server
+import http_client
+import mediawiki_api
+import wikipedia_scraper_links
+
+# Skenario: 'get_page_content' memanggil fungsi tersebut untuk setiap URL, 'scrape' menjalankan
+# main() scraper (crawl list URL, checkpoint, dan penyimpanan JSON) dari awal sampai akhir, dan
+# 'scrape_api' menjalankan main() dengan --backend api (MediaWiki Action API per batch)
+SCENARIOS = ['get_page_content', 'scrape', 'scrape_api']
+
+# Jalur jaringan: langsung ke server fixture, atau lewat proxy.py (folder 1_forward_proxy)
+PATHS = ['direct', 'proxy']
+
+# Jumlah halaman (URL berbeda) per putaran dan jumlah putaran per kombinasi
+DEFAULT_PAGES = 200
+DEFAULT_REPEAT = 3
+
+# Batas waktu (detik) menunggu proxy.py siap menerima koneksi
+STARTUP_TIMEOUT = 15
+
+# Judul halaman mirror dari backend API, misalnya 'Proxy server (2)'
+MIRROR_TITLE_PATTERN = re.compile(r' \(\d+\)$')
+
+# Lokasi proxy.py
+PROXY_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '1_forward_proxy', 'proxy.py')
+
+# Fungsi scraper yang diukur untuk setiap tahap: (objek pemilik, nama atribut, tahap)
+STAGE_FUNCTIONS = [
+    (http_client.HTTPClient, 'get', 'fetch'),
+    (wikipedia_scraper_links, 'BeautifulSoup', 'parse'),
+    (fast_extract, 'extract', 'parse'),  # Engine satu lintasan: parsing dan ekstraksi sekaligus
+    (wikipedia_scraper_links, 'extract_title', 'extract'),
+    (wikipedia_scraper_links, 'extract_content', 'extract'),
+    (wikipedia_scraper_links, 'extract_last_modified_date', 'extract'),
+    (wikipedia_scraper_links, 'extract_categories', 'extract'),
+    (wikipedia_scraper_links, 'extract_links', 'extract'),
+    (wikipedia_scraper_links, 'parse_last_modified', 'extract'),
+    (mediawiki_api, 'read_response', 'parse'),
+    (wikipedia_scraper_links, 'api_page_data', 'extract'),
+    (wikipedia_scraper_links, 'save_data', 'write'),
+    (checkpoint.Checkpoint, 'record', 'write'),
+    (checkpoint.Checkpoint, 'save', 'write'),
+]
+STAGES = ['fetch', 'parse', 'extract', 'write']
+
+
+class StageTimer:
+    """
+    Mengukur waktu kumulatif setiap tahap scraping dengan membungkus fungsi yang dipanggil
+    scraper (lihat STAGE_FUNCTIONS), tanpa mengubah kode scraper. Panggilan bertingkat
+    (misalnya parse_last_modified di dalam extract_last_modified_date) hanya dihitung sekali
+    pada fungsi terluar.
+
+    Metode:
+    - install: Memasang pembungkus pada semua fungsi.
+    - uninstall: Mengembalikan fungsi asli.
+
+    Atribut:
+    - seconds: Counter durasi per tahap.
+    - calls: Counter jumlah panggilan per tahap.
+    """
+
+    def __init__(self):
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self.active = False
+        self.originals = []
+
+    def install(self, functions=STAGE_FUNCTIONS):
+        for owner, name, stage in functions:
+            original = getattr(owner, name)
+            self.originals.append((owner, name, original))
+            setattr(owner, name, self.wrap(original, stage))
+
+    def uninstall(self):
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals.clear()
+
+    def wrap(self, function, stage):
+        """
+        Membungkus function sehingga durasinya ditambahkan ke tahap stage.
+        """
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            if self.active:
+                return function(*args, **kwargs)
+            self.active = True
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - start
+                self.calls[stage] += 1
+                self.active = False
+        return timed
+
+
+def rss_kb():
+    """
+    RSS proses saat ini (KB) dari /proc, None jika tidak tersedia.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def check_pages(pages, expected, exact=True):
+    """
+    Membandingkan data hasil scraping dengan data asal halaman buatan fixture.
+
+    Args:
+    - pages (list): Data hasil scraping.
+    - expected (dict): Nama halaman -> data asal.
+    - exact (bool): Jika False (backend API), judul mirror '<judul> (<n>)' diterima dan isi
+      cukup berupa awal dari isi asal (spasi diabaikan), karena extract API bisa hanya bagian pembuka.
+
+    Returns:
+    - int: Jumlah halaman yang datanya berbeda (url tidak dibandingkan karena mirror).
+    """
+    mismatches = 0
+    for data in pages:
+        item = expected.get(fixture_server.MIRROR_PATTERN.sub(r'\1', fixture_server.page_name(data['url'])))
+        if item is None:
+            continue
+        if exact:
+            same = all(data[key] == item[key] for key in item if key != 'url')
+        else:
+            same = (MIRROR_TITLE_PATTERN.sub('', data['title']) == item['title']
+                    and data['createdAt'] == item['createdAt'] and data['categories'] == item['categories']
+                    and ' '.join(item['content'].split()).startswith(' '.join(data['content'].split())))
+        if not same:
+            mismatches += 1
+    return mismatches
+
+
+def run_scenario(scenario, urls, proxy, expected, workdir, counters, api_content=mediawiki_api.DEFAULT_CONTENT):
+    """
+    Menjalankan satu putaran skenario dan mengukur durasi, waktu per tahap, memori puncak, serta
+    jumlah respons dan bytes body yang dikirim server fixture (counters, lihat FixtureServer).
+    Dipanggil di proses anak baru sehingga memori puncak dan koneksi tidak terbawa antar putaran.
+
+    Returns:
+    - dict: Hasil putaran.
+    """
+    timer = StageTimer()
+    timer.install()
+    start_rss = rss_kb()
+    requests_before, bytes_before = counters[:]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        if scenario == 'get_page_content':
+            pages = [data for data in (wikipedia_scraper_links.get_page_content(url, proxy=proxy) for url in urls)
+                     if data is not None]
+        else:
+            output = os.path.join(workdir, f'scraped_{os.getpid()}.json')
+            seeds_file = os.path.join(workdir, 'seeds.txt')
+            argv = ['wikipedia_scraper_links.py', '--seeds-file', seeds_file, '--output', output]
+            if proxy:
+                argv += ['--proxy', proxy]
+            if scenario == 'scrape_api':
+                argv += ['--backend', 'api', '--api-content', api_content]
+            sys.argv = argv
+            wikipedia_scraper_links.main()
+            pages = wikipedia_scraper_links.load_existing_data(output)
+        seconds = time.perf_counter() - start
+    timer.uninstall()
+    requests_after, bytes_after = counters[:]
+
+    stages = {stage: round(timer.seconds[stage], 4) for stage in STAGES}
+    stages['other'] = round(max(0.0, seconds - sum(timer.seconds.values())), 4)
+    return {
+        'seconds': round(seconds, 4),
+        'pages': len(pages),
+        'failed': len(urls) - len(pages),
+        'mismatches': check_pages(pages, expected, exact=scenario != 'scrape_api'),
+        'requests': requests_after - requests_before,
+        'response_bytes': bytes_after - bytes_before,
+        'stage_seconds': stages,
+        'stage_calls': {stage: timer.calls[stage] for stage in STAGES},
+        'start_rss_kb': start_rss,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_in_child(*args):
+    """
+    Menjalankan run_scenario di proses anak (fork) dan mengembalikan hasilnya.
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+
+    def target():
+        try:
+            sender.send(run_scenario(*args))
+        except BaseException as e:
+            sender.send({'error': repr(e)})
+
+    process = context.Process(target=target)
+    process.start()
+    sender.close()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def free_port():
+    """
+    Mencari port kosong di 127.0.0.1 untuk proxy.py.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_proxy(port, proxy_args):
+    """
+    Menjalankan proxy.py sebagai proses terpisah dan menunggu sampai port-nya siap.
+
+    Returns:
+    - subprocess.Popen: Proses proxy.
+    """
+    process = subprocess.Popen([sys.executable, PROXY_SCRIPT, '--port', str(port), *proxy_args],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.path.dirname(PROXY_SCRIPT))
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'proxy.py berhenti saat start (kode {process.returncode})')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('proxy.py tidak siap dalam batas waktu')
+
+
+def summarize(runs):
+    """
+    Meringkas beberapa putaran: durasi dan waktu per tahap dari putaran median, memori puncak
+    terbesar.
+    """
+    failed = [run['error'] for run in runs if 'error' in run]
+    runs = [run for run in runs if 'error' not in run]
+    if not runs:
+        return {'errors': failed}
+    median = sorted(runs, key=lambda run: run['seconds'])[len(runs) // 2]
+    return {
+        'pages': median['pages'],
+        'failed': max(run['failed'] for run in runs),
+        'mismatches': max(run['mismatches'] for run in runs),
+        'seconds': median['seconds'],
+        'seconds_all': [run['seconds'] for run in runs],
+        'pages_per_second': round(median['pages'] / median['seconds'], 1) if median['seconds'] else None,
+        'requests_per_1k_pages': round(median['requests'] * 1000 / median['pages'], 1) if median['pages'] else None,
+        'kilobytes_per_page': round(median['response_bytes'] / 1024 / median['pages'], 2) if median['pages'] else None,
+        'ms_per_page': {stage: round(value * 1000 / max(median['pages'], 1), 3)
+                        for stage, value in median['stage_seconds'].items()},
+        'stage_seconds': median['stage_seconds'],
+        'stage_calls': median['stage_calls'],
+        'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+        'peak_rss_growth_kb': max(run['peak_rss_kb'] - (run['start_rss_kb'] or 0) for run in runs),
+        'errors': failed,
+    }
+
+
+def git_commit():
+    """
+    Mengembalikan hash commit git saat ini, atau None jika bukan repository git.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """
+    Fungsi utama: menjalankan server fixture Wikipedia lokal (dan proxy.py), lalu mengukur
+    pages/sec, waktu per tahap (fetch, parse, extract, write), dan memori puncak scraper untuk
+    setiap skenario dan jalur jaringan, dan mencetak hasilnya sebagai JSON.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark scraper end-to-end dengan server fixture Wikipedia lokal')
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES, help='Jumlah halaman (URL berbeda) per putaran')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Jumlah putaran per skenario dan jalur')
+    parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS, help='Skenario yang diukur')
+    parser.add_argument('--paths', nargs='+', default=PATHS, choices=PATHS,
+                        help='Jalur jaringan: langsung dan/atau lewat proxy.py')
+    parser.add_argument('--pages-dir', default=fixture_server.DEFAULT_PAGES_DIR, help='Folder halaman HTML rekaman')
+    parser.add_argument('--data', default=fixture_server.DEFAULT_DATA_PATH, help='File JSON asal halaman buatan')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Latensi server fixture per respons (milidetik)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=0,
+                        help='Batas bandwidth server fixture per koneksi (megabit/detik), 0 berarti tanpa batas')
+    parser.add_argument('--no-gzip', action='store_true', help='Server fixture mengirim body tanpa gzip')
+    parser.add_argument('--api-content', default=mediawiki_api.DEFAULT_CONTENT, choices=mediawiki_api.CONTENT_CHOICES,
+                        help='Isi artikel untuk skenario scrape_api')
+    parser.add_argument('--proxy-args', default='', help="Opsi tambahan untuk proxy.py, misalnya '--cache-memory-mb 64'")
+    parser.add_argument('--label', help='Label bebas untuk membedakan hasil')
+    parser.add_argument('--output', help='File JSON Lines tempat hasil ditambahkan')
+    args = parser.parse_args()
+
+    pages, expected = fixture_server.load_fixture_pages(args.pages_dir, args.data)
+    if not pages:
+        parser.error(f'Tidak ada halaman di {args.pages_dir} maupun {args.data}')
+    latency = args.latency_ms / 1000
+    bandwidth = args.bandwidth_mbps * 1e6 / 8
+
+    # Server fixture berjalan di proses terpisah agar tidak berbagi GIL dengan scraper; jumlah
+    # respons dan bytes body yang dikirimnya dibaca lewat shared memory
+    context = multiprocessing.get_context('fork')
+    counters = context.Array('q', 2)
+    server_sock = socket.socket()
+    server_sock.bind(('127.0.0.1', 0))
+    server_sock.listen(128)
+    base_url = f'http://127.0.0.1:{server_sock.getsockname()[1]}'
+    records = fixture_server.api_records(pages, expected)
+    server = context.Process(target=fixture_server.run_server, daemon=True,
+                             args=(server_sock, pages, latency, bandwidth, not args.no_gzip, records, counters))
+    server.start()
+    server_sock.close()
+
+    urls = fixture_server.page_urls(base_url, sorted(pages), args.pages)
+    proxy_process = None
+    results = {}
+    try:
+        proxy = None
+        if 'proxy' in args.paths:
+            proxy_port = free_port()
+            proxy_process = start_proxy(proxy_port, shlex.split(args.proxy_args))
+            proxy = f'http://127.0.0.1:{proxy_port}'
+        with tempfile.TemporaryDirectory() as workdir:
+            with open(os.path.join(workdir, 'seeds.txt'), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(urls) + '\n')
+            for scenario in args.scenarios:
+                for path in args.paths:
+                    runs = [run_in_child(scenario, urls, proxy if path == 'proxy' else None, expected, workdir,
+                                         counters, args.api_content)
+                            for _ in range(args.repeat)]
+                    results[f'{scenario}/{path}'] = summarize(runs)
+    finally:
+        if proxy_process is not None:
+            proxy_process.terminate()
+            try:
+                proxy_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proxy_process.kill()
+        server.terminate()
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'label': args.label,
+        'pages': args.pages,
+        'fixture_pages': len(pages),
+        'fixture_megabytes': round(sum(len(body) for body in pages.values()) / 1e6, 3),
+        'repeat': args.repeat,
+        'latency_ms': args.latency_ms,
+        'bandwidth_mbps': args.bandwidth_mbps,
+        'gzip': not args.no_gzip,
+        'api_content': args.api_content,
+        'proxy_args': shlex.split(args.proxy_args),
+        'results': results,
+    }
+    print(json.dumps(record, indent=2))
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import json  # Import modul json untuk file checkpoint dan jurnal
+import os  # Import modul os untuk fsync dan rename atomik
+import time  # Import modul time untuk interval checkpoint
+
+# Jeda minimal (detik) antar checkpoint berkala
+DEFAULT_CHECKPOINT_INTERVAL = 30
+
+# Versi format file checkpoint
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Checkpoint tahan crash untuk scraping yang lama.
+
+    Setiap halaman baru ditambahkan ke jurnal (file JSON Lines <path>.journal), sehingga
+    checkpoint tidak perlu menulis ulang seluruh file hasil. Secara berkala, jurnal di-fsync
+    lalu state (frontier, status retry, dan posisi akhir jurnal yang sudah aman) ditulis ke
+    file sementara, di-fsync, dan di-rename secara atomik menjadi <path>. File checkpoint
+    selalu lengkap dan hanya merujuk ke bagian jurnal yang sudah ada di disk; data di jurnal
+    setelah posisi tersebut dibuang saat resume.
+
+    Metode:
+    - start: Memulai checkpoint baru (checkpoint dan jurnal lama dihapus).
+    - resume: Memuat state dan halaman dari checkpoint terakhir.
+    - record: Menambahkan satu halaman baru ke jurnal.
+    - due: Memeriksa apakah sudah waktunya checkpoint berkala.
+    - save: Menulis checkpoint.
+    - finish: Menghapus checkpoint dan jurnal setelah scraping selesai.
+
+    Atribut:
+    - path: Path file checkpoint.
+    - journal_path: Path file jurnal.
+    - interval: Jeda minimal antar checkpoint berkala (detik).
+    """
+
+    def __init__(self, path, interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.journal_path = f'{path}.journal'
+        self.interval = interval
+        self.journal = None
+        self.pending = 0
+        self.saved_at = time.monotonic()
+
+    def exists(self):
+        """
+        Memeriksa apakah ada checkpoint dari scraping sebelumnya.
+        """
+        return os.path.exists(self.path)
+
+    def start(self):
+        """
+        Memulai checkpoint baru; checkpoint dan jurnal lama dihapus.
+        """
+        remove_file(self.path)
+        self.journal = open(self.journal_path, 'wb')
+        self.saved_at = time.monotonic()
+
+    def resume(self):
+        """
+        Memuat checkpoint terakhir. Jurnal dipotong ke posisi yang tercatat di checkpoint, lalu
+        dibuka lagi untuk ditambah.
+
+        Returns:
+        - tuple: (state dictionary, list halaman dari jurnal).
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Versi checkpoint {self.path} tidak dikenal: {state.get('version')}")
+
+        offset = state['journal_offset']
+        with open(self.journal_path, 'ab+') as f:
+            f.seek(0)
+            content = f.read(offset)
+            f.truncate(offset)
+        if len(content) < offset:
+            raise ValueError(f"Jurnal {self.journal_path} lebih pendek dari checkpoint ({len(content)} < {offset} bytes)")
+        pages = [json.loads(line) for line in content.splitlines()]
+        self.journal = open(self.journal_path, 'ab')
+        self.saved_at = time.monotonic()
+        return state, pages
+
+    def record(self, data):
+        """
+        Menambahkan satu halaman baru ke jurnal (di-fsync saat checkpoint berikutnya).
+        """
+        self.journal.write(json.dumps(data, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.pending += 1
+
+    def due(self):
+        """
+        Memeriksa apakah ada halaman baru dan jeda sejak checkpoint terakhir sudah lewat.
+        """
+        return self.pending > 0 and time.monotonic() - self.saved_at >= self.interval
+
+    def save(self, state):
+        """
+        Menulis checkpoint: jurnal di-fsync terlebih dahulu, lalu state beserta posisi akhir
+        jurnal ditulis secara atomik.
+
+        Args:
+        - state (dict): State yang bisa di-serialize ke JSON.
+        """
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        state = dict(state, version=CHECKPOINT_VERSION, journal_offset=self.journal.tell(), saved_at=time.time())
+        write_atomic(self.path, json.dumps(state, ensure_ascii=False).encode('utf-8'))
+        self.pending = 0
+        self.saved_at = time.monotonic()
+
+    def finish(self):
+        """
+        Menutup dan menghapus checkpoint dan jurnal (dipanggil setelah file hasil tersimpan).
+        """
+        self.close()
+        remove_file(self.path)
+        remove_file(self.journal_path)
+
+    def close(self):
+        """
+        Menutup jurnal tanpa menghapus checkpoint.
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+def write_atomic(path, content):
+    """
+    Menulis file secara atomik: isi ditulis ke file sementara, di-fsync, lalu di-rename
+    menggantikan path, dan folder di-fsync agar rename tersebut juga tersimpan di disk.
+
+    Args:
+    - path (str): Path file tujuan.
+    - content (bytes): Isi file.
+    """
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def fsync_directory(path):
+    """
+    Menyimpan isi folder (entri file hasil rename) ke disk. Tidak didukung di Windows.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def remove_file(path):
+    """
+    Menghapus file jika ada.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
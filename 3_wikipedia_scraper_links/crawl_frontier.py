@@ -0,0 +1,253 @@
+import base64  # Import modul base64 untuk bit bloom filter di file checkpoint
+import hashlib  # Import modul hashlib untuk posisi bit bloom filter
+import heapq  # Import modul heapq untuk antrean prioritas frontier
+import math  # Import modul math untuk ukuran bloom filter
+import urllib.parse  # Import modul urllib.parse untuk normalisasi URL
+import zlib  # Import modul zlib untuk mengompresi bit bloom filter di file checkpoint
+
+# Awalan path artikel Wikipedia
+WIKI_PATH = '/wiki/'
+
+# Namespace MediaWiki yang bukan artikel (dibandingkan dalam huruf kecil, '_' diganti spasi)
+NON_ARTICLE_NAMESPACES = frozenset([
+    'talk', 'user', 'user talk', 'wikipedia', 'wikipedia talk', 'wp', 'project', 'file', 'file talk', 'image',
+    'media', 'mediawiki', 'mediawiki talk', 'template', 'template talk', 'help', 'help talk', 'category',
+    'category talk', 'portal', 'portal talk', 'draft', 'draft talk', 'timedtext', 'timedtext talk', 'module',
+    'module talk', 'special', 'book', 'book talk', 'gadget', 'gadget talk', 'gadget definition',
+    'gadget definition talk',
+])
+
+# Karakter yang tidak di-percent-encode pada judul di URL MediaWiki (selain huruf, angka, dan '_.-~')
+TITLE_SAFE_CHARS = ';@$!*(),/:'
+
+# Port default yang dihapus dari URL
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Batas default crawl: kedalaman link dari seed, dan jumlah URL yang boleh menunggu di frontier
+DEFAULT_MAX_DEPTH = 1
+DEFAULT_MAX_FRONTIER = 500000
+
+# Kapasitas dan peluang false positive default bloom filter URL yang sudah terlihat
+# (1 juta URL dengan peluang 0.01% memakai sekitar 2.4 MB)
+DEFAULT_BLOOM_CAPACITY = 1000000
+DEFAULT_ERROR_RATE = 0.0001
+
+
+class BloomFilter:
+    """
+    Bloom filter untuk menandai URL yang sudah terlihat dengan memori tetap.
+
+    Memori yang dipakai hanya bergantung pada kapasitas dan peluang false positive, bukan pada
+    panjang URL. Jika lebih banyak URL dari kapasitas yang ditambahkan, peluang false positive
+    naik (URL baru dianggap sudah terlihat dan dilewati), tetapi memori tetap sama.
+
+    Metode:
+    - add: Menandai item, mengembalikan True jika item belum pernah terlihat.
+    - __contains__: Memeriksa apakah item (mungkin) sudah terlihat.
+    - state, from_state: Menyimpan dan memulihkan isi bloom filter (untuk checkpoint).
+
+    Atribut:
+    - size: Jumlah bit.
+    - hashes: Jumlah posisi bit per item.
+    - count: Jumlah item yang ditambahkan.
+    """
+
+    def __init__(self, capacity=DEFAULT_BLOOM_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        """
+        Posisi bit untuk item dengan double hashing dari satu digest BLAKE2b.
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        # Langkah 1..size-1: langkah kelipatan size membuat semua posisi jatuh di bit yang sama
+        second = int.from_bytes(digest[8:], 'little') % (self.size - 1) + 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """
+        Menandai item sebagai sudah terlihat.
+
+        Returns:
+        - bool: True jika item belum pernah terlihat sebelumnya.
+        """
+        added = False
+        for position in self.positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+    def state(self):
+        """
+        Isi bloom filter sebagai dictionary yang bisa di-serialize ke JSON (bit dikompresi zlib).
+        """
+        return {'size': self.size, 'hashes': self.hashes, 'count': self.count,
+                'bits': base64.b64encode(zlib.compress(self.bits, 1)).decode('ascii')}
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Membuat bloom filter dari hasil state().
+        """
+        bloom = cls.__new__(cls)
+        bloom.size = state['size']
+        bloom.hashes = state['hashes']
+        bloom.count = state['count']
+        bloom.bits = bytearray(zlib.decompress(base64.b64decode(state['bits'])))
+        return bloom
+
+
+class Frontier:
+    """
+    Frontier crawl BFS: antrean prioritas URL yang akan diambil, diurutkan berdasarkan
+    kedalaman (jarak link dari seed) lalu urutan ditemukan.
+
+    Setiap URL hanya masuk sekali (dicek dengan bloom filter), URL yang lebih dalam dari
+    max_depth tidak dimasukkan, dan jika frontier sudah berisi max_size URL, URL baru dibuang
+    (karena urutan BFS, yang dibuang selalu URL terdalam).
+
+    Metode:
+    - add: Menambahkan URL pada kedalaman tertentu.
+    - mark_seen: Menandai URL sebagai sudah terlihat tanpa memasukkannya ke antrean.
+    - push: Memasukkan kembali URL yang sudah terlihat (misalnya untuk dicoba ulang).
+    - peek: Melihat URL berikutnya tanpa mengeluarkannya.
+    - pop: Mengambil URL berikutnya.
+    - state, from_state: Menyimpan dan memulihkan frontier (untuk checkpoint).
+
+    Atribut:
+    - max_depth: Kedalaman maksimal.
+    - max_size: Jumlah URL maksimal yang menunggu.
+    - seen: BloomFilter URL yang sudah terlihat.
+    - dropped: Jumlah URL yang dibuang karena frontier penuh.
+    """
+
+    def __init__(self, max_depth=DEFAULT_MAX_DEPTH, max_size=DEFAULT_MAX_FRONTIER, seen=None):
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.seen = seen if seen is not None else BloomFilter()
+        self.heap = []
+        self.counter = 0
+        self.dropped = 0
+
+    def add(self, url, depth):
+        """
+        Menambahkan URL (yang sudah dinormalisasi) pada kedalaman depth.
+
+        Returns:
+        - bool: True jika URL masuk ke antrean.
+        """
+        if depth > self.max_depth or not self.seen.add(url):
+            return False
+        if len(self.heap) >= self.max_size:
+            self.dropped += 1
+            return False
+        self.push(url, depth)
+        return True
+
+    def push(self, url, depth):
+        """
+        Memasukkan URL ke antrean tanpa pemeriksaan bloom filter dan batas ukuran, di belakang
+        URL lain dengan kedalaman yang sama.
+        """
+        heapq.heappush(self.heap, (depth, self.counter, url))
+        self.counter += 1
+
+    def mark_seen(self, url):
+        """
+        Menandai URL sebagai sudah terlihat (misalnya URL kanonis halaman redirect).
+        """
+        self.seen.add(url)
+
+    def peek(self):
+        """
+        Melihat URL berikutnya tanpa mengeluarkannya dari antrean.
+
+        Returns:
+        - tuple: (url, depth).
+        """
+        depth, _, url = self.heap[0]
+        return url, depth
+
+    def pop(self):
+        """
+        Mengambil URL dengan kedalaman terkecil yang paling awal ditemukan.
+
+        Returns:
+        - tuple: (url, depth).
+        """
+        depth, _, url = heapq.heappop(self.heap)
+        return url, depth
+
+    def __len__(self):
+        return len(self.heap)
+
+    def state(self):
+        """
+        Isi frontier (antrean dan bloom filter) sebagai dictionary yang bisa di-serialize ke JSON.
+        """
+        return {'max_depth': self.max_depth, 'max_size': self.max_size, 'counter': self.counter,
+                'dropped': self.dropped, 'heap': self.heap, 'seen': self.seen.state()}
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Membuat frontier dari hasil state(); urutan pengambilan URL sama persis dengan sebelumnya.
+        """
+        frontier = cls(state['max_depth'], state['max_size'], BloomFilter.from_state(state['seen']))
+        frontier.heap = [tuple(entry) for entry in state['heap']]
+        frontier.counter = state['counter']
+        frontier.dropped = state['dropped']
+        return frontier
+
+
+def canonicalize_url(href, base_url):
+    """
+    Menormalisasi link artikel Wikipedia sehingga URL yang merujuk ke artikel yang sama
+    menjadi string yang sama: link relatif diubah menjadi absolut, fragment (#...) dan query
+    dibuang, host ditulis huruf kecil tanpa port default dan tanpa subdomain mobile '.m',
+    spasi diganti '_', huruf pertama judul dijadikan kapital (seperti MediaWiki), dan
+    percent-encoding disamakan.
+
+    Args:
+    - href (str): Atribut href link (boleh relatif).
+    - base_url (str): URL halaman tempat link ditemukan.
+
+    Returns:
+    - str or None: URL kanonis, atau None jika link bukan artikel Wikipedia (misalnya
+      halaman Special:, Category:, atau link dengan query seperti ?action=edit).
+    """
+    try:
+        parts = urllib.parse.urlsplit(urllib.parse.urljoin(base_url, href.strip()))
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in DEFAULT_PORTS or not parts.path.startswith(WIKI_PATH) or parts.query:
+        return None
+
+    title = urllib.parse.unquote(parts.path[len(WIKI_PATH):]).replace(' ', '_').strip('_')
+    if not title:
+        return None
+    namespace, separator, _ = title.partition(':')
+    if separator and namespace.replace('_', ' ').lower() in NON_ARTICLE_NAMESPACES:
+        return None
+    first = title[0].upper()
+    if len(first) == 1:
+        title = first + title[1:]
+
+    host = (parts.hostname or '').replace('.m.wikipedia.org', '.wikipedia.org')
+    if port is not None and port != DEFAULT_PORTS[parts.scheme]:
+        host = f'{host}:{port}'
+    path = WIKI_PATH + urllib.parse.quote(title, safe=TITLE_SAFE_CHARS)
+    return urllib.parse.urlunsplit((parts.scheme, host, path, '', ''))
@@ -0,0 +1,360 @@
+import re  # Import modul re untuk referensi karakter numerik yang tidak lengkap
+import html.parser  # Import HTMLParser bawaan Python untuk engine SAX
+from html.entities import html5  # Import tabel entity HTML5 (sama dengan yang dipakai BeautifulSoup)
+
+# lxml (opsional) untuk engine tercepat; engine ini harus dipilih secara eksplisit (lihat DEFAULT_ENGINE)
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    etree = None
+    HAS_LXML = False
+
+# Tag tanpa tag penutup (sama dengan empty_element_tags BeautifulSoup untuk HTML)
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer',
+    'track', 'wbr',
+])
+
+# Teks di dalam tag ini tidak ikut get_text() BeautifulSoup (Script, Stylesheet, TemplateString, Ruby*)
+HIDDEN_TEXT_ELEMENTS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Di dalam tag ini teks yang hanya berisi spasi tidak diringkas
+PRESERVE_WHITESPACE_ELEMENTS = frozenset(['pre', 'textarea'])
+
+# Karakter spasi ASCII; teks yang hanya berisi karakter ini diringkas menjadi ' ' atau '\n'
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+class PageFields:
+    """
+    Hasil mentah ekstraksi satu halaman Wikipedia, dengan nilai yang sama persis dengan
+    hasil pencarian BeautifulSoup ('html.parser') di scraper.
+
+    Atribut:
+    - title: Teks span.mw-page-title-main (seperti .text, belum di-strip), None jika tidak ada.
+    - paragraphs: Teks setiap elemen p (seperti get_text(strip=True)).
+    - last_modified: Teks li#footer-info-lastmod (seperti get_text(strip=True)), None jika tidak ada.
+    - categories: Teks setiap li di ul pertama dalam div#mw-normal-catlinks.
+    - links: Atribut href setiap elemen a (belum dinormalisasi), sesuai urutan dokumen.
+    - canonical: Atribut href link rel="canonical" pertama, None jika tidak ada.
+    """
+
+    def __init__(self, title, paragraphs, last_modified, categories, links=None, canonical=None):
+        self.title = title
+        self.paragraphs = paragraphs
+        self.last_modified = last_modified
+        self.categories = categories
+        self.links = links if links is not None else []
+        self.canonical = canonical
+
+
+class PageCollector:
+    """
+    Pengumpul teks judul, paragraf, tanggal modifikasi, dan kategori (beserta href semua link
+    untuk mode crawl) dalam satu kali lintasan event start/end/data, menggantikan empat kali
+    find/find_all pada pohon BeautifulSoup.
+
+    Kelas ini mengikuti antarmuka parser target lxml (start, end, data, comment, close),
+    sehingga bisa dipakai langsung oleh etree.HTMLParser maupun oleh SAXParser. Tag yang
+    ditutup mengikuti aturan BeautifulSoup: tag penutup menutup tag terbuka terakhir dengan
+    nama yang sama, dan tag penutup tanpa pasangan diabaikan.
+    """
+
+    def __init__(self):
+        self.stack = []  # Tag yang sedang terbuka: [nama, jumlah capture yang dibuka, flag]
+        self.active = []  # Capture (list teks) milik tag yang sedang terbuka
+        self.pending = []  # Potongan teks yang belum digabung menjadi satu string
+        self.hidden = 0
+        self.preserve = 0
+        self.title = None
+        self.paragraphs = []
+        self.last_modified = None
+        self.categories = []
+        self.links = []
+        self.canonical = None
+        self.canonical_found = False
+        self.catlinks_found = False
+        self.category_list_found = False
+        self.in_catlinks = False
+        self.in_category_list = False
+
+    def start(self, tag, attrib):
+        """
+        Event tag pembuka.
+        """
+        self.flush()
+        active = self.active
+        opened = 0
+        flags = ''
+
+        if tag == 'p':
+            capture = []
+            self.paragraphs.append(capture)
+            active.append(capture)
+            opened += 1
+        elif tag == 'span':
+            if self.title is None and has_class(attrib.get('class'), 'mw-page-title-main'):
+                self.title = []
+                active.append(self.title)
+                opened += 1
+        elif tag == 'li':
+            if self.last_modified is None and attrib.get('id') == 'footer-info-lastmod':
+                self.last_modified = []
+                active.append(self.last_modified)
+                opened += 1
+            if self.in_category_list:
+                capture = []
+                self.categories.append(capture)
+                active.append(capture)
+                opened += 1
+        elif tag == 'a':
+            href = attrib.get('href')
+            if href is not None:
+                self.links.append(href)
+        elif tag == 'link':
+            if not self.canonical_found and has_class(attrib.get('rel'), 'canonical'):
+                self.canonical_found = True
+                self.canonical = attrib.get('href')
+        elif tag == 'div':
+            if not self.catlinks_found and attrib.get('id') == 'mw-normal-catlinks':
+                self.catlinks_found = self.in_catlinks = True
+                flags = 'catlinks'
+        elif tag == 'ul':
+            if self.in_catlinks and not self.category_list_found:
+                self.category_list_found = self.in_category_list = True
+                flags = 'category_list'
+        elif tag in HIDDEN_TEXT_ELEMENTS:
+            self.hidden += 1
+            flags = 'hidden'
+        elif tag in PRESERVE_WHITESPACE_ELEMENTS:
+            self.preserve += 1
+            flags = 'preserve'
+
+        self.stack.append((tag, opened, flags))
+
+    def end(self, tag):
+        """
+        Event tag penutup: menutup tag terbuka terakhir dengan nama yang sama beserta semua
+        tag di atasnya.
+        """
+        self.flush()
+        stack = self.stack
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(stack) > index:
+            name, opened, flags = stack.pop()
+            if opened:
+                del self.active[-opened:]
+            if flags == 'hidden':
+                self.hidden -= 1
+            elif flags == 'preserve':
+                self.preserve -= 1
+            elif flags == 'catlinks':
+                self.in_catlinks = False
+            elif flags == 'category_list':
+                self.in_category_list = False
+
+    def data(self, data):
+        """
+        Event teks. Potongan teks digabung sampai event berikutnya, seperti satu NavigableString.
+        """
+        self.pending.append(data)
+
+    def comment(self, text):
+        """
+        Event komentar: hanya memisahkan string teks, isinya diabaikan.
+        """
+        self.flush()
+
+    def cdata(self, text):
+        """
+        Event blok CDATA: ikut get_text() seperti CData di BeautifulSoup.
+        """
+        self.flush()
+        self.pending.append(text)
+        hidden, self.hidden = self.hidden, 0
+        self.flush()
+        self.hidden = hidden
+
+    def flush(self):
+        """
+        Menggabungkan potongan teks yang tertunda menjadi satu string dan menambahkannya ke
+        semua capture yang aktif.
+        """
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+        if self.hidden or not self.active:
+            return
+        if not self.preserve and not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        for capture in self.active:
+            capture.append(text)
+
+    def close(self):
+        """
+        Akhir dokumen: mengembalikan PageFields.
+        """
+        self.flush()
+        return PageFields(
+            ''.join(self.title) if self.title is not None else None,
+            [join_stripped(capture) for capture in self.paragraphs],
+            join_stripped(self.last_modified) if self.last_modified is not None else None,
+            [join_stripped(capture) for capture in self.categories],
+            self.links,
+            self.canonical,
+        )
+
+
+class SAXParser(html.parser.HTMLParser):
+    """
+    Parser streaming berbasis HTMLParser bawaan Python (tokenizer yang sama dengan
+    BeautifulSoup 'html.parser') yang meneruskan event ke PageCollector tanpa membangun pohon.
+    """
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=False)
+        self.collector = collector
+        self.closed_void = []  # Tag void yang sudah ditutup; tag penutupnya nanti diabaikan
+
+    def handle_starttag(self, tag, attrs, close_void=True):
+        self.collector.start(tag, dict(attrs))
+        if close_void and tag in VOID_ELEMENTS:
+            self.collector.end(tag)
+            self.closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, close_void=False)
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.closed_void:
+            self.closed_void.remove(tag)
+        else:
+            self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_charref(self, name):
+        self.collector.data(charref_text(name))
+
+    def handle_entityref(self, name):
+        self.collector.data(html5.get(name + ';', '&' + name))
+
+    def handle_comment(self, data):
+        self.collector.comment(data)
+
+    def handle_decl(self, decl):
+        self.collector.flush()
+
+    def handle_pi(self, data):
+        self.collector.flush()
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.collector.cdata(data[len('CDATA['):])
+        else:
+            self.collector.flush()
+
+
+def has_class(value, name):
+    """
+    Memeriksa apakah atribut yang dipisah spasi (class atau rel) memuat name.
+    """
+    return value is not None and (value == name or name in value.split())
+
+
+def join_stripped(strings):
+    """
+    Menggabungkan string seperti get_text(strip=True): setiap string di-strip, lalu
+    disatukan tanpa pemisah.
+    """
+    return ''.join([s.strip() for s in strings])
+
+
+def charref_text(name):
+    """
+    Mengubah referensi karakter numerik (misalnya '91' atau 'x5B') menjadi teks, dengan aturan
+    yang sama seperti BeautifulSoup (mengikuti spesifikasi HTML).
+    """
+    base, digits, pattern = (16, name[1:], r'[0-9a-f]+') if name[:1] in ('x', 'X') else (10, name, r'[0-9]+')
+    extra = ''
+    try:
+        number = int(digits, base)
+    except ValueError:
+        match = re.match(pattern, digits)
+        if match is None:
+            return name
+        number, extra = int(match.group(), base), digits[match.end():]
+
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return '\ufffd' + extra
+    if 0x80 <= number <= 0x9F:
+        try:
+            return bytes([number]).decode('cp1252') + extra
+        except UnicodeDecodeError:
+            pass
+    return chr(number) + extra
+
+
+def extract_lxml(html_text):
+    """
+    Engine lxml: parser HTML libxml2 memanggil PageCollector sebagai parser target
+    (tanpa membangun pohon elemen).
+    """
+    if isinstance(html_text, bytes):
+        parser = etree.HTMLParser(target=PageCollector(), encoding='utf-8', huge_tree=True)
+    else:
+        parser = etree.HTMLParser(target=PageCollector(), huge_tree=True)
+    parser.feed(html_text)
+    return parser.close()
+
+
+def extract_sax(html_text):
+    """
+    Engine SAX: HTMLParser bawaan Python tanpa dependensi tambahan.
+    """
+    if isinstance(html_text, bytes):
+        html_text = html_text.decode('utf-8', 'replace')
+    collector = PageCollector()
+    parser = SAXParser(collector)
+    parser.feed(html_text)
+    parser.close()
+    return collector.close()
+
+
+# Engine ekstraksi satu lintasan yang tersedia
+ENGINES = {'sax': extract_sax}
+if HAS_LXML:
+    ENGINES['lxml'] = extract_lxml
+
+# Engine default 'sax' mengikuti aturan html.parser (engine bs4) persis, termasuk untuk HTML yang rusak.
+# 'lxml' lebih cepat tetapi memakai aturan libxml2: <p> ditutup otomatis sebelum elemen blok (div, table,
+# ul, form, p bersarang, ...) dan entity tanpa ';' dibaca berbeda, sehingga content bisa berbeda dari bs4
+DEFAULT_ENGINE = 'sax'
+
+
+def extract(html_text, engine=DEFAULT_ENGINE):
+    """
+    Mengekstrak judul, paragraf, tanggal modifikasi, dan kategori halaman Wikipedia dalam
+    satu lintasan.
+
+    Args:
+    - html_text (str or bytes): HTML halaman (bytes dianggap UTF-8).
+    - engine (str): Nama engine di ENGINES ('lxml' atau 'sax').
+
+    Returns:
+    - PageFields: Hasil ekstraksi mentah.
+    """
+    try:
+        extract_page = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Engine ekstraksi tidak dikenal: {engine} (tersedia: {', '.join(ENGINES)})") from None
+    return extract_page(html_text)
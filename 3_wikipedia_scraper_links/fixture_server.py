@@ -0,0 +1,453 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import gzip  # Import modul gzip untuk body terkompresi seperti Wikipedia
+import html  # Import modul html untuk escape teks halaman buatan
+import http.server  # Import modul http.server untuk server HTTP lokal
+import json  # Import modul json untuk membaca scraped_data.json
+import os  # Import modul os untuk folder halaman tersimpan
+import re  # Import modul re untuk URL mirror dan link kanonis
+import time  # Import modul time untuk simulasi latensi dan bandwidth
+import urllib.parse  # Import modul urllib.parse untuk path /wiki/<judul>
+from datetime import datetime  # Import datetime untuk teks tanggal modifikasi terakhir
+
+import wikipedia_scraper_links
+
+# Folder halaman HTML yang direkam (sama seperti benchmark_extract.py) dan data asal halaman buatan
+DEFAULT_PAGES_DIR = 'pages'
+DEFAULT_DATA_PATH = 'scraped_data.json'
+
+# Port default server fixture
+DEFAULT_PORT = 9990
+
+# Jumlah kalimat per paragraf pada halaman buatan
+PARAGRAPH_SENTENCES = 4
+
+# Ukuran potongan body yang dikirim saat bandwidth dibatasi
+SEND_CHUNK_SIZE = 16384
+
+# Path halaman: /wiki/<judul>, dan mirror /wiki/<judul>_(<n>) yang menyajikan halaman yang sama
+WIKI_PATH = '/wiki/'
+MIRROR_PATTERN = re.compile(r'^(.+)_\((\d+)\)$')
+
+# Endpoint pengganti MediaWiki Action API (action=query) dan batasnya untuk klien biasa:
+# judul per permintaan, extract pembuka (exintro) per permintaan, dan kategori per permintaan.
+# Tanpa exintro, TextExtracts hanya mengembalikan satu extract per permintaan.
+API_PATH = '/w/api.php'
+API_MAX_TITLES = 50
+API_MAX_INTRO_EXTRACTS = 20
+API_MAX_CATEGORIES = 500
+
+# Link kanonis pada halaman rekaman (dibuang agar mirror tidak dianggap redirect oleh crawler)
+CANONICAL_PATTERN = re.compile(rb'<link\s+rel="canonical"[^>]*>', re.IGNORECASE)
+
+# Teks menu samping halaman buatan (seperti skin Vector Wikipedia)
+SIDEBAR_LINKS = [
+    'Main_Page', 'Wikipedia:Contents', 'Portal:Current_events', 'Special:Random', 'Wikipedia:About',
+    'Wikipedia:Contact_us', 'Help:Contents', 'Help:Introduction', 'Wikipedia:Community_portal',
+    'Special:RecentChanges', 'Wikipedia:File_upload_wizard', 'Special:WhatLinksHere', 'Special:SpecialPages',
+]
+
+
+def page_name(url):
+    """
+    Nama halaman dari URL Wikipedia, misalnya '.../wiki/Proxy_server' -> 'Proxy_server'.
+    """
+    return urllib.parse.unquote(urllib.parse.urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1])
+
+
+def split_paragraphs(content, sentences=PARAGRAPH_SENTENCES):
+    """
+    Memecah content (paragraf yang disatukan dengan spasi oleh scraper) menjadi paragraf
+    sehingga ' '.join(paragraf) sama persis dengan content dan setiap paragraf tidak berubah
+    oleh get_text(strip=True). Paragraf kosong (spasi ganda) tetap dipertahankan.
+
+    Returns:
+    - list: Teks setiap paragraf.
+    """
+    tokens = content.split(' ')
+    paragraphs = []
+    start = 0
+    count = 0
+    for i, token in enumerate(tokens):
+        if i == start and not token:
+            paragraphs.append('')
+            start = i + 1
+            continue
+        if token.endswith('.'):
+            count += 1
+        following = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if count >= sentences and token == token.strip() and following and following == following.strip():
+            paragraphs.append(' '.join(tokens[start:i + 1]))
+            start = i + 1
+            count = 0
+    if start < len(tokens):
+        paragraphs.append(' '.join(tokens[start:]))
+    if ' '.join(paragraphs) != content or any(paragraph != paragraph.strip() for paragraph in paragraphs):
+        return [content]
+    return paragraphs
+
+
+def render_page(item):
+    """
+    Membuat HTML halaman Wikipedia (struktur skin Vector: head dengan script, menu samping,
+    isi artikel, referensi, kategori, dan footer) dari satu data scraped_data.json, sehingga
+    scraper mengekstrak kembali data yang sama persis.
+
+    Args:
+    - item (dict): Data halaman dengan kunci title, url, content, createdAt, categories.
+
+    Returns:
+    - bytes: HTML halaman (UTF-8).
+    """
+    escape = html.escape
+    name = page_name(item['url'])
+    paragraphs = split_paragraphs(item['content'])
+    parts = [
+        '<!DOCTYPE html>\n<html class="client-nojs" lang="en" dir="ltr">\n<head>\n<meta charset="UTF-8">\n',
+        f'<title>{escape(item["title"])} - Wikipedia</title>\n',
+        '<script>document.documentElement.className="client-js";RLCONF=',
+        json.dumps({'wgPageName': name, 'wgTitle': item['title'], 'wgCategories': item['categories'],
+                    'wgRelevantPageName': name, 'wgIsArticle': True, 'wgAction': 'view'}),
+        ';RLSTATE={"ext.cite.styles":"ready","skins.vector.styles":"ready"};</script>\n',
+        '<link rel="stylesheet" href="/w/load.php?lang=en&amp;modules=skins.vector.styles&amp;only=styles&amp;skin=vector-2022">\n',
+        '</head>\n<body class="skin-vector mediawiki ltr sitedir-ltr">\n<div class="mw-page-container">\n',
+        '<nav id="mw-panel" class="vector-main-menu"><ul>\n',
+    ]
+    for link in SIDEBAR_LINKS:
+        parts.append(f'<li><a href="/wiki/{link}" title="{escape(link)}"><span>{escape(link.replace("_", " "))}</span></a></li>\n')
+    parts.append('</ul></nav>\n<main id="content" class="mw-body">\n')
+    if item['title'] != '' and item['title'] == item['title'].strip():
+        parts.append(f'<h1 id="firstHeading" class="firstHeading mw-first-heading">'
+                     f'<span class="mw-page-title-main">{escape(item["title"])}</span></h1>\n')
+    parts.append('<div id="bodyContent" class="vector-body"><div id="mw-content-text" class="mw-body-content">'
+                 '<div class="mw-content-ltr mw-parser-output" lang="en" dir="ltr">\n')
+    for index, paragraph in enumerate(paragraphs):
+        if index and index % 6 == 0:
+            parts.append(f'<div class="mw-heading mw-heading2"><h2 id="Section_{index}">Section {index}</h2>'
+                         f'<span class="mw-editsection"><a href="/w/index.php?title={name}&amp;action=edit&amp;section={index}">edit</a></span></div>\n')
+        parts.append(f'<p>{escape(paragraph)}</p>\n')
+
+    # Daftar referensi: potongan isi artikel dengan link eksternal, seperti bagian References
+    parts.append('<div class="reflist"><ol class="references">\n')
+    for index, paragraph in enumerate(paragraphs, 1):
+        snippet = escape(paragraph[:80])
+        parts.append(f'<li id="cite_note-{index}"><span class="mw-cite-backlink"><a href="#cite_ref-{index}">^</a></span> '
+                     f'<span class="reference-text"><cite class="citation web"><a class="external text" rel="nofollow" '
+                     f'href="https://example.org/ref/{index}">{snippet}</a></cite></span></li>\n')
+    parts.append('</ol></div>\n</div></div>\n')
+
+    if item['categories']:
+        parts.append('<div id="catlinks" class="catlinks"><div id="mw-normal-catlinks" class="mw-normal-catlinks">'
+                     '<a href="/wiki/Help:Category" title="Help:Category">Categories</a>: <ul>')
+        for category in item['categories']:
+            parts.append(f'<li><a href="/wiki/Category:{urllib.parse.quote(category.replace(" ", "_"))}">{escape(category)}</a></li>')
+        parts.append('</ul></div></div>\n')
+    parts.append('</div></main>\n<footer id="footer" class="mw-footer"><ul id="footer-info">\n')
+    try:
+        modified = datetime.strptime(item['createdAt'], '%Y-%m-%dT%H:%M:%SZ')
+        parts.append(f'<li id="footer-info-lastmod"> This page was last edited on {modified.day} '
+                     f'{modified:%B %Y}, at {modified:%H:%M} (UTC).</li>\n')
+    except ValueError:
+        pass  # Tanggal tidak ditemukan saat scraping: footer tanpa tanggal
+    parts.append('<li id="footer-info-copyright">Text is available under the '
+                 '<a rel="license" href="https://creativecommons.org/licenses/by-sa/4.0/">Creative Commons '
+                 'Attribution-ShareAlike License 4.0</a>; additional terms may apply.</li>\n'
+                 '</ul></footer>\n</div>\n</body>\n</html>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def load_fixture_pages(pages_dir=DEFAULT_PAGES_DIR, data_path=DEFAULT_DATA_PATH):
+    """
+    Memuat halaman fixture: halaman buatan dari setiap data di data_path, lalu halaman HTML yang
+    direkam di pages_dir (misalnya dengan 'benchmark_extract.py --fetch') menggantikan halaman
+    buatan dengan nama yang sama.
+
+    Args:
+    - pages_dir (str): Folder halaman rekaman (boleh tidak ada).
+    - data_path (str): File scraped_data.json (boleh tidak ada).
+
+    Returns:
+    - tuple: (dictionary nama halaman -> HTML dalam bytes, dictionary nama halaman -> data
+      yang diharapkan untuk halaman buatan).
+    """
+    pages = {}
+    expected = {}
+    if data_path and os.path.exists(data_path):
+        with open(data_path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                name = page_name(item['url'])
+                pages[name] = render_page(item)
+                expected[name] = item
+    if pages_dir and os.path.isdir(pages_dir):
+        for filename in sorted(os.listdir(pages_dir)):
+            if filename.endswith('.html'):
+                with open(os.path.join(pages_dir, filename), 'rb') as f:
+                    name = filename[:-len('.html')]
+                    pages[name] = CANONICAL_PATTERN.sub(b'', f.read())
+                    expected.pop(name, None)
+    return pages, expected
+
+
+def api_records(pages, expected):
+    """
+    Data halaman untuk endpoint API: data asal untuk halaman buatan, dan hasil ekstraksi
+    scraper untuk halaman rekaman.
+
+    Returns:
+    - dict: Nama halaman -> data (title, url, content, createdAt, categories).
+    """
+    records = dict(expected)
+    for name, body in pages.items():
+        if name not in records:
+            records[name] = wikipedia_scraper_links.parse_page(body.decode('utf-8', 'replace'), WIKI_PATH + name)
+    return records
+
+
+def api_limit(value, maximum):
+    """
+    Nilai parameter limit API ('max' atau angka), dibatasi maximum.
+    """
+    return maximum if value in (None, 'max') else max(1, min(int(value), maximum))
+
+
+def api_query(records, params):
+    """
+    Menjawab action=query dengan prop=extracts|categories|revisions seperti MediaWiki Action
+    API (formatversion=2): judul dinormalisasi, mirror <nama>_(<n>) dianggap halaman sendiri,
+    dan extract serta kategori dibagi ke beberapa permintaan lanjutan (continue) sesuai batas API.
+
+    Args:
+    - records (dict): Nama halaman -> data (lihat api_records).
+    - params (dict): Parameter query string.
+
+    Returns:
+    - dict: Respons API.
+    """
+    if params.get('action') != 'query':
+        return {'error': {'code': 'badvalue', 'info': 'Unrecognized value for parameter "action".'}}
+    titles = [title for title in params.get('titles', '').split('|') if title]
+    if len(titles) > API_MAX_TITLES:
+        return {'error': {'code': 'toomanyvalues',
+                          'info': f'Too many values supplied for parameter "titles". The limit is {API_MAX_TITLES}.'}}
+    props = set(params.get('prop', '').split('|'))
+    continuing = 'continue' in params
+
+    normalized = []
+    pages = []
+    found = []  # (halaman di respons, data) untuk halaman yang ada
+    seen = set()
+    for title in titles:
+        name = title.replace('_', ' ').strip()
+        name = name[:1].upper() + name[1:]
+        if name != title:
+            normalized.append({'from': title, 'to': name})
+        if name in seen:
+            continue
+        seen.add(name)
+        key = name.replace(' ', '_')
+        mirror = MIRROR_PATTERN.match(key)
+        record = records.get(key) or (records.get(mirror.group(1)) if mirror else None)
+        page = {'ns': 0, 'title': name}
+        if record is None:
+            page['missing'] = True
+        else:
+            found.append((page, record))
+        pages.append(page)
+
+    following = {}
+    if 'extracts' in props and (not continuing or 'excontinue' in params):
+        intro = 'exintro' in params
+        offset = int(params.get('excontinue', 0))
+        limit = api_limit(params.get('exlimit'), API_MAX_INTRO_EXTRACTS) if intro else 1
+        for page, record in found[offset:offset + limit]:
+            paragraphs = split_paragraphs(record['content'])
+            page['extract'] = paragraphs[0] if intro else '\n'.join(paragraphs)
+        if offset + limit < len(found):
+            following['excontinue'] = offset + limit
+    if 'categories' in props and (not continuing or 'clcontinue' in params):
+        categories = [(page, category) for page, record in found for category in record['categories']]
+        offset = int(params.get('clcontinue', 0))
+        limit = api_limit(params.get('cllimit'), API_MAX_CATEGORIES)
+        for page, category in categories[offset:offset + limit]:
+            page.setdefault('categories', []).append({'ns': 14, 'title': 'Category:' + category})
+        if offset + limit < len(categories):
+            following['clcontinue'] = offset + limit
+    if 'revisions' in props and not continuing:
+        for page, record in found:
+            try:
+                datetime.strptime(record['createdAt'], '%Y-%m-%dT%H:%M:%SZ')
+            except ValueError:
+                continue  # Tanggal tidak ditemukan saat scraping: tanpa revisi
+            page['revisions'] = [{'timestamp': record['createdAt']}]
+
+    query = {'pages': pages}
+    if normalized:
+        query['normalized'] = normalized
+    if following:
+        return {'continue': {**following, 'continue': '||'}, 'query': query}
+    return {'batchcomplete': True, 'query': query}
+
+
+def page_urls(base_url, names, count):
+    """
+    Membuat count URL halaman: nama halaman asli lalu mirror-nya (<nama>_(1), <nama>_(2), ...).
+
+    Args:
+    - base_url (str): URL server, misalnya 'http://127.0.0.1:9990'.
+    - names (list): Nama halaman fixture.
+    - count (int): Jumlah URL.
+
+    Returns:
+    - list: URL halaman.
+    """
+    urls = []
+    for index in range(count):
+        name = names[index % len(names)]
+        if index >= len(names):
+            name = f'{name}_({index // len(names)})'
+        urls.append(base_url + WIKI_PATH + urllib.parse.quote(name, safe="()_,:'"))
+    return urls
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Menyajikan halaman fixture di /wiki/<nama> (dan mirror /wiki/<nama>_(<n>)) serta pengganti
+    Action API di /w/api.php, dengan keep-alive, gzip jika klien memintanya, serta latensi dan
+    bandwidth yang bisa diatur (lihat FixtureServer).
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Header dan body dikirim terpisah; tanpa ini setiap respons tertahan delayed ACK
+
+    def do_GET(self):
+        server = self.server
+        parts = urllib.parse.urlsplit(self.path)
+        if server.latency:
+            time.sleep(server.latency)
+        if parts.path == API_PATH:
+            response = api_query(server.records, dict(urllib.parse.parse_qsl(parts.query)))
+            self.send(200, json.dumps(response, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+            return
+
+        name = urllib.parse.unquote(parts.path[len(WIKI_PATH):]) if parts.path.startswith(WIKI_PATH) else None
+        if name not in server.pages and name is not None:
+            mirror = MIRROR_PATTERN.match(name)
+            name = mirror.group(1) if mirror else None
+        if name not in server.pages:
+            self.send(404, b'<!DOCTYPE html><html><body><p>Halaman tidak ditemukan</p></body></html>',
+                      'text/html; charset=UTF-8')
+            return
+        self.send(200, server.pages[name], 'text/html; charset=UTF-8', server.gzipped.get(name))
+
+    def send(self, status, body, content_type, gzipped=None):
+        """
+        Mengirim respons lengkap. Body dikompresi gzip jika server dan klien mendukungnya
+        (gzipped adalah body yang sudah dikompresi sebelumnya, jika ada).
+        """
+        server = self.server
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if server.gzip and status == 200 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzipped if gzipped is not None else gzip.compress(body, 6, mtime=0)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.send_body(body)
+        if server.counters is not None:
+            with server.counters.get_lock():
+                server.counters[0] += 1
+                server.counters[1] += len(body)
+
+    def send_body(self, body):
+        """
+        Mengirim body, dipotong-potong dan diberi jeda jika bandwidth dibatasi.
+        """
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        start = time.monotonic()
+        for offset in range(0, len(body), SEND_CHUNK_SIZE):
+            self.wfile.write(body[offset:offset + SEND_CHUNK_SIZE])
+            delay = start + (offset + SEND_CHUNK_SIZE) / bandwidth - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def log_message(self, format, *args):
+        pass  # Log setiap permintaan dimatikan agar tidak memengaruhi pengukuran
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    """
+    Server HTTP lokal pengganti Wikipedia untuk benchmark scraper tanpa jaringan.
+
+    Atribut:
+    - pages: Dictionary nama halaman -> HTML dalam bytes.
+    - records: Dictionary nama halaman -> data untuk endpoint API (lihat api_records).
+    - gzipped: HTML setiap halaman yang sudah dikompresi gzip.
+    - latency: Jeda (detik) sebelum setiap respons.
+    - bandwidth: Batas kecepatan kirim per koneksi (bytes/detik), 0 berarti tanpa batas.
+    - gzip: True jika body dikirim terkompresi gzip ke klien yang memintanya.
+    - counters: multiprocessing.Array [jumlah respons, bytes body terkirim] yang bisa dibaca
+      proses lain (misalnya benchmark_scraper.py), None jika tidak dihitung.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, pages, latency=0, bandwidth=0, use_gzip=True, bind_and_activate=True,
+                 records=None, counters=None):
+        super().__init__(address, FixtureHandler, bind_and_activate)
+        self.pages = pages
+        self.records = records or {}
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.gzip = use_gzip
+        self.gzipped = {name: gzip.compress(body, 6, mtime=0) for name, body in pages.items()} if use_gzip else {}
+        self.counters = counters
+
+
+def run_server(sock, pages, latency=0, bandwidth=0, use_gzip=True, records=None, counters=None):
+    """
+    Menjalankan FixtureServer pada socket yang sudah listen (misalnya di proses terpisah
+    yang dibuat benchmark_scraper.py).
+    """
+    server = FixtureServer(sock.getsockname(), pages, latency, bandwidth, use_gzip, bind_and_activate=False,
+                           records=records, counters=counters)
+    server.socket.close()
+    server.socket = sock
+    server.serve_forever()
+
+
+def main():
+    """
+    Fungsi utama: menjalankan server fixture Wikipedia lokal sampai dihentikan (Ctrl-C).
+    """
+    parser = argparse.ArgumentParser(description='Server fixture Wikipedia lokal untuk benchmark scraper')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port server (default: {DEFAULT_PORT})')
+    parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR, help='Folder halaman HTML rekaman')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='File JSON asal halaman buatan')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Jeda sebelum setiap respons (milidetik)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=0,
+                        help='Batas bandwidth per koneksi (megabit/detik), 0 berarti tanpa batas')
+    parser.add_argument('--no-gzip', action='store_true', help='Kirim body tanpa kompresi gzip')
+    args = parser.parse_args()
+
+    pages, expected = load_fixture_pages(args.pages_dir, args.data)
+    if not pages:
+        parser.error(f'Tidak ada halaman di {args.pages_dir} maupun {args.data}')
+    server = FixtureServer(('127.0.0.1', args.port), pages, args.latency_ms / 1000,
+                           args.bandwidth_mbps * 1e6 / 8, not args.no_gzip, records=api_records(pages, expected))
+    print(f'Server fixture berjalan di http://127.0.0.1:{args.port}{WIKI_PATH} (API: {API_PATH}) '
+          f'dengan {len(pages)} halaman:')
+    for url in page_urls(f'http://127.0.0.1:{args.port}', sorted(pages), len(pages)):
+        print(f'  {url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import json  # Import modul json untuk membaca respons API
+import urllib.parse  # Import modul urllib.parse untuk URL endpoint dan judul halaman
+
+# Path endpoint MediaWiki Action API dan path artikel di setiap wiki
+API_PATH = '/w/api.php'
+WIKI_PATH = '/wiki/'
+
+# Jumlah judul maksimal per permintaan query (batas Action API untuk klien biasa)
+MAX_TITLES = 50
+
+# Isi artikel dari TextExtracts: 'full' (seluruh artikel, sama dengan content dari backend HTML;
+# TextExtracts hanya mengembalikan satu extract penuh per permintaan sehingga jumlah permintaan tetap
+# satu per halaman) atau 'intro' (hanya bagian pembuka, sampai 20 halaman per permintaan; content-nya
+# terpotong sehingga tidak boleh dicampur dengan data lengkap)
+CONTENT_CHOICES = ['full', 'intro']
+DEFAULT_CONTENT = 'full'
+
+# Batas jumlah lompatan normalisasi/redirect yang diikuti untuk satu judul
+MAX_REDIRECTS = 5
+
+
+class APIError(Exception):
+    """
+    Permintaan ke Action API gagal (status HTTP bukan 200 atau respons berisi error).
+    """
+
+
+class APIPage:
+    """
+    Data mentah satu halaman dari Action API (prop=extracts|categories|revisions).
+
+    Atribut:
+    - title: Judul halaman setelah normalisasi dan redirect.
+    - extract: Teks polos isi halaman (TextExtracts), None jika tidak ada.
+    - categories: Judul kategori yang tidak tersembunyi, misalnya 'Category:Web scraping'.
+    - timestamp: Waktu revisi terakhir ('YYYY-MM-DDTHH:MM:SSZ'), None jika tidak ada.
+    - missing: True jika halaman tidak ada di wiki.
+    """
+
+    __slots__ = ('title', 'extract', 'categories', 'timestamp', 'missing')
+
+    def __init__(self, title):
+        self.title = title
+        self.extract = None
+        self.categories = []
+        self.timestamp = None
+        self.missing = False
+
+
+def endpoint_and_title(url):
+    """
+    Endpoint API dan judul halaman dari URL artikel, misalnya
+    'https://en.wikipedia.org/wiki/Web_scraping' -> ('https://en.wikipedia.org/w/api.php', 'Web scraping').
+
+    Returns:
+    - tuple: (endpoint, judul), atau (None, None) jika URL bukan URL artikel /wiki/.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.path.startswith(WIKI_PATH):
+        return None, None
+    title = urllib.parse.unquote(parts.path[len(WIKI_PATH):]).replace('_', ' ').strip()
+    if not title:
+        return None, None
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, API_PATH, '', '')), title
+
+
+def query_params(titles, content=DEFAULT_CONTENT):
+    """
+    Parameter action=query untuk isi, kategori yang tidak tersembunyi, dan waktu revisi
+    terakhir beberapa halaman sekaligus (redirect diikuti).
+    """
+    params = {
+        'action': 'query', 'format': 'json', 'formatversion': '2', 'redirects': '1',
+        'prop': 'extracts|categories|revisions', 'titles': '|'.join(titles),
+        'explaintext': '1', 'exsectionformat': 'plain', 'exlimit': 'max',
+        'clshow': '!hidden', 'cllimit': 'max',
+        'rvprop': 'timestamp',
+    }
+    if content == 'intro':
+        params['exintro'] = '1'
+    return params
+
+
+def read_response(response, pages, aliases):
+    """
+    Membaca satu respons query dan menggabungkannya ke pages dan aliases (respons lanjutan
+    menambahkan extract dan kategori ke halaman yang sama).
+
+    Args:
+    - response: Respons HTTP dari http_client.
+    - pages (dict): Judul -> APIPage.
+    - aliases (dict): Judul asal -> judul hasil normalisasi atau redirect.
+
+    Returns:
+    - dict or None: Parameter continue untuk permintaan berikutnya, None jika sudah lengkap.
+
+    Raises:
+    - APIError: Jika status HTTP bukan 200 atau API mengembalikan error.
+    """
+    if response.status_code != 200:
+        raise APIError(f'HTTP {response.status_code} {response.reason}')
+    try:
+        result = json.loads(response.text)
+    except ValueError as e:
+        raise APIError(f'Respons API bukan JSON: {e}') from e
+    if 'error' in result:
+        raise APIError(f"{result['error'].get('code')}: {result['error'].get('info')}")
+
+    query = result.get('query', {})
+    for alias in query.get('normalized', []) + query.get('redirects', []):
+        aliases[alias['from']] = alias['to']
+    for item in query.get('pages', []):
+        page = pages.get(item['title'])
+        if page is None:
+            page = pages[item['title']] = APIPage(item['title'])
+        if item.get('missing') or item.get('invalid'):
+            page.missing = True
+        if 'extract' in item:
+            page.extract = item['extract']
+        page.categories.extend(category['title'] for category in item.get('categories', []))
+        if item.get('revisions'):
+            page.timestamp = item['revisions'][0].get('timestamp')
+    return result.get('continue')
+
+
+def query_pages(client, endpoint, titles, content=DEFAULT_CONTENT):
+    """
+    Mengambil data beberapa halaman dengan satu query (beserta permintaan lanjutannya).
+
+    Args:
+    - client (http_client.HTTPClient): Klien HTTP.
+    - endpoint (str): URL api.php.
+    - titles (list): Judul halaman (maksimal MAX_TITLES).
+    - content (str): 'intro' atau 'full' (lihat CONTENT_CHOICES).
+
+    Returns:
+    - dict: Judul yang diminta -> APIPage, None jika judul tidak valid.
+
+    Raises:
+    - APIError: Jika salah satu permintaan gagal.
+    """
+    params = query_params(titles, content)
+    pages = {}
+    aliases = {}
+    continuation = {}
+    while True:
+        response = client.get(endpoint + '?' + urllib.parse.urlencode({**params, **continuation}))
+        continuation = read_response(response, pages, aliases)
+        if not continuation:
+            break
+
+    results = {}
+    for title in titles:
+        resolved = title
+        for _ in range(MAX_REDIRECTS):
+            if resolved not in aliases:
+                break
+            resolved = aliases[resolved]
+        results[title] = pages.get(resolved)
+    return results
+
+
+def fetch_pages(urls, client, content=DEFAULT_CONTENT, batch_size=MAX_TITLES):
+    """
+    Mengambil data halaman untuk banyak URL artikel, batch_size judul per query. URL
+    dikelompokkan per wiki (endpoint) dengan urutan tetap.
+
+    Args:
+    - urls (list): URL artikel.
+    - client (http_client.HTTPClient): Klien HTTP.
+    - content (str): 'intro' atau 'full'.
+    - batch_size (int): Jumlah judul per query (maksimal MAX_TITLES).
+
+    Returns:
+    - dict: URL -> APIPage, None jika URL bukan artikel /wiki/ atau judulnya tidak valid.
+
+    Raises:
+    - APIError: Jika salah satu query gagal.
+    """
+    results = {}
+    groups = {}
+    for url in urls:
+        endpoint, title = endpoint_and_title(url)
+        if endpoint is None:
+            results[url] = None
+        else:
+            groups.setdefault(endpoint, []).append((url, title))
+    batch_size = max(1, min(batch_size, MAX_TITLES))
+    for endpoint, items in groups.items():
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            pages = query_pages(client, endpoint, list(dict.fromkeys(title for _, title in batch)), content)
+            for url, title in batch:
+                results[url] = pages.get(title)
+    return results
@@ -0,0 +1,159 @@
+import argparse  # Import modul argparse untuk membaca opsi baris perintah
+import json  # Import modul json untuk membaca file JSON hasil scraping
+import os  # Import modul os untuk rename atomik
+from datetime import datetime, timezone  # Import datetime untuk kolom createdAt bertipe timestamp
+
+# pyarrow (opsional) untuk menulis Parquet; tanpa pyarrow hanya output JSON yang tersedia
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    pq = None
+    HAS_PYARROW = False
+
+# Jumlah halaman per row group; satu row group ditulis (dan dibebaskan dari memori) setiap kali penuh
+DEFAULT_ROW_GROUP_SIZE = 1000
+
+# Kompresi kolom Parquet
+DEFAULT_COMPRESSION = 'zstd'
+COMPRESSION_CHOICES = ['zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none']
+
+# Format createdAt di JSON (lihat parse_last_modified di wikipedia_scraper_links.py)
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Kolom yang diberi statistik min/max agar filter bisa melewati row group; konten tidak perlu
+STATISTICS_COLUMNS = ['title', 'url', 'createdAt']
+
+# Kolom dengan banyak nilai berulang yang di-encode dengan dictionary
+DICTIONARY_COLUMNS = ['categories']
+
+# Urutan kolom sama dengan urutan key data halaman di JSON
+COLUMNS = ['title', 'url', 'content', 'createdAt', 'categories']
+
+
+def page_schema():
+    """
+    Schema Arrow untuk data halaman: createdAt sebagai timestamp UTC dan categories sebagai list.
+    """
+    return pa.schema([
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('content', pa.string()),
+        ('createdAt', pa.timestamp('s', tz='UTC')),
+        ('categories', pa.list_(pa.string())),
+    ])
+
+
+def parse_created_at(value):
+    """
+    Mengubah createdAt ('YYYY-MM-DDTHH:MM:SSZ') menjadi datetime UTC.
+
+    Returns:
+    - datetime or None: None jika tanggal tidak ditemukan (DATE_NOT_FOUND) atau formatnya lain.
+    """
+    try:
+        return datetime.strptime(value, DATE_FORMAT).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParquetSink:
+    """
+    Menulis data halaman ke file Parquet secara bertahap: halaman dikumpulkan per kolom dan
+    ditulis sebagai satu row group terkompresi setiap row_group_size halaman, sehingga memori
+    tetap terbatas selama crawl. File ditulis ke <path>.tmp dan di-rename secara atomik saat
+    close(); file Parquet baru bisa dibaca setelah footer-nya ditulis.
+
+    Metode:
+    - write: Menambahkan satu halaman.
+    - write_all: Menambahkan banyak halaman.
+    - flush: Menulis halaman yang terkumpul sebagai row group.
+    - close: Menulis row group terakhir dan footer, lalu me-rename file.
+
+    Atribut:
+    - path: Path file Parquet.
+    - rows: Jumlah halaman yang sudah ditambahkan.
+    """
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression=DEFAULT_COMPRESSION):
+        if not HAS_PYARROW:
+            raise ImportError('Output Parquet membutuhkan pyarrow (pip install pyarrow)')
+        self.path = path
+        self.temp_path = path + '.tmp'
+        self.row_group_size = row_group_size
+        self.schema = page_schema()
+        self.writer = pq.ParquetWriter(self.temp_path, self.schema, compression=compression,
+                                       use_dictionary=DICTIONARY_COLUMNS, write_statistics=STATISTICS_COLUMNS)
+        self.columns = {name: [] for name in COLUMNS}
+        self.rows = 0
+
+    def write(self, data):
+        """
+        Menambahkan satu halaman (dictionary dengan key COLUMNS).
+        """
+        columns = self.columns
+        columns['title'].append(data['title'])
+        columns['url'].append(data['url'])
+        columns['content'].append(data['content'])
+        columns['createdAt'].append(parse_created_at(data['createdAt']))
+        columns['categories'].append(data['categories'])
+        self.rows += 1
+        if len(columns['url']) >= self.row_group_size:
+            self.flush()
+
+    def write_all(self, pages):
+        for data in pages:
+            self.write(data)
+
+    def flush(self):
+        if not self.columns['url']:
+            return
+        table = pa.Table.from_pydict(self.columns, schema=self.schema)
+        self.writer.write_table(table, row_group_size=table.num_rows)
+        self.columns = {name: [] for name in COLUMNS}
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        os.replace(self.temp_path, self.path)
+
+
+def convert(json_path, parquet_path, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression=DEFAULT_COMPRESSION):
+    """
+    Mengubah file JSON hasil scraping menjadi file Parquet.
+
+    Returns:
+    - int: Jumlah halaman yang ditulis.
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        pages = json.load(f)
+    sink = ParquetSink(parquet_path, row_group_size, compression)
+    sink.write_all(pages)
+    sink.close()
+    return sink.rows
+
+
+def main():
+    """
+    Fungsi utama: mengubah file JSON hasil scraping (misalnya scraped_data.json) menjadi Parquet.
+    """
+    parser = argparse.ArgumentParser(description='Mengubah JSON hasil scraping menjadi Parquet (kolom)')
+    parser.add_argument('input', nargs='?', default='scraped_data.json', help='File JSON hasil scraping')
+    parser.add_argument('output', nargs='?', help='File Parquet (default: nama input dengan akhiran .parquet)')
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help='Jumlah halaman per row group')
+    parser.add_argument('--compression', default=DEFAULT_COMPRESSION, choices=COMPRESSION_CHOICES,
+                        help='Kompresi kolom')
+    args = parser.parse_args()
+    if not HAS_PYARROW:
+        parser.error('Output Parquet membutuhkan pyarrow (pip install pyarrow)')
+
+    output = args.output or os.path.splitext(args.input)[0] + '.parquet'
+    count = convert(args.input, output, args.row_group_size, args.compression)
+    print(f"{count} halaman disimpan di {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+import array  # Import modul array untuk menyimpan durasi per halaman secara ringkas
+import cProfile  # Import modul cProfile untuk profil deterministik satu run
+import collections  # Import modul collections untuk penghitung status dan stack sampel
+import contextlib  # Import modul contextlib untuk context manager tahap dan sesi
+import json  # Import modul json untuk trace JSON Lines
+import os  # Import modul os untuk nama file pada stack sampel
+import pstats  # Import modul pstats untuk ringkasan hasil cProfile
+import sys  # Import modul sys untuk frame thread yang sedang berjalan
+import threading  # Import modul threading untuk thread sampling profiler
+import time  # Import modul time untuk mengukur durasi
+import tracemalloc  # Import modul tracemalloc untuk alokasi memori per tahap
+
+# Pilihan profiler untuk satu run: cProfile (deterministik) atau sampling stack berkala
+PROFILERS = ['cprofile', 'sample']
+
+# Jeda antar sampel sampling profiler (detik)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Persentil yang dilaporkan di ringkasan
+PERCENTILES = (50, 90, 99)
+
+# Jumlah fungsi yang dicetak dari hasil profiler
+PROFILE_TOP = 25
+
+# Profiler yang sedang aktif; None berarti instrumentasi mati dan hook tahap tidak mencatat apa pun
+active = None
+
+# Context kosong yang dikembalikan hook saat instrumentasi mati (dipakai ulang, tanpa alokasi)
+NULL_CONTEXT = contextlib.nullcontext()
+
+
+def stage(name):
+    """
+    Hook untuk mengukur satu tahap pipeline (misalnya 'fetch', 'parse', 'extract', 'write').
+
+    Contoh:
+        with profiling.stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+
+    Tahap di dalam page() dicatat untuk halaman tersebut, tahap di luarnya untuk run. Tahap
+    tidak boleh bertingkat (alokasi memori per tahap memakai satu penanda puncak tracemalloc).
+    """
+    if active is None:
+        return NULL_CONTEXT
+    return active.stage(name)
+
+
+def page(url, depth=None):
+    """
+    Hook untuk satu halaman: semua tahap di dalamnya masuk ke satu baris trace.
+    """
+    if active is None:
+        return NULL_CONTEXT
+    return active.page(url, depth)
+
+
+def note(**fields):
+    """
+    Menambahkan field (misalnya status dan bytes) ke baris trace halaman yang sedang diproses.
+    """
+    if active is not None and active.record is not None:
+        active.record.update(fields)
+
+
+def percentile(values, percent):
+    """
+    Persentil nearest-rank dari list yang sudah diurutkan.
+    """
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+def distribution(values):
+    """
+    Ringkasan distribusi: jumlah, total, rata-rata, persentil, dan maksimum.
+    """
+    values = sorted(values)
+    total = sum(values)
+    summary = {'count': len(values), 'total': round(total, 6),
+               'mean': round(total / len(values), 6) if values else None}
+    for percent in PERCENTILES:
+        value = percentile(values, percent)
+        summary[f'p{percent}'] = round(value, 6) if value is not None else None
+    summary['max'] = round(values[-1], 6) if values else None
+    return summary
+
+
+class Profiler:
+    """
+    Instrumentasi per tahap untuk pipeline scraping yang berjalan berurutan (satu halaman pada
+    satu waktu). Setiap halaman menghasilkan satu baris JSON di file trace, dan ringkasan
+    dengan persentil ditulis sebagai baris terakhir saat close().
+
+    Metode:
+    - page: Context manager untuk satu halaman.
+    - stage: Context manager untuk satu tahap.
+    - summary: Ringkasan run sejauh ini.
+    - close: Menulis ringkasan dan menutup file trace.
+
+    Atribut:
+    - record: Baris trace halaman yang sedang diproses, None di luar page().
+    - durations: Dictionary tahap -> durasi (detik) per halaman.
+    - allocations: Dictionary tahap -> puncak alokasi (bytes) per halaman (jika trace_memory).
+    - run_stages: Durasi tahap di luar halaman, misalnya penyimpanan JSON di akhir run.
+    """
+
+    def __init__(self, trace_path=None, trace_memory=False):
+        self.trace = open(trace_path, 'w', encoding='utf-8') if trace_path else None
+        self.trace_memory = trace_memory
+        self.started_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if self.started_tracemalloc:
+            tracemalloc.start()
+        self.record = None
+        self.durations = collections.defaultdict(lambda: array.array('d'))
+        self.allocations = collections.defaultdict(lambda: array.array('q'))
+        self.page_seconds = array.array('d')
+        self.run_stages = collections.Counter()
+        self.statuses = collections.Counter()
+        self.pages = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def page(self, url, depth=None):
+        record = {'type': 'page', 'url': url, 'depth': depth, 'start': round(time.time(), 6), 'stages': {}}
+        if self.trace_memory:
+            record['alloc'] = {}
+        self.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 6)
+            self.record = None
+            self.finish_page(record)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        record = self.record
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if record is None:
+                self.run_stages[name] += seconds
+            else:
+                record['stages'][name] = record['stages'].get(name, 0) + seconds
+                if self.trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1] - before
+                    record['alloc'][name] = max(record['alloc'].get(name, 0), peak)
+
+    def finish_page(self, record):
+        """
+        Mencatat halaman yang selesai ke statistik run dan menulis baris trace-nya.
+        """
+        self.pages += 1
+        self.bytes += record.get('bytes', 0)
+        self.statuses[str(record.get('status'))] += 1
+        self.page_seconds.append(record['seconds'])
+        for name, seconds in record['stages'].items():
+            self.durations[name].append(seconds)
+            record['stages'][name] = round(seconds, 6)
+        for name, peak in record.get('alloc', {}).items():
+            self.allocations[name].append(peak)
+        if self.trace is not None:
+            self.trace.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def summary(self):
+        """
+        Ringkasan run: jumlah halaman, throughput, bytes, status, dan distribusi durasi (detik)
+        setiap tahap dan setiap halaman beserta persentilnya.
+
+        Returns:
+        - dict: Ringkasan (juga ditulis sebagai baris terakhir trace dengan 'type' 'summary').
+        """
+        seconds = time.perf_counter() - self.start
+        fetch_seconds = sum(self.durations.get('fetch', ()))
+        summary = {
+            'type': 'summary',
+            'pages': self.pages,
+            'seconds': round(seconds, 6),
+            'pages_per_second': round(self.pages / seconds, 3) if seconds else None,
+            'bytes': self.bytes,
+            'fetch_megabytes_per_second': round(self.bytes / fetch_seconds / 1e6, 3) if fetch_seconds else None,
+            'status': dict(self.statuses),
+            'page': distribution(self.page_seconds),
+            'stages': {name: distribution(values) for name, values in self.durations.items()},
+            'run_stages': {name: round(value, 6) for name, value in self.run_stages.items()},
+        }
+        if self.trace_memory:
+            summary['alloc_peak'] = {name: distribution(values) for name, values in self.allocations.items()}
+        return summary
+
+    def close(self):
+        """
+        Menulis ringkasan ke file trace, menutup file, dan menghentikan tracemalloc.
+
+        Returns:
+        - dict: Ringkasan run.
+        """
+        summary = self.summary()
+        if self.trace is not None:
+            self.trace.write(json.dumps(summary) + '\n')
+            self.trace.close()
+            self.trace = None
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+        return summary
+
+
+class Sampler:
+    """
+    Sampling profiler sederhana: thread terpisah mengambil stack thread target setiap interval
+    detik (sys._current_frames), sehingga overhead-nya tidak bergantung pada jumlah panggilan
+    fungsi. Thread sampler hanya mendapat giliran saat thread target melepas GIL (I/O atau
+    switch interval), sehingga fungsi yang melakukan system call cenderung lebih sering
+    terlihat. Hasilnya ditulis dalam format folded stack ('f1;f2;f3 jumlah') yang bisa dibaca
+    flamegraph.pl atau speedscope.
+
+    Atribut:
+    - counts: Counter stack -> jumlah sampel.
+    - samples: Jumlah sampel yang diambil.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.counts = collections.Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='profiling-sampler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def write(self, path):
+        """
+        Menulis stack sampel ke file dalam format folded stack.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f'{stack} {count}\n')
+
+    def top(self, limit=PROFILE_TOP):
+        """
+        Fungsi dengan sampel terbanyak, sendiri (paling atas di stack) dan kumulatif.
+
+        Returns:
+        - list: List tuple (fungsi, sampel sendiri, sampel kumulatif), urut menurun sampel sendiri.
+        """
+        own = collections.Counter()
+        cumulative = collections.Counter()
+        for stack, count in self.counts.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                cumulative[frame] += count
+        return [(frame, count, cumulative[frame]) for frame, count in own.most_common(limit)]
+
+
+def format_summary(summary):
+    """
+    Menyusun ringkasan Profiler menjadi tabel teks.
+    """
+    lines = [f"{summary['pages']} halaman dalam {summary['seconds']:.2f} detik "
+             f"({summary['pages_per_second'] or 0:.1f} halaman/detik), {summary['bytes'] / 1e6:.1f} MB diunduh",
+             f"{'tahap':<10}{'jumlah':>8}{'total s':>10}{'rata ms':>10}"
+             + ''.join(f"{f'p{percent} ms':>10}" for percent in PERCENTILES) + f"{'maks ms':>10}"]
+    rows = list(summary['stages'].items()) + [('halaman', summary['page'])]
+    for name, stats in rows:
+        if not stats['count']:
+            continue
+        lines.append(f"{name:<10}{stats['count']:>8}{stats['total']:>10.3f}{stats['mean'] * 1000:>10.2f}"
+                     + ''.join(f"{stats[f'p{percent}'] * 1000:>10.2f}" for percent in PERCENTILES)
+                     + f"{stats['max'] * 1000:>10.2f}")
+    for name, seconds in summary['run_stages'].items():
+        lines.append(f"{name:<10}{'(run)':>8}{seconds:>10.3f}")
+    for name, stats in summary.get('alloc_peak', {}).items():
+        lines.append(f"alokasi puncak {name}: p50 {stats['p50'] / 1024:.0f} KB, maks {stats['max'] / 1024:.0f} KB")
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def session(trace_path=None, trace_memory=False, profiler=None, profile_output=None,
+            sample_interval=DEFAULT_SAMPLE_INTERVAL):
+    """
+    Mengaktifkan instrumentasi untuk satu run. Tanpa argumen, tidak ada yang dipasang dan hook
+    tahap tetap tidak mencatat apa pun.
+
+    Args:
+    - trace_path (str, optional): File JSON Lines untuk trace per halaman dan ringkasan.
+    - trace_memory (bool): Jika True, catat juga puncak alokasi per tahap (tracemalloc, lambat).
+    - profiler (str, optional): 'cprofile' atau 'sample' untuk memprofil seluruh run.
+    - profile_output (str, optional): File hasil profiler (pstats untuk cprofile, folded stack
+      untuk sample).
+    - sample_interval (float): Jeda antar sampel sampling profiler (detik).
+
+    Yields:
+    - Profiler or None: Profiler yang aktif.
+    """
+    global active
+    tracer = Profiler(trace_path, trace_memory) if trace_path or trace_memory else None
+    run_profile = cProfile.Profile() if profiler == 'cprofile' else None
+    sampler = Sampler(sample_interval) if profiler == 'sample' else None
+    active = tracer
+    if sampler is not None:
+        sampler.start()
+    if run_profile is not None:
+        run_profile.enable()
+    try:
+        yield tracer
+    finally:
+        if run_profile is not None:
+            run_profile.disable()
+        if sampler is not None:
+            sampler.stop()
+        active = None
+
+        if tracer is not None:
+            print('\n' + format_summary(tracer.close()))
+            if trace_path:
+                print(f"Trace per halaman disimpan di {trace_path}")
+        if run_profile is not None:
+            if profile_output:
+                run_profile.dump_stats(profile_output)
+                print(f"Profil cProfile disimpan di {profile_output}")
+            print()
+            pstats.Stats(run_profile, stream=sys.stdout).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        if sampler is not None:
+            if profile_output:
+                sampler.write(profile_output)
+                print(f"{sampler.samples} sampel (folded stack) disimpan di {profile_output}")
+            print(f"\n{'sendiri':>8}{'kumulatif':>11}  fungsi")
+            for frame, own, cumulative in sampler.top():
+                print(f"{own / max(sampler.samples, 1):>8.1%}{cumulative / max(sampler.samples, 1):>11.1%}  {frame}")
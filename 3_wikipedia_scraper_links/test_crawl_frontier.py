@@ -0,0 +1,46 @@
+import hashlib  # Import modul hashlib untuk menghitung langkah double hashing versi lama
+import unittest  # Import modul unittest untuk regression test
+
+import crawl_frontier  # Import modul yang diuji
+
+
+class BloomFilterTest(unittest.TestCase):
+    """
+    Regression test untuk BloomFilter.positions.
+    """
+
+    def old_step(self, item):
+        """
+        Langkah double hashing sebelum perbaikan (digest | 1, tidak dibatasi ukuran filter).
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[8:], 'little') | 1
+
+    def test_step_multiple_of_size_uses_several_bits(self):
+        # Ukuran ganjil (9 bit, 6 hash) agar langkah lama yang selalu ganjil bisa menjadi kelipatannya
+        bloom = crawl_frontier.BloomFilter(capacity=1, error_rate=0.02)
+        self.assertEqual((bloom.size, bloom.hashes), (9, 6))
+        items = [f'http://127.0.0.1/wiki/Page_{i}' for i in range(200)]
+        affected = [item for item in items if self.old_step(item) % bloom.size == 0]
+        self.assertTrue(affected)
+        for item in affected:
+            self.assertGreater(len(set(bloom.positions(item))), 1, item)
+
+    def test_positions_in_range(self):
+        bloom = crawl_frontier.BloomFilter(capacity=100, error_rate=0.01)
+        for i in range(500):
+            positions = bloom.positions(f'item-{i}')
+            self.assertEqual(len(positions), bloom.hashes)
+            self.assertTrue(all(0 <= position < bloom.size for position in positions))
+
+    def test_added_items_are_seen(self):
+        bloom = crawl_frontier.BloomFilter(capacity=1000, error_rate=0.001)
+        items = [f'http://127.0.0.1/wiki/Page_{i}' for i in range(1000)]
+        self.assertTrue(all(bloom.add(item) for item in items[:10]))
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,54 +1,140 @@
 import os
 import json
-import requests
+import argparse
+import functools
 from bs4 import BeautifulSoup
 from datetime import datetime
 
-def get_page_content(url):
+import http_client
+import fast_extract
+import html_cache
+import crawl_frontier
+import checkpoint
+import profiling
+import parquet_sink
+import mediawiki_api
+
+# Nilai default jika judul atau tanggal modifikasi terakhir tidak ditemukan
+TITLE_NOT_FOUND = "Judul tidak ditemukan"
+DATE_NOT_FOUND = "Last modification date not found"
+
+# Engine ekstraksi: 'bs4' (BeautifulSoup, empat kali pencarian pada pohon) atau engine satu
+# lintasan dari fast_extract: 'sax' (default, hasilnya identik dengan bs4) atau 'lxml' (lebih cepat,
+# tetapi content bisa berbeda dari bs4 pada HTML yang rusak; lihat fast_extract.DEFAULT_ENGINE)
+ENGINE_CHOICES = ['bs4'] + list(fast_extract.ENGINES)
+DEFAULT_ENGINE = fast_extract.DEFAULT_ENGINE
+
+# Jumlah halaman baru maksimal yang diambil dalam satu kali crawl
+DEFAULT_MAX_PAGES = 100
+
+# Jumlah percobaan ulang untuk halaman yang gagal diambil
+DEFAULT_RETRIES = 2
+
+# Cara mengambil halaman: 'html' (halaman /wiki/ penuh, satu permintaan per halaman) atau 'api'
+# (MediaWiki Action API, sampai 50 halaman per permintaan)
+BACKENDS = ['html', 'api']
+
+# Peluang false positive bloom filter untuk list URL tanpa --crawl; URL di list tidak boleh
+# terlewat, dan ukurannya hanya sekitar 5 KB per 1000 URL
+SEED_ERROR_RATE = 1e-9
+
+# Akhiran nama file checkpoint (misalnya 'scraped_data.json.checkpoint')
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+def get_page_content(url, cache=None, with_links=False, proxy=None):
     """
     Mengambil konten halaman web dari URL yang diberikan.
 
     Args:
     - url (str): URL halaman web yang akan diambil kontennya.
+    - cache (html_cache.HTMLCache, optional): Cache tempat body HTML mentah disimpan untuk --replay.
+    - with_links (bool): Jika True, kembalikan juga link halaman (lihat parse_page).
+    - proxy (str, optional): URL proxy (misalnya 'http://localhost:9919').
 
     Returns:
     - dict or None: Data halaman web yang telah diambil, termasuk judul, URL, konten, tanggal modifikasi terakhir, dan kategori. Mengembalikan None jika permintaan gagal atau konten tidak dapat diambil.
     """
-    # Mengirim permintaan GET ke URL
-    response = requests.get(url)
+    # Mengirim permintaan GET ke URL lewat klien HTTP bersama (koneksi persisten, timeout,
+    # kompresi gzip/brotli, HTTP/2 jika tersedia)
+    with profiling.stage('fetch'):
+        response = http_client.get_client(proxy).get(url)
+    profiling.note(status=response.status_code, bytes=len(response.content))
     
     # Memeriksa jika permintaan berhasil (status code 200)
     if response.status_code == 200:
-        # Menginisialisasi objek BeautifulSoup untuk parsing HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Mengekstrak judul halaman
-        title = extract_title(soup)
-        
-        # Mengekstrak konten utama dari halaman (paragraf)
-        content = extract_content(soup)
-        
-        # Mengekstrak tanggal modifikasi terakhir dari footer halaman
-        last_mod_date = extract_last_modified_date(soup)
-        
-        # Mengekstrak kategori-kategori dari halaman
-        categories = extract_categories(soup)
-        
-        # Menyusun data dalam bentuk dictionary
-        data = {
-            'title': title,
-            'url': url,
-            'content': content,
-            'createdAt': last_mod_date,
-            'categories': categories
-        }
-        
-        return data
+        if cache is not None:
+            with profiling.stage('cache'):
+                cache.put(url, response.content, html_cache.encoding_from_headers(response.headers))
+        with profiling.stage('decode'):
+            html = response.text
+        return parse_page(html, url, with_links=with_links)
     else:
         # Menampilkan pesan jika permintaan tidak berhasil
         print(f"Gagal mengambil halaman: {response.status_code} - {response.reason}")
         return None
 
+def parse_page(html, url, engine=DEFAULT_ENGINE, with_links=False):
+    """
+    Mengekstrak data halaman Wikipedia dari teks HTML.
+
+    Args:
+    - html (str): Teks HTML halaman.
+    - url (str): URL halaman tersebut.
+    - engine (str): Engine ekstraksi, salah satu dari ENGINE_CHOICES (default: DEFAULT_ENGINE).
+    - with_links (bool): Jika True, kembalikan juga href semua link dan href link kanonis (untuk mode crawl).
+
+    Returns:
+    - dict: Data halaman web, termasuk judul, URL, konten, tanggal modifikasi terakhir, dan kategori.
+      Jika with_links True: tuple (data, list href, href kanonis atau None).
+    """
+    if engine == 'bs4':
+        # Menginisialisasi objek BeautifulSoup untuk parsing HTML
+        with profiling.stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+        
+        with profiling.stage('extract'):
+            # Mengekstrak judul halaman
+            title = extract_title(soup)
+            
+            # Mengekstrak konten utama dari halaman (paragraf)
+            content = extract_content(soup)
+            
+            # Mengekstrak tanggal modifikasi terakhir dari footer halaman
+            last_mod_date = extract_last_modified_date(soup)
+            
+            # Mengekstrak kategori-kategori dari halaman
+            categories = extract_categories(soup)
+            
+            # Mengekstrak link (hanya untuk mode crawl)
+            if with_links:
+                links, canonical = extract_links(soup)
+    else:
+        # Judul, paragraf, tanggal, dan kategori dikumpulkan dalam satu lintasan (tahap parse)
+        with profiling.stage('parse'):
+            fields = fast_extract.extract(html, engine)
+        with profiling.stage('extract'):
+            title = fields.title.strip() if fields.title is not None else TITLE_NOT_FOUND
+            content = ' '.join([p.replace("\n", " ") for p in fields.paragraphs])
+            if fields.last_modified is not None:
+                last_mod_date = parse_last_modified(fields.last_modified)
+            else:
+                last_mod_date = DATE_NOT_FOUND
+            categories = fields.categories
+            links, canonical = fields.links, fields.canonical
+    
+    # Menyusun data dalam bentuk dictionary
+    data = {
+        'title': title,
+        'url': url,
+        'content': content,
+        'createdAt': last_mod_date,
+        'categories': categories
+    }
+    
+    if with_links:
+        return data, links, canonical
+    return data
+
 def extract_title(soup):
     """
     Ekstrak judul dari halaman web menggunakan objek BeautifulSoup.
@@ -66,7 +152,7 @@ def extract_title(soup):
     if title_span:
         title = title_span.text.strip()
     else:
-        title = "Judul tidak ditemukan"
+        title = TITLE_NOT_FOUND
     return title
 
 def extract_content(soup):
@@ -101,29 +187,42 @@ def extract_last_modified_date(soup):
     
     # Mengambil tanggal modifikasi jika ditemukan
     if last_mod_tag:
-        # Mengambil teks informasi modifikasi terakhir
-        last_mod_str = last_mod_tag.get_text(strip=True).replace('This page was last edited on ', '')
-        
-        # Memisahkan tanggal dan waktu dari informasi yang diambil
-        date_str = last_mod_str.split(',')[0]
-        time_str = last_mod_str.split(',')[1].split('(')[0].strip()
-        
-        # Mengambil zona waktu jika tersedia, jika tidak, menggunakan default UTC
-        timezone_str = last_mod_str.split('(')[1].split(')')[0] if '(' in last_mod_str else 'UTC'
-        
-        # Menggabungkan informasi dalam format lengkap
-        full_date_str = f"{date_str}, {time_str} ({timezone_str})"
-        
-        # Mengubah format string ke objek datetime
-        last_mod_datetime = datetime.strptime(full_date_str, '%d %B %Y, at %H:%M (%Z)')
-        
-        # Mengubah format datetime ke ISO 8601 dan mengembalikan sebagai string
-        last_mod_date = last_mod_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
+        last_mod_date = parse_last_modified(last_mod_tag.get_text(strip=True))
     else:
         # Mengembalikan string default jika informasi tanggal tidak ditemukan
-        last_mod_date = "Last modification date not found"
+        last_mod_date = DATE_NOT_FOUND
     return last_mod_date
 
+def parse_last_modified(text):
+    """
+    Mengubah teks footer-info-lastmod (misalnya 'This page was last edited on 5 March 2024, at 12:34 (UTC).')
+    menjadi tanggal ISO 8601.
+
+    Args:
+    - text (str): Teks informasi modifikasi terakhir.
+
+    Returns:
+    - str: Tanggal modifikasi terakhir dalam format 'YYYY-MM-DDTHH:MM:SSZ'.
+    """
+    # Mengambil teks informasi modifikasi terakhir
+    last_mod_str = text.replace('This page was last edited on ', '')
+    
+    # Memisahkan tanggal dan waktu dari informasi yang diambil
+    date_str = last_mod_str.split(',')[0]
+    time_str = last_mod_str.split(',')[1].split('(')[0].strip()
+    
+    # Mengambil zona waktu jika tersedia, jika tidak, menggunakan default UTC
+    timezone_str = last_mod_str.split('(')[1].split(')')[0] if '(' in last_mod_str else 'UTC'
+    
+    # Menggabungkan informasi dalam format lengkap
+    full_date_str = f"{date_str}, {time_str} ({timezone_str})"
+    
+    # Mengubah format string ke objek datetime
+    last_mod_datetime = datetime.strptime(full_date_str, '%d %B %Y, at %H:%M (%Z)')
+    
+    # Mengubah format datetime ke ISO 8601 dan mengembalikan sebagai string
+    return last_mod_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
+
 def extract_categories(soup):
     """
     Ekstrak kategori-kategori dari halaman web menggunakan objek BeautifulSoup.
@@ -138,8 +237,8 @@ def extract_categories(soup):
     catlinks_div = soup.find('div', id='mw-normal-catlinks')
     categories = []
     
-    # Jika div ditemukan
-    if catlinks_div:
+    # Jika div dan ul (daftar kategori) ditemukan
+    if catlinks_div and catlinks_div.find('ul'):
         # Mencari elemen ul (daftar kategori) di dalamnya
         category_items = catlinks_div.find('ul').find_all('li')
         
@@ -147,15 +246,22 @@ def extract_categories(soup):
         categories = [item.get_text(strip=True) for item in category_items]
     return categories
 
-# List untuk menyimpan data yang diambil
-results = []
+def extract_links(soup):
+    """
+    Ekstrak link dari halaman web menggunakan objek BeautifulSoup.
+
+    Args:
+    - soup (BeautifulSoup): Objek BeautifulSoup yang mewakili halaman web.
 
-# Periksa apakah file 'scraped_data.json' sudah ada
-if os.path.exists('scraped_data.json'):
-    with open('scraped_data.json', 'r', encoding='utf-8') as f:
-        existing_data = json.load(f)
-else:
-    existing_data = []
+    Returns:
+    - tuple: (list atribut href semua elemen a, href link rel="canonical" atau None).
+    """
+    links = [a['href'] for a in soup.find_all('a', href=True)]
+    
+    # Link kanonis menunjukkan artikel tujuan jika halaman ini adalah redirect
+    canonical_tag = soup.find('link', rel='canonical')
+    canonical = canonical_tag.get('href') if canonical_tag else None
+    return links, canonical
 
 # URLs yang akan diambil
 urls = [
@@ -166,40 +272,569 @@ urls = [
     "https://en.wikipedia.org/wiki/Social_media"
 ]
 
-# Iterasi melalui setiap URL, lakukan scraping data jika belum ada di existing_data, dan tambahkan hasilnya ke dalam list
-index = 1
-print("[WIKIPEDIA SCRAPER DIMULAI] ...\n")
-for url in urls:
-    url_found = False
-    
-    # Periksa setiap item dalam existing_data
-    for item in existing_data:
-        if item['url'] == url:
-            print(f"{index}. URL '{url}' sudah diambil sebelumnya.")
-            results.append(item)
-            url_found = True
-            break
-    
-    # Jika URL belum pernah diambil sebelumnya, lakukan scraping data dari URL tersebut
-    if not url_found:
-        print(f"{index}. Melakukan scraping data dari: {url}")
-        page_data = get_page_content(url)
+def load_existing_data(path='scraped_data.json'):
+    """
+    Memuat data yang sudah pernah di-scrape dari file JSON.
+
+    Args:
+    - path (str): Path file JSON (default: 'scraped_data.json').
+
+    Returns:
+    - list: Data yang sudah ada, atau list kosong jika file belum ada.
+    """
+    # Periksa apakah file 'scraped_data.json' sudah ada
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return []
+
+def save_data(data, path='scraped_data.json'):
+    """
+    Menyimpan data hasil scraping ke file JSON. File ditulis ke file sementara, di-fsync,
+    lalu di-rename secara atomik, sehingga crash saat menyimpan tidak merusak file lama.
+
+    Args:
+    - data (list): Data yang akan disimpan.
+    - path (str): Path file JSON (default: 'scraped_data.json').
+    """
+    checkpoint.write_atomic(path, json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8'))
+
+def crawl(seeds, existing_data, frontier, max_pages=None, cache=None, retries=DEFAULT_RETRIES, run_checkpoint=None,
+          state=None, proxy=None, sink=None):
+    """
+    Crawl BFS: mulai dari seed, ambil halaman dengan kedalaman terkecil dari frontier, lalu
+    masukkan link artikel /wiki/ di halaman tersebut ke frontier dengan kedalaman + 1. Dengan
+    frontier.max_depth 0, hanya seed yang diambil.
+
+    Halaman yang sudah ada di existing_data tidak disimpan ulang; link-nya tetap diikuti jika
+    kedalamannya belum mencapai batas. Jika cache diberikan, halaman yang sudah ada di cache
+    tidak diambil ulang. Saat link diikuti (frontier.max_depth > 0), seed dinormalisasi dengan
+    canonicalize_url dan halaman redirect disimpan dengan URL kanonis artikel tujuannya, lalu
+    dilewati jika link artikel tersebut sudah diikuti. Dengan max_depth 0 (mode list) setiap
+    halaman disimpan dengan URL yang diminta, sama seperti scraper tanpa --crawl. Halaman yang gagal diambil dicoba ulang
+    (di belakang URL lain dengan kedalaman yang sama) sampai retries kali.
+
+    Jika run_checkpoint diberikan, setiap halaman baru ditulis ke jurnal checkpoint dan state
+    crawl (frontier, status retry, dan penghitung) disimpan secara berkala serta saat crawl
+    dihentikan, sehingga crawl bisa dilanjutkan dengan state tersebut.
+
+    Args:
+    - seeds (iterable): URL awal (kedalaman 0).
+    - existing_data (list): Data yang sudah ada; halaman baru ditambahkan ke list ini.
+    - frontier (crawl_frontier.Frontier): Frontier beserta batas kedalaman dan ukurannya.
+    - max_pages (int, optional): Jumlah halaman baru maksimal, None berarti tanpa batas.
+    - cache (html_cache.HTMLCache, optional): Cache HTML mentah.
+    - retries (int): Jumlah percobaan ulang untuk halaman yang gagal diambil.
+    - run_checkpoint (checkpoint.Checkpoint, optional): Checkpoint yang sudah dimulai.
+    - state (dict, optional): State dari checkpoint sebelumnya (untuk --resume).
+    - proxy (str, optional): URL proxy.
+    - sink (parquet_sink.ParquetSink, optional): Output Parquet; setiap halaman baru juga ditulis ke sini.
+
+    Returns:
+    - int: Jumlah halaman baru yang diambil.
+    """
+    state = state or {}
+    done = {item['url'] for item in existing_data}
+    visited = set(state.get('visited', []))  # URL kanonis yang link-nya sudah diikuti pada crawl ini
+    attempts = state.get('attempts', {})  # URL -> jumlah percobaan yang gagal
+    scraped = state.get('scraped', 0)
+    index = state.get('index', 1)
+    follow_links = frontier.max_depth > 0
+    for url in seeds:
+        if follow_links:
+            url = crawl_frontier.canonicalize_url(url, url) or url
+        frontier.add(url, 0)
+    
+    def snapshot():
+        return {'frontier': frontier.state(), 'visited': list(visited), 'attempts': attempts,
+                'scraped': scraped, 'index': index, 'max_pages': max_pages, 'retries': retries}
+    
+    def visit(url, depth, prefix):
+        nonlocal scraped
+        # Halaman yang sudah ada dan link-nya tidak perlu diikuti: tidak diambil ulang
+        if url in done and depth >= frontier.max_depth:
+            print(f"{prefix} URL '{url}' sudah diambil sebelumnya.")
+            return
+        
+        cached = None
+        if cache is not None:
+            with profiling.stage('cache'):
+                cached = cache.get(url)
+        try:
+            if cached is not None:
+                print(f"{prefix} Mengikuti link dari cache: {url}")
+                profiling.note(source='cache')
+                result = parse_page(cached[0].decode(cached[1], 'replace'), url, with_links=True)
+            else:
+                print(f"{prefix} Melakukan scraping data dari: {url}")
+                result = get_page_content(url, cache, with_links=True, proxy=proxy)
+        except Exception as e:
+            print(f"Error: {e!r}")
+            profiling.note(error=repr(e))
+            result = None
+        
+        if result is None:
+            # Dicoba ulang di belakang URL lain dengan kedalaman yang sama
+            failures = attempts[url] = attempts.get(url, 0) + 1
+            if failures <= retries:
+                print(f"Gagal melakukan scraping data dari {url}, dicoba ulang nanti ({failures}/{retries})")
+                frontier.push(url, depth)
+            else:
+                print(f"Gagal melakukan scraping data dari {url}")
+                del attempts[url]
+            return
+        attempts.pop(url, None)
+        data, links, canonical = result
+        
+        # Halaman redirect saat crawl: gunakan URL kanonis artikel tujuan
+        canonical = crawl_frontier.canonicalize_url(canonical, url) if canonical and follow_links else None
+        if canonical and canonical != url:
+            frontier.mark_seen(canonical)
+            if canonical in visited:
+                print(f"Redirect ke {canonical} yang sudah diambil sebelumnya.")
+                return
+            data['url'] = url = canonical
+        visited.add(url)
         
-        # Jika scraping berhasil, tambahkan data ke results dan existing_data
-        if page_data:
+        if url not in done:
             print(f"Scraping berhasil untuk {url}")
-            results.append(page_data)
-            existing_data.append(page_data)  # Append data baru ke existing_data
+            existing_data.append(data)
+            done.add(url)
+            scraped += 1
+            if run_checkpoint is not None:
+                with profiling.stage('write'):
+                    run_checkpoint.record(data)
+            if sink is not None:
+                with profiling.stage('write'):
+                    sink.write(data)
+        
+        # Memasukkan link artikel ke frontier (duplikat dan link terlalu dalam diabaikan)
+        if depth < frontier.max_depth:
+            added = 0
+            with profiling.stage('frontier'):
+                for href in links:
+                    link = crawl_frontier.canonicalize_url(href, url)
+                    if link and frontier.add(link, depth + 1):
+                        added += 1
+            print(f"{added} link baru, {len(frontier) - 1} URL di frontier")
+    
+    completed = False
+    try:
+        while len(frontier) and (max_pages is None or scraped < max_pages):
+            # URL baru dikeluarkan dari frontier setelah selesai diproses, sehingga checkpoint
+            # yang disimpan saat crawl dihentikan di tengah halaman masih memuat URL tersebut
+            # pada urutan yang sama (link dan retry yang ditambahkan selalu berada di belakangnya)
+            url, depth = frontier.peek()
+            with profiling.page(url, depth):
+                visit(url, depth, f"{index}. [kedalaman {depth}]" if frontier.max_depth else f"{index}.")
+                frontier.pop()
+                index += 1
+                
+                if run_checkpoint is not None and run_checkpoint.due():
+                    with profiling.stage('write'):
+                        run_checkpoint.save(snapshot())
+        completed = True
+    finally:
+        # Crawl dihentikan (Ctrl-C atau error): simpan checkpoint terakhir untuk --resume
+        if run_checkpoint is not None and not completed:
+            run_checkpoint.save(snapshot())
+    
+    if frontier.dropped:
+        print(f"{frontier.dropped} link dibuang karena frontier penuh")
+    return scraped
+
+def api_page_data(page, url):
+    """
+    Menyusun data halaman dari hasil MediaWiki Action API dengan bentuk yang sama seperti
+    get_page_content.
+
+    Args:
+    - page (mediawiki_api.APIPage): Data halaman dari API.
+    - url (str): URL halaman.
+
+    Returns:
+    - dict: Data halaman web, termasuk judul, URL, konten, tanggal modifikasi terakhir, dan kategori.
+    """
+    # Paragraf extract dipisahkan baris baru; disatukan dengan spasi seperti paragraf HTML
+    content = ' '.join(line.strip() for line in (page.extract or '').split('\n') if line.strip())
+    
+    # Waktu revisi terakhir dibulatkan ke menit, sama seperti tanggal di footer halaman
+    if page.timestamp:
+        last_mod_date = page.timestamp[:16] + ':00Z'
+    else:
+        last_mod_date = DATE_NOT_FOUND
+    
+    # Judul kategori tanpa awalan namespace ('Category:Web scraping' -> 'Web scraping')
+    categories = [category.partition(':')[2] for category in page.categories]
+    
+    return {
+        'title': page.title,
+        'url': url,
+        'content': content,
+        'createdAt': last_mod_date,
+        'categories': categories
+    }
+
+def get_pages_via_api(urls, proxy=None, content=mediawiki_api.DEFAULT_CONTENT, batch_size=mediawiki_api.MAX_TITLES):
+    """
+    Mengambil data banyak halaman sekaligus lewat MediaWiki Action API (isi dari TextExtracts,
+    kategori, dan waktu revisi terakhir untuk sampai batch_size judul per permintaan) sebagai
+    pengganti get_page_content untuk setiap URL.
+
+    Args:
+    - urls (list): URL halaman.
+    - proxy (str, optional): URL proxy.
+    - content (str): 'intro' (bagian pembuka artikel) atau 'full' (seluruh artikel).
+    - batch_size (int): Jumlah judul per permintaan (maksimal 50).
+
+    Returns:
+    - dict: URL -> data halaman, None jika halaman tidak ada atau URL bukan artikel.
+
+    Raises:
+    - mediawiki_api.APIError atau requests.exceptions.RequestException: Jika permintaan gagal.
+    """
+    with profiling.stage('fetch'):
+        pages = mediawiki_api.fetch_pages(urls, http_client.get_client(proxy), content, batch_size)
+    results = {}
+    with profiling.stage('extract'):
+        for url, page in pages.items():
+            if page is None or page.missing:
+                results[url] = None
+                continue
+            results[url] = api_page_data(page, url)
+    return results
+
+def scrape_via_api(seeds, existing_data, frontier, max_pages=None, retries=DEFAULT_RETRIES, run_checkpoint=None,
+                   state=None, proxy=None, sink=None, content=mediawiki_api.DEFAULT_CONTENT,
+                   batch_size=mediawiki_api.MAX_TITLES):
+    """
+    Mengambil URL di frontier (tanpa mengikuti link) per batch lewat MediaWiki Action API
+    (get_pages_via_api): satu query untuk sampai batch_size halaman, bukan satu halaman HTML
+    penuh per URL. Halaman yang tidak ada di wiki tidak dicoba ulang; URL di batch yang gagal
+    diambil dicoba ulang sampai retries kali. Checkpoint dan output Parquet ditangani seperti
+    pada crawl; seperti mode list pada crawl, setiap halaman (termasuk redirect) disimpan
+    dengan URL yang diminta.
+
+    Args:
+    - seeds (iterable): URL yang akan diambil.
+    - existing_data (list): Data yang sudah ada; halaman baru ditambahkan ke list ini.
+    - frontier (crawl_frontier.Frontier): Antrean URL.
+    - max_pages (int, optional): Jumlah halaman baru maksimal, None berarti tanpa batas.
+    - retries (int): Jumlah percobaan ulang untuk URL yang gagal diambil.
+    - run_checkpoint (checkpoint.Checkpoint, optional): Checkpoint yang sudah dimulai.
+    - state (dict, optional): State dari checkpoint sebelumnya (untuk --resume).
+    - proxy (str, optional): URL proxy.
+    - sink (parquet_sink.ParquetSink, optional): Output Parquet.
+    - content (str): 'intro' atau 'full' (lihat get_pages_via_api).
+    - batch_size (int): Jumlah judul per permintaan API.
+
+    Returns:
+    - int: Jumlah halaman baru yang diambil.
+    """
+    state = state or {}
+    done = {item['url'] for item in existing_data}
+    attempts = state.get('attempts', {})  # URL -> jumlah percobaan yang gagal
+    scraped = state.get('scraped', 0)
+    index = state.get('index', 1)
+    for url in seeds:
+        frontier.add(url, 0)
+    batch = []
+    
+    def snapshot():
+        return {'frontier': frontier.state(), 'visited': [], 'attempts': attempts, 'scraped': scraped,
+                'index': index, 'max_pages': max_pages, 'retries': retries,
+                'backend': 'api', 'api_content': content, 'api_batch_size': batch_size}
+    
+    completed = False
+    try:
+        while len(frontier) and (max_pages is None or scraped < max_pages):
+            # Batch berikutnya: URL yang belum ada di data, tidak lebih dari sisa max_pages
+            limit = batch_size if max_pages is None else min(batch_size, max_pages - scraped)
+            while len(frontier) and len(batch) < limit:
+                url, _ = frontier.pop()
+                if url in done:
+                    print(f"{index}. URL '{url}' sudah diambil sebelumnya.")
+                    index += 1
+                else:
+                    batch.append(url)
+            if not batch:
+                continue
+            
+            print(f"Melakukan scraping {len(batch)} halaman lewat MediaWiki API ...")
+            with profiling.page(batch[0], 0):
+                profiling.note(batch=len(batch))
+                try:
+                    results = get_pages_via_api(batch, proxy, content, batch_size)
+                except Exception as e:
+                    print(f"Error: {e!r}")
+                    profiling.note(error=repr(e))
+                    results = None
+                
+                for url in batch:
+                    prefix = f"{index}."
+                    index += 1
+                    if results is None:
+                        # Dicoba ulang di belakang URL lain
+                        failures = attempts[url] = attempts.get(url, 0) + 1
+                        if failures <= retries:
+                            print(f"{prefix} Gagal melakukan scraping data dari {url}, dicoba ulang nanti ({failures}/{retries})")
+                            frontier.push(url, 0)
+                        else:
+                            print(f"{prefix} Gagal melakukan scraping data dari {url}")
+                            del attempts[url]
+                        continue
+                    attempts.pop(url, None)
+                    if results[url] is None:
+                        print(f"{prefix} Halaman {url} tidak ditemukan")
+                        continue
+                    data = results[url]
+                    
+                    print(f"{prefix} Scraping berhasil untuk {url}")
+                    existing_data.append(data)
+                    done.add(url)
+                    scraped += 1
+                    if run_checkpoint is not None:
+                        with profiling.stage('write'):
+                            run_checkpoint.record(data)
+                    if sink is not None:
+                        with profiling.stage('write'):
+                            sink.write(data)
+                batch = []
+                
+                if run_checkpoint is not None and run_checkpoint.due():
+                    with profiling.stage('write'):
+                        run_checkpoint.save(snapshot())
+        completed = True
+    finally:
+        # Dihentikan di tengah batch: URL batch dikembalikan ke frontier sebelum checkpoint
+        # disimpan (halaman yang sudah tersimpan dilewati saat --resume)
+        if run_checkpoint is not None and not completed:
+            for url in batch:
+                frontier.push(url, 0)
+            run_checkpoint.save(snapshot())
+    return scraped
+
+def replay_cache(cache, path='scraped_data.json', workers=None, engine=DEFAULT_ENGINE):
+    """
+    Menjalankan ulang ekstraksi untuk semua halaman di cache HTML tanpa jaringan, lalu
+    mengganti data halaman tersebut di file JSON (halaman yang belum ada ditambahkan di akhir).
+
+    Args:
+    - cache (html_cache.HTMLCache): Cache sumber.
+    - path (str): Path file JSON (default: 'scraped_data.json').
+    - workers (int, optional): Jumlah proses ekstraksi (default: jumlah core).
+    - engine (str): Engine ekstraksi.
+
+    Returns:
+    - int: Jumlah halaman yang berhasil diekstrak ulang.
+    """
+    existing_data = load_existing_data(path)
+    positions = {item['url']: index for index, item in enumerate(existing_data)}
+    count = 0
+    for url, data, error in html_cache.replay(cache, functools.partial(parse_page, engine=engine), workers):
+        if data is None:
+            print(f"Gagal mengekstrak ulang {url}: {error}")
+            continue
+        if url in positions:
+            existing_data[positions[url]] = data
         else:
-            print(f"Gagal melakukan scraping data dari {url}")
+            positions[url] = len(existing_data)
+            existing_data.append(data)
+        count += 1
+    save_data(existing_data, path)
+    return count
+
+def run(args):
+    """
+    Menjalankan scraping (atau --replay) sesuai opsi baris perintah yang sudah dibaca main().
+
+    Args:
+    - args (argparse.Namespace): Opsi baris perintah.
+    """
+    if args.replay:
+        cache = html_cache.HTMLCache(args.cache_dir or html_cache.DEFAULT_CACHE_DIR)
+        try:
+            print(f"[REPLAY DIMULAI] {len(cache)} halaman di cache {cache.directory}\n")
+            count = replay_cache(cache, args.output, args.workers, args.engine)
+        finally:
+            cache.close()
+        print(f"{count} halaman diekstrak ulang dan disimpan di {args.output}")
+        if args.parquet:
+            parquet_sink.convert(args.output, args.parquet, args.row_group_size)
+            print(f"Data juga disimpan dalam format Parquet di {args.parquet}")
+        print("\n[REPLAY SELESAI]")
+        return
+
+    seeds = urls
+    if args.seeds_file:
+        with open(args.seeds_file, 'r', encoding='utf-8') as f:
+            seeds = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    
+    # Checkpoint berkala: jurnal halaman baru dan state crawl di <output>.checkpoint
+    run_checkpoint = checkpoint.Checkpoint(args.output + CHECKPOINT_SUFFIX, args.checkpoint_interval)
+    existing_data = load_existing_data(args.output)
+    state = None
+    if args.resume and run_checkpoint.exists():
+        state, pages = run_checkpoint.resume()
+        done = {item['url'] for item in existing_data}
+        existing_data.extend(page for page in pages if page['url'] not in done)
+        frontier = crawl_frontier.Frontier.from_state(state['frontier'])
+        max_pages, retries = state['max_pages'], state['retries']
+        backend = state.get('backend', 'html')
+        api_content = state.get('api_content', args.api_content)
+        api_batch_size = state.get('api_batch_size', args.api_batch_size)
+        seeds = []
+        print(f"[WIKIPEDIA SCRAPER DILANJUTKAN] {len(pages)} halaman dari checkpoint, {len(frontier)} URL di frontier\n")
+    else:
+        # Halaman 'intro' hanya berisi bagian pembuka artikel: jangan dicampur dengan data yang sudah ada
+        if args.backend == 'api' and args.api_content == 'intro' and existing_data:
+            print(f"{args.output} sudah berisi {len(existing_data)} halaman; --api-content intro hanya menyimpan "
+                  f"bagian pembuka artikel sehingga harus ditulis ke file --output baru.")
+            return
+        if args.resume:
+            print(f"Checkpoint {run_checkpoint.path} tidak ditemukan, scraping dimulai dari awal.")
+        elif run_checkpoint.exists():
+            print(f"Checkpoint lama {run_checkpoint.path} diabaikan (gunakan --resume untuk melanjutkan).")
+        run_checkpoint.start()
+        if args.crawl:
+            frontier = crawl_frontier.Frontier(args.max_depth, args.max_frontier,
+                                               crawl_frontier.BloomFilter(args.bloom_capacity))
+            max_pages = args.max_pages or DEFAULT_MAX_PAGES
+        else:
+            # Tanpa --crawl hanya URL di list (tanpa duplikat) yang diambil
+            frontier = crawl_frontier.Frontier(0, max(len(seeds), 1),
+                                               crawl_frontier.BloomFilter(max(len(seeds), 1000), SEED_ERROR_RATE))
+            max_pages = args.max_pages
+        retries = args.retries
+        backend, api_content, api_batch_size = args.backend, args.api_content, args.api_batch_size
+        print("[WIKIPEDIA SCRAPER DIMULAI] ...\n")
     
-    # Tambahkan baris kosong untuk memisahkan setiap iterasi URL
-    print()
-    index += 1
+    cache = html_cache.HTMLCache(args.cache_dir) if args.cache_dir else None
+    # Output Parquet berisi data yang sama dengan file JSON: data lama ditulis dulu, halaman baru
+    # ditambahkan selama crawl
+    sink = None
+    if args.parquet:
+        sink = parquet_sink.ParquetSink(args.parquet, args.row_group_size)
+        sink.write_all(existing_data)
+    try:
+        if backend == 'api':
+            scraped = scrape_via_api(seeds, existing_data, frontier, max_pages, retries, run_checkpoint, state,
+                                     args.proxy, sink, api_content, api_batch_size)
+        else:
+            scraped = crawl(seeds, existing_data, frontier, max_pages, cache, retries, run_checkpoint, state,
+                            args.proxy, sink)
+    except KeyboardInterrupt:
+        # Checkpoint sudah disimpan oleh crawl; halaman yang sudah diambil tetap disimpan
+        save_data(existing_data, args.output)
+        if sink is not None:
+            sink.close()
+        run_checkpoint.close()
+        print(f"\nDihentikan. Data disimpan di {args.output}; lanjutkan dengan --resume")
+        return
+    finally:
+        if cache is not None:
+            cache.close()
+
+    # Simpan hasil ke dalam 'scraped_data.json', lalu hapus checkpoint karena scraping sudah selesai
+    with profiling.stage('write'):
+        save_data(existing_data, args.output)
+        if sink is not None:
+            sink.close()
+    run_checkpoint.finish()
 
-# Simpan hasil ke dalam 'scraped_data.json'
-with open('scraped_data.json', 'w', encoding='utf-8') as f:
-    json.dump(existing_data, f, ensure_ascii=False, indent=4)
+    print(f"\n{scraped} halaman baru. Data yang diambil telah disimpan di {args.output}")
+    if sink is not None:
+        print(f"Data juga disimpan dalam format Parquet di {args.parquet} ({sink.rows} halaman)")
+    print("\n[WIKIPEDIA SCRAPER SELESAI]")
+
+
+def main():
+    """
+    Fungsi utama untuk melakukan scraping setiap URL di list urls secara berurutan
+    dan menyimpan hasilnya ke dalam file 'scraped_data.json'.
+
+    Dengan --cache-dir, body HTML mentah setiap halaman juga disimpan di cache terkompresi.
+    Dengan --replay, ekstraksi dijalankan ulang untuk semua halaman di cache tanpa jaringan.
+    Dengan --crawl, link /wiki/ di setiap halaman diikuti secara BFS mulai dari list urls.
+    Hasil dan state scraping disimpan berkala di checkpoint, dan --resume melanjutkan scraping
+    yang terhenti tepat dari checkpoint terakhir. Dengan --trace, waktu setiap tahap (fetch,
+    parse, extract, write, ...) per halaman dicatat ke file JSON Lines beserta ringkasan
+    persentilnya, dan --profile memprofil seluruh run dengan cProfile atau sampling profiler.
+    Dengan --parquet, data juga ditulis bertahap ke file Parquet (per row group) selama crawl.
+    Dengan --backend api, halaman diambil per batch lewat MediaWiki Action API.
+    """
+    parser = argparse.ArgumentParser(description='Scraper Wikipedia untuk list urls bawaan')
+    parser.add_argument('--output', default='scraped_data.json', help='File JSON hasil scraping')
+    parser.add_argument('--proxy', help="Proxy untuk mengambil halaman, misalnya 'http://localhost:9919'")
+    parser.add_argument('--backend', default='html', choices=BACKENDS,
+                        help="Cara mengambil halaman: 'html' (halaman /wiki/ penuh) atau 'api' (MediaWiki Action API, "
+                             "sampai 50 halaman per permintaan, tanpa --crawl dan --cache-dir)")
+    parser.add_argument('--api-content', default=mediawiki_api.DEFAULT_CONTENT, choices=mediawiki_api.CONTENT_CHOICES,
+                        help="Isi artikel untuk --backend api: 'full' (seluruh artikel seperti backend html, satu "
+                             "halaman per permintaan) atau 'intro' (hanya bagian pembuka, sampai 20 halaman per "
+                             "permintaan; harus ditulis ke --output tersendiri)")
+    parser.add_argument('--api-batch-size', type=int, default=mediawiki_api.MAX_TITLES,
+                        help=f'Jumlah judul per permintaan untuk --backend api (maksimal {mediawiki_api.MAX_TITLES})')
+    parser.add_argument('--cache-dir', help='Folder cache HTML mentah (terkompresi) untuk --replay')
+    parser.add_argument('--replay', action='store_true',
+                        help=f'Ekstrak ulang semua halaman di cache tanpa jaringan (default --cache-dir: '
+                             f'{html_cache.DEFAULT_CACHE_DIR})')
+    parser.add_argument('--workers', type=int, help='Jumlah proses ekstraksi untuk --replay (default: jumlah core)')
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, choices=ENGINE_CHOICES,
+                        help='Engine ekstraksi untuk --replay')
+    parser.add_argument('--crawl', action='store_true',
+                        help='Ikuti link /wiki/ dari setiap halaman (BFS) mulai dari list urls atau --seeds-file')
+    parser.add_argument('--seeds-file', help='File berisi URL (seed untuk --crawl), satu per baris; default list urls')
+    parser.add_argument('--max-depth', type=int, default=crawl_frontier.DEFAULT_MAX_DEPTH,
+                        help='Kedalaman link maksimal dari seed')
+    parser.add_argument('--max-pages', type=int,
+                        help=f'Jumlah halaman baru maksimal (default {DEFAULT_MAX_PAGES} untuk --crawl, tanpa batas tanpa --crawl)')
+    parser.add_argument('--max-frontier', type=int, default=crawl_frontier.DEFAULT_MAX_FRONTIER,
+                        help='Jumlah URL maksimal yang menunggu di frontier')
+    parser.add_argument('--bloom-capacity', type=int, default=crawl_frontier.DEFAULT_BLOOM_CAPACITY,
+                        help='Perkiraan jumlah URL unik yang ditemukan (ukuran bloom filter)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help='Jumlah percobaan ulang untuk halaman yang gagal diambil')
+    parser.add_argument('--resume', action='store_true',
+                        help='Lanjutkan scraping yang terhenti dari checkpoint terakhir (opsi crawl diambil dari checkpoint)')
+    parser.add_argument('--checkpoint-interval', type=float, default=checkpoint.DEFAULT_CHECKPOINT_INTERVAL,
+                        help='Jeda minimal antar checkpoint (detik)')
+    parser.add_argument('--trace', help='File JSON Lines untuk waktu setiap tahap per halaman dan ringkasan persentil')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Catat juga puncak alokasi memori per tahap (tracemalloc, memperlambat scraping)')
+    parser.add_argument('--profile', choices=profiling.PROFILERS,
+                        help='Profil seluruh run dengan cProfile atau sampling profiler')
+    parser.add_argument('--profile-output',
+                        help='File hasil --profile (default <output>.prof untuk cprofile, <output>.folded untuk sample)')
+    parser.add_argument('--sample-interval', type=float, default=profiling.DEFAULT_SAMPLE_INTERVAL * 1000,
+                        help='Jeda antar sampel untuk --profile sample (milidetik)')
+    parser.add_argument('--parquet',
+                        help='Simpan juga data dalam format Parquet (kolom, terkompresi) di file ini (membutuhkan pyarrow)')
+    parser.add_argument('--row-group-size', type=int, default=parquet_sink.DEFAULT_ROW_GROUP_SIZE,
+                        help='Jumlah halaman per row group Parquet')
+    args = parser.parse_args()
+
+    if args.backend == 'api' and (args.crawl or args.cache_dir):
+        parser.error("--backend api tidak bisa dipakai dengan --crawl atau --cache-dir")
+    if (args.backend == 'api' and args.api_content == 'intro' and not args.resume
+            and args.output == parser.get_default('output')):
+        parser.error("--api-content intro hanya menyimpan bagian pembuka artikel; tulis ke file --output "
+                     "tersendiri agar tidak tercampur dengan data lengkap")
+    if args.parquet and not parquet_sink.HAS_PYARROW:
+        parser.error("--parquet membutuhkan pyarrow (pip install pyarrow)")
+
+    if args.replay:
+        cache_dir = args.cache_dir or html_cache.DEFAULT_CACHE_DIR
+        if not os.path.isdir(cache_dir):
+            parser.error(f"Folder cache {cache_dir} tidak ditemukan (jalankan scraper dengan --cache-dir terlebih dahulu)")
+        if args.trace or args.trace_memory:
+            parser.error("--trace tidak didukung untuk --replay (ekstraksi berjalan di beberapa proses)")
+    
+    profile_output = args.profile_output
+    if args.profile and not profile_output:
+        profile_output = args.output + ('.prof' if args.profile == 'cprofile' else '.folded')
+    with profiling.session(args.trace, args.trace_memory, args.profile, profile_output, args.sample_interval / 1000):
+        run(args)
 
-print(f"Data yang diambil telah disimpan di scraped_data.json")
-print("\n[WIKIPEDIA SCRAPER SELESAI]")
+if __name__ == "__main__":
+    main()